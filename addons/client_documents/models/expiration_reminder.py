@@ -1,19 +1,68 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
-import datetime
+from odoo import models, fields, api, _
+from markupsafe import Markup
+from datetime import timedelta
+
+
+class ExpirationReminderType(models.Model):
+    _inherit = 'res.partner.document.type'
+
+    reminder_days = fields.Integer('Reminder Days', default=90,
+                                   help="Number of days before expiration the reminder is sent")
 
 
 class ExpirationReminder(models.Model):
     _inherit = 'res.partner.document'
 
+    _expiration_due_field = 'reminder_due_date'
+    _expiration_flag_field = 'expiration_reminder'
+    _expiration_sent_field = 'expiration_reminder_sent'
+
+    reminder_due_date = fields.Date('Reminder Due Date', compute='_compute_reminder_due_date', store=True, index=True)
+
+    @api.depends('expiration_date', 'type_id.reminder_days')
+    def _compute_reminder_due_date(self):
+        for document in self:
+            reminder_days = document.type_id.reminder_days if document.type_id else 90
+            document.reminder_due_date = document.expiration_date and (
+                document.expiration_date - timedelta(days=reminder_days or 0)
+            )
+
     def check_for_expiration(self):
-        documents = self.search([('expiration_reminder', '=', True), ('expiration_reminder_sent', '=', False)])
-        today = datetime.datetime.now()
-        thirty_days_from_today = today + datetime.timedelta(days=90)
-        expired_documents = [document for document in documents if
-                             document.expiration_date < thirty_days_from_today.date()]
-        for document in expired_documents:
-            mail_template = self.env.ref('client_documents.expired_document_reminder_mail')
-            mail_template.send_mail(document.id, force_send=True)
-            document.write({'expiration_reminder_sent': True})
+        return self.env['document.expiration.reminder.service'].send_reminders(self._name)
+
+    def _queue_expiration_reminders(self):
+        """
+        Queue one reminder per client, rendered with the customer template in
+        the client's language and linked to the client
+        Returns:
+            number of reminders queued
+        """
+        partners = self.partner_id.filtered('email')
+        if not partners:
+            return 0
+        template = self.env.ref('client_documents.expired_document_reminder_mail', raise_if_not_found=False)
+        if not template:
+            return 0
+        template.with_context(expiring_document_ids=self.ids).send_mail_batch(partners.ids, force_send=False)
+        documents_by_partner = self.grouped('partner_id')
+        partners._message_log_batch(bodies={
+            partner.id: Markup(_("Expiration reminder sent for: %s")) % ", ".join(
+                documents_by_partner[partner].mapped('name')
+            )
+            for partner in partners
+        })
+        return len(partners)
+
+
+class ExpirationReminderPartner(models.Model):
+    _inherit = 'res.partner'
+
+    def _get_expiring_documents(self):
+        """Documents of the client covered by the reminder being rendered"""
+        self.ensure_one()
+        return self.env['res.partner.document'].search([
+            ('id', 'in', self.env.context.get('expiring_document_ids', [])),
+            ('partner_id', '=', self.id),
+        ], order='expiration_date')
@@ -28,6 +28,7 @@
     'data': [
         'security/security.xml',
         'data/data.xml',
+        'data/cron.xml',
         'views/business_structure.xml',
         'views/partner.xml',
         'views/compliance.xml',
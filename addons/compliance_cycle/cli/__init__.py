@@ -0,0 +1 @@
+from . import generate_load_data
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import optparse
+import sys
+
+import odoo
+from odoo import api, SUPERUSER_ID
+from odoo.cli import Command
+
+_logger = logging.getLogger(__name__)
+
+
+class GenerateLoadData(Command):
+    """Generate a seeded synthetic dataset for load testing"""
+    name = 'generate_load_data'
+
+    def run(self, cmdargs):
+        parser = odoo.tools.config.parser
+        parser.prog = f'{sys.argv[0].split("/")[-1]} {self.name}'
+        group = optparse.OptionGroup(parser, "Load Data Generation")
+        group.add_option('--seed', dest='seed', type='int', default=0,
+                         help="Random seed, the same seed gives the same dataset (default: 0)")
+        group.add_option('--partners', dest='partners', type='int', default=1000,
+                         help="Number of partners to generate (default: 1000)")
+        group.add_option('--products', dest='products', type='int', default=50,
+                         help="Number of workflow products to generate (default: 50)")
+        group.add_option('--orders', dest='orders', type='int',
+                         help="Number of confirmed sale orders (default: partners / 10)")
+        group.add_option('--documents-per-partner', dest='documents_per_partner', type='int', default=2,
+                         help="Partner documents per partner (default: 2)")
+        group.add_option('--onboarding-ratio', dest='onboarding_ratio', type='float', default=1.0,
+                         help="Share of the partners getting an onboarding (default: 1.0)")
+        group.add_option('--reference-date', dest='reference_date',
+                         help="Date expiry dates are relative to, YYYY-MM-DD (default: today)")
+        group.add_option('--batch-size', dest='batch_size', type='int', default=1000,
+                         help="Records per create call (default: 1000)")
+        group.add_option('--manifest', dest='manifest',
+                         help="File the dataset manifest is written to (default: stdout)")
+        parser.add_option_group(group)
+        opt = odoo.tools.config.parse_config(cmdargs)
+        odoo.netsvc.init_logger()
+
+        dbname = odoo.tools.config['db_name']
+        if not dbname:
+            sys.exit("A database is required, use -d/--database")
+        registry = odoo.modules.registry.Registry(dbname)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            manifest = env['compliance.load.data.generator'].generate(
+                seed=opt.seed,
+                partners=opt.partners,
+                products=opt.products,
+                orders=opt.orders,
+                documents_per_partner=opt.documents_per_partner,
+                onboarding_ratio=opt.onboarding_ratio,
+                reference_date=opt.reference_date,
+                batch_size=opt.batch_size,
+            )
+
+        output = json.dumps(manifest, indent=2, sort_keys=True)
+        if opt.manifest:
+            with open(opt.manifest, 'w') as manifest_file:
+                manifest_file.write(output + '\n')
+            _logger.info("Dataset %s generated, manifest written to %s", manifest['dataset'], opt.manifest)
+        else:
+            print(output)
@@ -5,4 +5,6 @@ from . import required_document
 from . import document
 from . import config
 from . import country
+from . import risk_scoring_engine
 from . import onboarding
+from . import load_data_generator
@@ -4,6 +4,12 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 from dateutil.relativedelta import relativedelta
 from datetime import datetime, timedelta, date
+from odoo.tools import SQL
+
+# Registry attribute holding the (table version, scoring table) pair of a worker
+_SCORING_TABLE_REGISTRY_ATTR = '_risk_scoring_table'
+# Key of the per-transaction scoring table in cr.cache
+_SCORING_TABLE_MEMO_KEY = 'risk_scoring_table'
 
 
 class ComplianceConfig(models.Model):
@@ -103,6 +109,67 @@ class RiskScoring(models.Model):
     name = fields.Char(required=True)
     rating_id = fields.Many2one('risk.rating')
 
+    @api.model
+    def _get_scoring_table(self):
+        """
+        Cached lookup table of the scoring configuration
+        The table is kept on the registry of each worker together with a hash
+        of the scorings it was built from and checked once per transaction,
+        so changes made in any worker are picked up without clearing the
+        shared ormcache.
+        Returns:
+            tuple (score -> scoring ID, scoring ID -> score) where scores are
+            the integer values of numeric scoring names; the lowest ID wins
+            when several scorings share a name
+        """
+        memo = self.env.cr.cache
+        if _SCORING_TABLE_MEMO_KEY in memo:
+            return memo[_SCORING_TABLE_MEMO_KEY]
+        self.flush_model(['name'])
+        # The scoring configuration is a handful of rows, hashing them is cheap
+        self.env.cr.execute(SQL(
+            "SELECT md5(string_agg(id || ':' || COALESCE(name, ''), ',' ORDER BY id)) FROM %s",
+            SQL.identifier(self._table),
+        ))
+        version = self.env.cr.fetchone()[0]
+        cached = getattr(self.env.registry, _SCORING_TABLE_REGISTRY_ATTR, None)
+        if cached is None or cached[0] != version:
+            cached = (version, self._build_scoring_table())
+            setattr(self.env.registry, _SCORING_TABLE_REGISTRY_ATTR, cached)
+        memo[_SCORING_TABLE_MEMO_KEY] = cached[1]
+        return cached[1]
+
+    @api.model
+    def _build_scoring_table(self):
+        id_by_score = {}
+        score_by_id = {}
+        for scoring in self.sudo().search_fetch([], ['name'], order='id'):
+            if scoring.name and scoring.name.isdigit():
+                score = int(scoring.name)
+                score_by_id[scoring.id] = score
+                id_by_score.setdefault(score, scoring.id)
+        return id_by_score, score_by_id
+
+    def _invalidate_scoring_table(self):
+        self.env.cr.cache.pop(_SCORING_TABLE_MEMO_KEY, None)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._invalidate_scoring_table()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'name' in vals:
+            self._invalidate_scoring_table()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._invalidate_scoring_table()
+        return res
+
 class RiskRating(models.Model):
     _name = 'risk.rating'
 
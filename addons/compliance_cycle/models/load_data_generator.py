@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import random
+import time
+from datetime import timedelta
+
+from odoo import api, fields, models, Command
+from odoo.tools import split_every
+
+from .risk_scoring_engine import RISK_DIMENSIONS
+
+_logger = logging.getLogger(__name__)
+
+GENERATOR_VERSION = 1
+
+# risk.category type of each risk dimension
+RISK_CATEGORY_TYPES = dict(zip(RISK_DIMENSIONS, RISK_DIMENSIONS), pep='PEP', sanction='Sanction')
+
+# Modules whose versions are recorded in the manifest of a dataset
+MANIFEST_MODULES = ('compliance_cycle', 'project_documents_extension', 'client_documents')
+
+
+class ComplianceLoadDataGenerator(models.AbstractModel):
+    """
+    Compliance Load Data Generator
+    Seeded, deterministic synthetic datasets for load testing: partners,
+    partner documents, onboardings with every risk dimension, workflow
+    products with task templates and required documents, and confirmed sale
+    orders. Every value is drawn from a random.Random seeded by the caller and
+    records are created with batched create() calls, so the same seed and
+    parameters on the same database give the same dataset.
+
+    Records are named after the dataset tag ``LOAD-<seed>``; the returned
+    manifest lists the parameters, module versions, counts and ID ranges
+    needed to reproduce or locate a benchmark dataset.
+    """
+    _name = 'compliance.load.data.generator'
+    _description = 'Compliance Load Data Generator'
+
+    @api.model
+    def generate(self, seed=0, partners=1000, products=50, orders=None, documents_per_partner=2,
+                 onboarding_ratio=1.0, reference_date=None, batch_size=1000):
+        """
+        Generate a synthetic dataset
+        Args:
+            seed: random seed, also used in the dataset tag
+            partners: number of res.partner records
+            products: number of new_workflow product templates
+            orders: number of confirmed sale orders, defaults to partners // 10
+            documents_per_partner: res.partner.document records per partner,
+                when client_documents is installed
+            onboarding_ratio: share of the partners getting an onboarding
+            reference_date: date the generated expiry dates are relative to,
+                defaults to today
+            batch_size: number of records per create() call
+        Returns:
+            dict manifest of the dataset
+        """
+        rng = random.Random(seed)
+        reference_date = fields.Date.to_date(reference_date) or fields.Date.context_today(self)
+        orders = partners // 10 if orders is None else orders
+        tag = f'LOAD-{seed}'
+        # Load data does not need chatter tracking nor creation messages
+        generator = self.with_context(tracking_disable=True, mail_create_nolog=True, mail_notrack=True)
+
+        manifest = {
+            'generator_version': GENERATOR_VERSION,
+            'dataset': tag,
+            'database': self.env.cr.dbname,
+            'seed': seed,
+            'reference_date': fields.Date.to_string(reference_date),
+            'parameters': {
+                'partners': partners,
+                'products': products,
+                'orders': orders,
+                'documents_per_partner': documents_per_partner,
+                'onboarding_ratio': onboarding_ratio,
+                'batch_size': batch_size,
+            },
+            'modules': self._get_module_versions(),
+            'records': {},
+            'timings': {},
+        }
+
+        partner_records = generator._run_stage(
+            manifest, 'res.partner', generator._generate_partners, rng, tag, partners, batch_size)
+        if 'res.partner.document' in self.env:
+            # client_documents is optional
+            generator._run_stage(
+                manifest, 'res.partner.document', generator._generate_partner_documents,
+                rng, tag, partner_records, documents_per_partner, reference_date, batch_size)
+        generator._run_stage(
+            manifest, 'initial.client.onboarding', generator._generate_onboardings,
+            rng, tag, partner_records, onboarding_ratio, reference_date, batch_size)
+        product_records = generator._run_stage(
+            manifest, 'product.template', generator._generate_products, rng, tag, products, batch_size)
+        generator._run_stage(
+            manifest, 'sale.order', generator._generate_sale_orders,
+            rng, partner_records, product_records, orders, batch_size)
+        return manifest
+
+    @api.model
+    def _run_stage(self, manifest, model_name, stage, *args):
+        """Run one generation stage and record its counts and timing in the manifest"""
+        start = time.perf_counter()
+        records = stage(*args)
+        manifest['timings'][model_name] = round(time.perf_counter() - start, 3)
+        manifest['records'][model_name] = {
+            'count': len(records),
+            'id_range': [min(records.ids), max(records.ids)] if records else [],
+        }
+        _logger.info("Generated %s %s records for dataset %s", len(records), model_name, manifest['dataset'])
+        return records
+
+    @api.model
+    def _get_module_versions(self):
+        modules = self.env['ir.module.module'].sudo().search_fetch(
+            [('name', 'in', MANIFEST_MODULES), ('state', '=', 'installed')], ['name', 'latest_version'],
+        )
+        return {module.name: module.latest_version for module in modules}
+
+    @api.model
+    def _create_batched(self, model_name, vals_list, batch_size):
+        """Create records in batches, dropping the cache between batches to keep memory flat"""
+        Model = self.env[model_name]
+        ids = []
+        for batch in split_every(batch_size, vals_list):
+            ids.extend(Model.create(list(batch)).ids)
+            self.env.flush_all()
+            self.env.invalidate_all()
+        return Model.browse(ids)
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _generate_partners(self, rng, tag, count, batch_size):
+        countries = self.env['res.country'].search([], order='id').ids
+        vals_list = []
+        for index in range(count):
+            is_company = rng.random() < 0.6
+            vals_list.append({
+                'name': f'{tag} {"Company" if is_company else "Person"} {index:06d}',
+                'is_company': is_company,
+                'email': f'{tag.lower()}.partner{index:06d}@example.com',
+                'phone': f'+971 5{rng.randrange(10 ** 8):08d}',
+                'country_id': rng.choice(countries) if countries else False,
+            })
+        return self._create_batched('res.partner', vals_list, batch_size)
+
+    @api.model
+    def _generate_partner_documents(self, rng, tag, partners, per_partner, reference_date, batch_size):
+        document_types = self.env['res.partner.document.type'].search([], order='id')
+        if not document_types:
+            document_types = self.env['res.partner.document.type'].create([
+                {'name': f'{tag} Document Type {index}'} for index in range(5)
+            ])
+        vals_list = []
+        for partner_index, partner_id in enumerate(partners.ids):
+            for index in range(per_partner):
+                document_type = document_types[rng.randrange(len(document_types))]
+                vals_list.append({
+                    'name': f'{tag} Document {partner_index:06d}-{index}',
+                    'partner_id': partner_id,
+                    'type_id': document_type.id,
+                    'category_id': document_type.category_id.id,
+                    'issue_date': reference_date - timedelta(days=rng.randint(30, 1000)),
+                    'expiration_date': reference_date + timedelta(days=rng.randint(-90, 365)),
+                    'expiration_reminder': rng.random() < 0.5,
+                })
+        return self._create_batched('res.partner.document', vals_list, batch_size)
+
+    @api.model
+    def _get_risk_assessments(self):
+        """
+        Assessment lines and their possible listing values per risk dimension
+        Returns:
+            dict dimension -> list of (assessment ID, list of (listing line ID, scoring ID))
+        """
+        categories = {
+            category.type: category
+            for category in self.env['risk.category'].search([('type', 'in', list(RISK_CATEGORY_TYPES.values()))])
+        }
+        listing_lines = self.env['listing.group.line'].search([], order='id')
+        values_by_listing = {}
+        for line in listing_lines:
+            values_by_listing.setdefault(line.listing_id.id, []).append((line.id, line.scoring_id.id))
+        assessments = {}
+        for dimension, category_type in RISK_CATEGORY_TYPES.items():
+            category = categories.get(category_type)
+            assessments[dimension] = [
+                (assessment.id, values_by_listing.get(assessment.listing_id.id, []))
+                for assessment in (category.data_ids.sorted('id') if category else [])
+            ]
+        return assessments
+
+    @api.model
+    def _generate_onboardings(self, rng, tag, partners, ratio, reference_date, batch_size):
+        assessments = self._get_risk_assessments()
+        vals_list = []
+        for partner_index, partner_id in enumerate(partners.ids):
+            if rng.random() >= ratio:
+                continue
+            vals = {
+                'name': f'{tag} Onboarding {partner_index:06d}',
+                'type': 'onboarding',
+                'partner_id': partner_id,
+                'date': reference_date - timedelta(days=rng.randint(0, 720)),
+            }
+            # Explicit lines for the eight dimensions, so the per-record defaults are not evaluated
+            for dimension in RISK_DIMENSIONS:
+                lines = []
+                for assessment_id, values in assessments[dimension]:
+                    listing_id, scoring_id = rng.choice(values) if values else (False, False)
+                    lines.append(Command.create({
+                        'assessment_id': assessment_id,
+                        'listing_id': listing_id,
+                        'scoring_id': scoring_id,
+                    }))
+                vals[f'{dimension}_risk_ids'] = lines
+            vals_list.append(vals)
+        return self._create_batched('initial.client.onboarding', vals_list, batch_size)
+
+    @api.model
+    def _generate_products(self, rng, tag, count, batch_size):
+        document_types = self.env['project.document.type'].search([], order='id')
+        if not document_types:
+            document_types = self.env['project.document.type'].create([
+                {'name': f'{tag} Project Document Type {index}'} for index in range(10)
+            ])
+        vals_list = []
+        for index in range(count):
+            name = f'{tag} Service {index:04d}'
+            required_types = rng.sample(document_types.ids, min(len(document_types), rng.randint(1, 4)))
+            vals_list.append({
+                'name': name,
+                'type': 'service',
+                'service_tracking': 'new_workflow',
+                'list_price': rng.randint(5, 500) * 10,
+                # Explicit task templates, so the default templates are not created one by one
+                'task_template_ids': [Command.create({
+                    'name': f'{name} Task {step}',
+                    'sequence': step * 10,
+                    'planned_hours': rng.choice([0.5, 1.0, 2.0, 4.0]),
+                }) for step in range(1, rng.randint(2, 4) + 1)],
+                'x_required_document_ids': [Command.create({
+                    'name': f'{name} Requirement {type_id}',
+                    'x_document_type_id': type_id,
+                    'x_is_required': True,
+                }) for type_id in required_types],
+            })
+        return self._create_batched('product.template', vals_list, batch_size)
+
+    @api.model
+    def _generate_sale_orders(self, rng, partners, products, count, batch_size):
+        if not count or not partners or not products:
+            return self.env['sale.order']
+        product_ids = products.product_variant_id.ids
+        vals_list = [{
+            'partner_id': rng.choice(partners.ids),
+            'order_line': [Command.create({
+                'product_id': product_id,
+                'product_uom_qty': rng.randint(1, 3),
+            }) for product_id in rng.sample(product_ids, min(len(product_ids), rng.randint(1, 3)))],
+        } for _index in range(count)]
+        orders = self._create_batched('sale.order', vals_list, batch_size)
+        # Projects are materialised by the job queue, as with asynchronous confirmation in production
+        for batch_ids in split_every(batch_size, orders.ids):
+            self.env['sale.order'].browse(batch_ids).with_context(async_project_materialisation=True).action_confirm()
+            self.env.flush_all()
+            self.env.invalidate_all()
+        return orders
@@ -2,6 +2,9 @@ from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
 from dateutil.relativedelta import relativedelta
 from datetime import datetime, timedelta, date
+import threading
+
+from .risk_scoring_engine import RISK_DIMENSIONS
 
 
 class InitialClientOnboarding(models.Model):
@@ -222,50 +225,52 @@ class InitialClientOnboarding(models.Model):
     secondary_user_id = fields.Many2one('res.users', string='Management Approval By')
     secondary_date = fields.Date('Management Approval Date')
     next_risk_assessment_date = fields.Date('Next Risk Assessment Date', compute='_get_next_risk_assessment_date',
-                                            store=True)
+                                            store=True, index=True)
+    review_scheduled_date = fields.Date('Review Scheduled On', copy=False, readonly=True,
+                                        help="Date the periodic re-assessment activity was last scheduled")
     # document_required_type_ids = fields.One2many("task.document.required.lines", 'onboarding_id')
     # document_ids = fields.One2many('documents.document', 'onboarding_id')
     # document_count = fields.Integer(compute='get_document_ids_count')
 
     service_risk_ids = fields.One2many('onboarding.service.risk', 'onboarding_id', default=_default_service_ids)
     service_risk_scoring_id = fields.Many2one('risk.scoring', 'Service Risk Scoring',
-                                              compute='get_service_risk_scoring', store=True)
+                                              compute='_compute_risk_scorings', store=True)
     service_risk_rating_id = fields.Many2one('risk.rating', 'Service Risk Rating',
                                              related='service_risk_scoring_id.rating_id', store=True)
     product_risk_ids = fields.One2many('onboarding.product.risk', 'onboarding_id', default=_default_product_ids)
     product_risk_scoring_id = fields.Many2one('risk.scoring', 'Product Risk Scoring',
-                                              compute='get_product_risk_scoring', store=True)
+                                              compute='_compute_risk_scorings', store=True)
     product_risk_rating_id = fields.Many2one('risk.rating', 'Product Risk Rating',
                                              related='product_risk_scoring_id.rating_id', store=True)
     client_risk_ids = fields.One2many('onboarding.client.risk', 'onboarding_id', default=_default_client_ids)
-    client_risk_scoring_id = fields.Many2one('risk.scoring', 'Client Risk Scoring', compute='get_client_risk_scoring',
+    client_risk_scoring_id = fields.Many2one('risk.scoring', 'Client Risk Scoring', compute='_compute_risk_scorings',
                                              store=True)
     client_risk_rating_id = fields.Many2one('risk.rating', 'Client Risk Rating',
                                             related='client_risk_scoring_id.rating_id', store=True)
     geography_risk_ids = fields.One2many('onboarding.geography.risk', 'onboarding_id', default=_default_geography_ids)
     geography_risk_scoring_id = fields.Many2one('risk.scoring', 'Geography Risk Scoring',
-                                                compute='get_geography_risk_scoring', store=True)
+                                                compute='_compute_risk_scorings', store=True)
     geography_risk_rating_id = fields.Many2one('risk.rating', 'Geography Risk Rating',
                                                related='geography_risk_scoring_id.rating_id', store=True)
     pep_risk_ids = fields.One2many('onboarding.pep.risk', 'onboarding_id', default=_default_pep_ids)
-    pep_risk_scoring_id = fields.Many2one('risk.scoring', 'PEP Risk Scoring', compute='get_pep_risk_scoring',
+    pep_risk_scoring_id = fields.Many2one('risk.scoring', 'PEP Risk Scoring', compute='_compute_risk_scorings',
                                           store=True)
     pep_risk_rating_id = fields.Many2one('risk.rating', 'PEP Risk Rating', related='pep_risk_scoring_id.rating_id',
                                          store=True)
     adverse_media_risk_ids = fields.One2many('onboarding.adverse_media.risk', 'onboarding_id',
                                              default=_default_adverse_media_ids)
     adverse_media_risk_scoring_id = fields.Many2one('risk.scoring', 'Adverse Media Risk Scoring',
-                                                    compute='get_adverse_media_risk_scoring', store=True)
+                                                    compute='_compute_risk_scorings', store=True)
     adverse_media_risk_rating_id = fields.Many2one('risk.rating', 'Adverse Media Risk Rating',
                                                    related='adverse_media_risk_scoring_id.rating_id', store=True)
     sanction_risk_ids = fields.One2many('onboarding.sanction.risk', 'onboarding_id', default=_default_sanction_ids)
     sanction_risk_scoring_id = fields.Many2one('risk.scoring', 'Sanction Risk Scoring',
-                                               compute='get_sanction_risk_scoring', store=True)
+                                               compute='_compute_risk_scorings', store=True)
     sanction_risk_rating_id = fields.Many2one('risk.rating', 'Sanction Risk Rating',
                                               related='sanction_risk_scoring_id.rating_id', store=True)
     interface_risk_ids = fields.One2many('onboarding.interface.risk', 'onboarding_id', default=_default_interface_ids)
     interface_risk_scoring_id = fields.Many2one('risk.scoring', 'Interface Risk Scoring',
-                                                compute='get_interface_risk_scoring', store=True)
+                                                compute='_compute_risk_scorings', store=True)
     interface_risk_rating_id = fields.Many2one('risk.rating', 'Interface Risk Rating',
                                                related='interface_risk_scoring_id.rating_id', store=True)
     is_hide = fields.Boolean(compute='_check_is_hide', copy=False)
@@ -294,6 +299,58 @@ class InitialClientOnboarding(models.Model):
             else:
                 rec.next_risk_assessment_date = False
 
+    @api.model
+    def _get_due_reassessment_ids(self, today, limit):
+        """Page of approved onboardings whose re-assessment is due and not yet scheduled"""
+        self.flush_model(['state', 'next_risk_assessment_date', 'review_scheduled_date'])
+        self.env.cr.execute("""
+            SELECT id FROM initial_client_onboarding
+            WHERE state = 'approved'
+              AND next_risk_assessment_date <= %s
+              AND (review_scheduled_date IS NULL OR review_scheduled_date < next_risk_assessment_date)
+            ORDER BY next_risk_assessment_date, id
+            LIMIT %s
+        """, (today, limit))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _cron_schedule_risk_reassessments(self, page_size=500, max_pages=100):
+        """
+        Schedule periodic risk re-assessments for due onboardings
+        Due onboardings are pulled in pages through the next_risk_assessment_date
+        index, re-scored with the batched engine and get their review
+        activities created in one batch per page.
+        Returns:
+            number of onboardings scheduled
+        """
+        today = fields.Date.context_today(self)
+        engine = self.env['risk.scoring.engine']
+        res_model_id = self.env['ir.model']._get_id('initial.client.onboarding')
+        activity_type = self.env['mail.activity.type'].sudo().search([('name', 'like', 'Compliance')], limit=1)
+        scheduled = 0
+        for _page in range(max_pages):
+            onboarding_ids = self._get_due_reassessment_ids(today, page_size)
+            if not onboarding_ids:
+                break
+            onboardings = self.browse(onboarding_ids)
+            engine.recompute(onboardings)
+            self.env['mail.activity'].sudo().create([{
+                'res_model_id': res_model_id,
+                'res_id': rec.id,
+                'activity_type_id': activity_type.id,
+                'summary': _('Periodic Risk Re-assessment : %s', rec.name),
+                'note': _('Periodic Risk Re-assessment : %s (current rating: %s)',
+                          rec.name, rec.final_risk_rating_id.name or rec.initial_risk_rating),
+                'date_deadline': rec.next_risk_assessment_date,
+                'user_id': rec.user_id.id or self.env.user.id,
+            } for rec in onboardings])
+            onboardings.write({'review_scheduled_date': today})
+            scheduled += len(onboardings)
+            if not getattr(threading.current_thread(), 'testing', False):
+                self.env.cr.commit()
+            self.env.invalidate_all()
+        return scheduled
+
     @api.depends('final_risk_rating_id')
     def _check_is_hide(self):
         for rec in self:
@@ -314,21 +371,11 @@ class InitialClientOnboarding(models.Model):
         'adverse_media_risk_scoring_id.name',
     )
     def _compute_initial_risk_scoring(self):
+        engine = self.env['risk.scoring.engine']
         for rec in self:
-            fields_to_sum = [
-                rec.service_risk_scoring_id.name,
-                rec.product_risk_scoring_id.name,
-                rec.client_risk_scoring_id.name,
-                rec.geography_risk_scoring_id.name,
-                rec.pep_risk_scoring_id.name,
-                rec.sanction_risk_scoring_id.name,
-                rec.interface_risk_scoring_id.name,
-                rec.adverse_media_risk_scoring_id.name,
-            ]
-            try:
-                rec.initial_risk_scoring = sum(int(field or 0) for field in fields_to_sum)
-            except ValueError:
-                rec.initial_risk_scoring = 0  # Set to default if conversion fails
+            rec.initial_risk_scoring = sum(
+                engine.get_score(rec[f'{dimension}_risk_scoring_id']) for dimension in RISK_DIMENSIONS
+            )
 
     @api.depends('initial_risk_scoring')
     def _compute_initial_risk_rating(self):
@@ -483,85 +530,13 @@ class InitialClientOnboarding(models.Model):
             rec.is_approved = True
             rec.state = 'approved'
 
-    @api.depends('service_risk_ids.scoring_id.name')
-    def get_service_risk_scoring(self):
-        for rec in self:
-            max_score = 0
-            for line in rec.service_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.service_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                                 limit=1).id or False
-
-    @api.depends('product_risk_ids.scoring_id.name')
-    def get_product_risk_scoring(self):
-        for rec in self:
-            max_score = 0
-            for line in rec.product_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.product_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                                 limit=1).id or False
-
-    @api.depends('client_risk_ids.scoring_id.name')
-    def get_client_risk_scoring(self):
-        for rec in self:
-            max_score = 0
-            for line in rec.client_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.client_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                                limit=1).id or False
-
-    @api.depends('pep_risk_ids.scoring_id.name')
-    def get_pep_risk_scoring(self):
-        for rec in self:
-            max_score = 0
-            for line in rec.pep_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.pep_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                             limit=1).id or False
-
-    @api.depends('geography_risk_ids.scoring_id.name')
-    def get_geography_risk_scoring(self):
-        for rec in self:
-            max_score = 0
-            for line in rec.geography_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.geography_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                                   limit=1).id or False
-
-    @api.depends('adverse_media_risk_ids.scoring_id.name')
-    def get_adverse_media_risk_scoring(self):
-        for rec in self:
-            max_score = 0
-            for line in rec.adverse_media_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.adverse_media_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                                       limit=1).id or False
-
-    @api.depends('sanction_risk_ids.scoring_id.name')
-    def get_sanction_risk_scoring(self):
-        for rec in self:
-            max_score = 0
-            for line in rec.sanction_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.sanction_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                                  limit=1).id or False
-
-    @api.depends('interface_risk_ids.scoring_id.name')
-    def get_interface_risk_scoring(self):
+    @api.depends(*[f'{dimension}_risk_ids.scoring_id.name' for dimension in RISK_DIMENSIONS])
+    def _compute_risk_scorings(self):
+        engine = self.env['risk.scoring.engine']
+        scores = engine.compute_scores(self)
         for rec in self:
-            max_score = 0
-            for line in rec.interface_risk_ids:
-                if line.scoring_id.name and line.scoring_id.name.isdigit():
-                    max_score = max(max_score, int(line.scoring_id.name))
-            rec.interface_risk_scoring_id = self.env['risk.scoring'].sudo().search([('name', '=', str(max_score))],
-                                                                                   limit=1).id or False
+            for dimension, score in scores[rec.id].items():
+                rec[f'{dimension}_risk_scoring_id'] = engine.get_scoring_id(score)
 
 class OnboardingServiceRisk(models.Model):
     _name = 'onboarding.service.risk'
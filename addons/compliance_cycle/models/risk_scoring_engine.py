@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+from odoo.tools import split_every
+
+RISK_DIMENSIONS = (
+    'service',
+    'product',
+    'client',
+    'geography',
+    'pep',
+    'adverse_media',
+    'sanction',
+    'interface',
+)
+
+
+class RiskScoringEngine(models.AbstractModel):
+    _name = 'risk.scoring.engine'
+    _description = 'Risk Scoring Engine'
+
+    @api.model
+    def _line_score(self, scoring, score_by_id):
+        score = score_by_id.get(scoring.id)
+        if score is None and scoring.name and scoring.name.isdigit():
+            # Scoring picked in a form that is not committed yet
+            score = int(scoring.name)
+        return score or 0
+
+    @api.model
+    def compute_scores(self, onboardings):
+        """
+        Compute the maximum line score of every risk dimension in one pass
+        The lines of each dimension are loaded for the whole batch at once and
+        scores are resolved through the cached risk.scoring table.
+        Returns:
+            dict onboarding ID -> dict dimension -> score
+        """
+        _id_by_score, score_by_id = self.env['risk.scoring']._get_scoring_table()
+        scores = {rec.id: dict.fromkeys(RISK_DIMENSIONS, 0) for rec in onboardings}
+        for dimension in RISK_DIMENSIONS:
+            fname = f'{dimension}_risk_ids'
+            for rec in onboardings:
+                rec_scores = scores[rec.id]
+                for line in rec[fname]:
+                    rec_scores[dimension] = max(rec_scores[dimension], self._line_score(line.scoring_id, score_by_id))
+        return scores
+
+    @api.model
+    def get_scoring_id(self, score):
+        """Return the risk.scoring ID matching a score, or False"""
+        id_by_score, _score_by_id = self.env['risk.scoring']._get_scoring_table()
+        return id_by_score.get(score, False)
+
+    @api.model
+    def get_score(self, scoring):
+        """Return the integer score of a risk.scoring record"""
+        _id_by_score, score_by_id = self.env['risk.scoring']._get_scoring_table()
+        return self._line_score(scoring, score_by_id)
+
+    @api.model
+    def recompute(self, onboardings):
+        """Recompute the risk scorings and ratings of a batch of onboardings"""
+        for dimension in RISK_DIMENSIONS:
+            self.env.add_to_compute(onboardings._fields[f'{dimension}_risk_scoring_id'], onboardings)
+        self.env.flush_all()
+
+    @api.model
+    def recompute_all(self, domain=None, batch_size=1000):
+        """
+        Recompute the risk scorings and ratings of all onboardings in batches,
+        e.g. after the scoring table changed
+        Returns:
+            number of onboardings recomputed
+        """
+        Onboarding = self.env['initial.client.onboarding']
+        onboarding_ids = Onboarding.search(domain or []).ids
+        for batch_ids in split_every(batch_size, onboarding_ids):
+            self.recompute(Onboarding.browse(batch_ids))
+            self.env.invalidate_all()
+        return len(onboarding_ids)
@@ -13,6 +13,7 @@
     ],
     'data': [
         'security/ir.model.access.csv',
+        'security/security.xml',
         
         # === DOCUMENTS MODULE INTEGRATION VIEWS ===
         # 'views/project_views.xml',  # OLD: Legacy project views - commented out
@@ -24,6 +25,10 @@
         'views/document_type_views.xml',     # Document types & categories
         'views/partner_fields_views.xml',    # Legal entities & hand types
         'views/milestone_views.xml',         # Milestones & checkpoints
+        'views/sale_order_views.xml',        # Order project setup status & job queue
+        'views/checkpoint_dashboard_views.xml',  # Portfolio checkpoint reporting
+        'views/checkpoint_server_actions.xml',   # Bulk checkpoint transitions
+        'views/performance_views.xml',           # Hot path timing percentiles
         
         # === DATA FILES ===
         'data/reached_checkpoint_data.xml',
@@ -31,6 +36,7 @@
         'data/partner_fields_data.xml',
         'data/milestone_templates.xml',
         'data/test_project_documents.xml',
+        'data/cron.xml',
         
         # === WIZARD FILES ===
         'wizard/document_upload_wizard.xml',
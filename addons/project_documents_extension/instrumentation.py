@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Hot path instrumentation for project documents.
+
+Operations such as order confirmation or smart document creation are wrapped
+with ``instrument()`` (or the ``instrumented()`` method decorator), which
+measures their duration and SQL query count and stores a sample that feeds the
+project.documents.performance report.
+
+Logging inside hot paths goes through ``debug()``: messages are formatted
+lazily and only emitted when DEBUG is enabled for the logger, or promoted to
+INFO when the surrounding operation was picked by the sampled debug mode.
+
+Configuration (ir.config_parameter, both rates between 0 and 1):
+    project_documents_extension.debug_sample_rate: operations logged in detail
+    project_documents_extension.timing_sample_rate: operations timed and stored,
+        1% by default so the report costs little on busy databases; raise it
+        when the percentiles need more samples
+"""
+
+import contextvars
+import functools
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+_logger = logging.getLogger(__name__)
+
+DEBUG_SAMPLE_RATE_PARAM = 'project_documents_extension.debug_sample_rate'
+TIMING_SAMPLE_RATE_PARAM = 'project_documents_extension.timing_sample_rate'
+DEFAULT_TIMING_SAMPLE_RATE = 0.01
+
+_sampled = contextvars.ContextVar('project_documents_sampled', default=False)
+
+
+def _get_rate(env, param, default):
+    # ir.config_parameter values are ormcached, this does not hit the database
+    try:
+        return float(env['ir.config_parameter'].sudo().get_param(param, default))
+    except ValueError:
+        return default
+
+
+def _pick(rate):
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def is_sampled():
+    """Whether the current operation runs in sampled debug mode"""
+    return _sampled.get()
+
+
+def debug(logger, msg, *args):
+    """Log a hot path message, formatted only when it is actually emitted"""
+    if _sampled.get():
+        logger.info(msg, *args)
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args)
+
+
+@contextmanager
+def instrument(env, operation):
+    """
+    Time an operation and count its SQL queries
+    Args:
+        env: Odoo environment whose cursor is measured
+        operation: name the timings are reported under
+    """
+    sampled = _sampled.get() or _pick(_get_rate(env, DEBUG_SAMPLE_RATE_PARAM, 0.0))
+    token = _sampled.set(sampled)
+    queries = env.cr.sql_log_count
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _sampled.reset(token)
+    # Failed operations are not sampled, their transaction is about to be rolled back
+    duration_ms = (time.perf_counter() - start) * 1000
+    query_count = env.cr.sql_log_count - queries
+    if sampled:
+        _logger.info("%s took %.1f ms and %s queries", operation, duration_ms, query_count)
+    else:
+        _logger.debug("%s took %.1f ms and %s queries", operation, duration_ms, query_count)
+    if _pick(_get_rate(env, TIMING_SAMPLE_RATE_PARAM, DEFAULT_TIMING_SAMPLE_RATE)):
+        env['project.documents.perf.sample'].record(operation, duration_ms, query_count)
+
+
+def instrumented(operation):
+    """Decorator instrumenting a model method, see instrument()"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with instrument(self.env, operation):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
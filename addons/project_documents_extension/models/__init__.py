@@ -1,9 +1,14 @@
+from . import document_duplicate_index
 from . import project
 from . import product
 from . import product_task_template
-from . import expiration_reminder
 from . import document_service
 from . import project_partner_fields
 from . import milestone
 from . import documents
-from . import attachment
\ No newline at end of file
+from . import expiration_reminder
+from . import attachment
+from . import sale_order_job
+from . import checkpoint_dashboard
+from . import task_shared_document
+from . import performance
@@ -3,6 +3,8 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+FOLDER_CLEANUP_HWM_PARAM = 'project_documents_extension.attachment_folder_cleanup_last_id'
+
 class IrAttachmentInherit(models.Model):
     _inherit = 'ir.attachment'
 
@@ -49,25 +51,7 @@ class IrAttachmentInherit(models.Model):
     def _get_or_create_project_folder(self, project):
         """Get or create project folder"""
         try:
-            # First try to find existing project folder
-            project_folder = self.env['documents.folder'].search([
-                ('name', '=', f'Project: {project.name}'),
-                ('company_id', '=', project.company_id.id)
-            ], limit=1)
-            
-            if project_folder:
-                return project_folder
-            
-            # If not found, create new project folder
-            project_folder = self.env['documents.folder'].create({
-                'name': f'Project: {project.name}',
-                'company_id': project.company_id.id,
-                'description': f'Documents for project: {project.name}'
-            })
-            
-            _logger.info(f"Created project folder: {project_folder.name}")
-            return project_folder
-            
+            return self.env['project.folder.resolver'].get_attachment_folder(project)
         except Exception as e:
             _logger.error(f"Error creating project folder: {e}")
             return False
@@ -115,40 +99,22 @@ class IrAttachmentInherit(models.Model):
         return super().write(vals)
 
     def read(self, fields=None, load='_classic_read'):
-        # First, clean up any invalid folder_id values in the database
-        try:
-            # Get existing folders
-            existing_folders = self.env['documents.folder'].search([])
-            existing_folder_ids = existing_folders.ids
-            
-            # Find attachments with invalid folder_id and fix them
-            invalid_attachments = self.search([
-                ('folder_id', '!=', False),
-                ('folder_id', 'not in', existing_folder_ids)
-            ])
-            
-            if invalid_attachments:
-                invalid_attachments.write({'folder_id': False})
-                _logger.info(f"Cleaned up {len(invalid_attachments)} attachments with invalid folder_id during read")
-                
-        except Exception as e:
-            _logger.error(f"Error during read cleanup: {e}")
-        
-        # Now read the data safely
+        # Read the data, then resolve folder validity with one exists() per batch
         try:
             result = super().read(fields=fields, load=load)
             
-            # Additional safety check for the result
-            if isinstance(result, list):
+            folder_ids = {
+                record['folder_id'][0] if isinstance(record['folder_id'], (list, tuple)) else record['folder_id']
+                for record in result
+                if record.get('folder_id')
+            }
+            if folder_ids:
+                valid_folder_ids = set(self.env['documents.folder'].browse(folder_ids).exists().ids)
                 for record in result:
-                    if 'folder_id' in record and record['folder_id']:
-                        # Check if the folder_id is a valid ID
-                        try:
-                            folder = self.env['documents.folder'].browse(record['folder_id'])
-                            if not folder.exists():
-                                record['folder_id'] = False
-                        except:
-                            record['folder_id'] = False
+                    folder = record.get('folder_id')
+                    folder_id = folder[0] if isinstance(folder, (list, tuple)) else folder
+                    if folder_id and folder_id not in valid_folder_ids:
+                        record['folder_id'] = False
             
             return result
             
@@ -222,16 +188,7 @@ class IrAttachmentInherit(models.Model):
 
     def cleanup_invalid_folders(self):
         """Clean up invalid folder_id values in existing records"""
-        try:
-            invalid_attachments = self.search([
-                ('folder_id', '!=', False),
-                ('folder_id', 'not in', self.env['documents.folder'].search([]).ids)
-            ])
-            if invalid_attachments:
-                invalid_attachments.write({'folder_id': False})
-                _logger.info(f"Cleaned up {len(invalid_attachments)} attachments with invalid folder_id")
-        except Exception as e:
-            _logger.error(f"Error in cleanup_invalid_folders: {e}")
+        self._cleanup_all_invalid_folders()
         return True
 
     def _get_folder_id_domain(self):
@@ -252,28 +209,75 @@ class IrAttachmentInherit(models.Model):
             return {'valid_folder_ids': []}
 
     @api.model
-    def _cleanup_all_invalid_folders(self):
-        """Clean up all invalid folder_id values in the database"""
-        try:
-            # Get all attachments with folder_id
-            all_attachments = self.search([('folder_id', '!=', False)])
-            
-            # Get existing folders
-            existing_folders = self.env['documents.folder'].search([])
-            existing_folder_ids = existing_folders.ids
-            
-            # Find and fix invalid folder_id values
-            invalid_attachments = all_attachments.filtered(
-                lambda att: att.folder_id.id not in existing_folder_ids
+    def _fix_orphan_folder_batch(self, after_id, batch_size):
+        """
+        Reset dangling folder_id values on one batch of attachments
+        Args:
+            after_id: only attachments with a greater ID are scanned
+            batch_size: maximum number of attachments scanned
+        Returns:
+            tuple (scanned count, orphans fixed, last scanned attachment ID)
+        """
+        self.env.cr.execute("""
+            SELECT id, folder_id FROM ir_attachment
+            WHERE id > %s AND folder_id IS NOT NULL
+            ORDER BY id
+            LIMIT %s
+        """, (after_id, batch_size))
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return 0, 0, after_id
+
+        valid_folder_ids = set(self.env['documents.folder'].browse({row[1] for row in rows}).exists().ids)
+        orphan_ids = [att_id for att_id, folder_id in rows if folder_id not in valid_folder_ids]
+        if orphan_ids:
+            self.env.cr.execute(
+                "UPDATE ir_attachment SET folder_id = NULL WHERE id IN %s", (tuple(orphan_ids),)
             )
-            
-            if invalid_attachments:
-                invalid_attachments.write({'folder_id': False})
-                _logger.info(f"Cleaned up {len(invalid_attachments)} attachments with invalid folder_id")
-                return len(invalid_attachments)
-            else:
-                _logger.info("No invalid folder_id values found")
-                return 0
+            self.invalidate_model(['folder_id'])
+        return len(rows), len(orphan_ids), rows[-1][0]
+
+    @api.model
+    def _cron_cleanup_invalid_folders(self, batch_size=5000, max_batches=20):
+        """
+        Incremental folder integrity repair
+        Resumes from a high-water mark on attachment ID stored in a system
+        parameter and restarts from the beginning once the table is exhausted.
+        Returns:
+            dict with the scanned and fixed counts of this run
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        last_id = int(ICP.get_param(FOLDER_CLEANUP_HWM_PARAM, 0))
+        stats = {'scanned': 0, 'orphans_fixed': 0, 'start_id': last_id}
+        for _batch in range(max_batches):
+            scanned, fixed, last_id = self._fix_orphan_folder_batch(last_id, batch_size)
+            stats['scanned'] += scanned
+            stats['orphans_fixed'] += fixed
+            if scanned < batch_size:
+                # Reached the end of the table, start over on the next run
+                last_id = 0
+                break
+        ICP.set_param(FOLDER_CLEANUP_HWM_PARAM, last_id)
+        stats['next_start_id'] = last_id
+        _logger.info(
+            "Attachment folder cleanup: scanned %s, fixed %s orphans (next start ID %s)",
+            stats['scanned'], stats['orphans_fixed'], last_id,
+        )
+        return stats
+
+    @api.model
+    def _cleanup_all_invalid_folders(self, batch_size=5000):
+        """Clean up all invalid folder_id values in the database, batch by batch"""
+        try:
+            total_fixed = 0
+            last_id = 0
+            while True:
+                scanned, fixed, last_id = self._fix_orphan_folder_batch(last_id, batch_size)
+                total_fixed += fixed
+                if scanned < batch_size:
+                    break
+            _logger.info(f"Cleaned up {total_fixed} attachments with invalid folder_id")
+            return total_fixed
                 
         except Exception as e:
             _logger.error(f"Error in _cleanup_all_invalid_folders: {e}")
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from odoo import api, fields, models
+
+from .project import CHECKPOINT_GROUPS
+
+_logger = logging.getLogger(__name__)
+
+
+class ProjectCheckpointDashboard(models.Model):
+    """Portfolio-wide checkpoint dashboard.
+
+    Backed by a PostgreSQL materialised view with one row per project that
+    aggregates checkpoint stages, reached checkpoints, document line
+    completeness and ageing. The view is refreshed periodically by a cron,
+    so dashboards read precomputed rows instead of running per-project
+    computes.
+    """
+    _name = 'project.checkpoint.dashboard'
+    _description = 'Project Checkpoint Dashboard'
+    _auto = False
+    _order = 'idle_days desc, project_id'
+
+    # Projects idle for longer than this without reaching every checkpoint are blocked
+    _blocked_after_days = 14
+
+    project_id = fields.Many2one('project.project', string='Project', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    user_id = fields.Many2one('res.users', string='Project Manager', readonly=True)
+    partner_id = fields.Many2one('res.partner', string='Customer', readonly=True)
+    required_documents_done = fields.Boolean(string='Required Documents', readonly=True)
+    deliverable_documents_done = fields.Boolean(string='Deliverable Documents', readonly=True)
+    compliance_done = fields.Boolean(string='Compliance', readonly=True)
+    partner_fields_done = fields.Boolean(string='Partner Fields', readonly=True)
+    checkpoint_completed_count = fields.Integer(string='Completed Checkpoints', readonly=True)
+    checkpoint_progress = fields.Float(string='Progress (%)', readonly=True, aggregator='avg')
+    next_missing_checkpoint = fields.Char(string='Stuck On', readonly=True)
+    reached_checkpoint_count = fields.Integer(string='Reached Checkpoints', readonly=True)
+    last_checkpoint_date = fields.Date(string='Last Checkpoint', readonly=True)
+    project_age_days = fields.Integer(string='Age (Days)', readonly=True, aggregator='avg')
+    idle_days = fields.Integer(string='Idle (Days)', readonly=True, aggregator='avg')
+    ageing_bucket = fields.Selection([
+        ('0_7', '0-7 days'),
+        ('8_30', '8-30 days'),
+        ('31_90', '31-90 days'),
+        ('90_plus', '90+ days'),
+    ], string='Ageing', readonly=True)
+    is_blocked = fields.Boolean(string='Blocked', readonly=True)
+    required_line_count = fields.Integer(string='Required Lines', readonly=True)
+    required_missing_count = fields.Integer(string='Required Missing', readonly=True)
+    deliverable_line_count = fields.Integer(string='Deliverable Lines', readonly=True)
+    deliverable_missing_count = fields.Integer(string='Deliverable Missing', readonly=True)
+    refreshed_at = fields.Datetime(string='Refreshed At', readonly=True)
+
+    def _stage_done_sql(self, steps):
+        fnames = [fname for step_fnames, _state in steps for fname in step_fnames]
+        return '(' + ' OR '.join(f'COALESCE(p.{fname}, FALSE)' for fname in fnames) + ')'
+
+    def _document_lines_sql(self, model_name):
+        """Per-project line and missing-attachment counts of a project document model"""
+        model = self.env[model_name]
+        attachments = model._fields['x_attachment_ids']
+        return f"""
+            SELECT line.x_project_id AS project_id,
+                   COUNT(*) AS line_count,
+                   COUNT(*) FILTER (
+                       WHERE line.x_is_required AND NOT EXISTS (
+                           SELECT 1 FROM {attachments.relation} rel
+                           WHERE rel.{attachments.column1} = line.id
+                       )
+                   ) AS missing_count
+              FROM {model._table} line
+             WHERE line.x_project_id IS NOT NULL
+          GROUP BY line.x_project_id
+        """
+
+    def _query(self):
+        stage_done = [self._stage_done_sql(steps) for _label, steps in CHECKPOINT_GROUPS]
+        completed = ' + '.join(f'({done})::int' for done in stage_done)
+        idle = "(CURRENT_DATE - COALESCE(rc.last_checkpoint_date, p.create_date::date))"
+        return f"""
+            SELECT p.id AS id,
+                   p.id AS project_id,
+                   p.company_id,
+                   p.user_id,
+                   p.partner_id,
+                   {stage_done[0]} AS required_documents_done,
+                   {stage_done[1]} AS deliverable_documents_done,
+                   {stage_done[2]} AS compliance_done,
+                   {stage_done[3]} AS partner_fields_done,
+                   {completed} AS checkpoint_completed_count,
+                   ({completed}) * 100.0 / {len(CHECKPOINT_GROUPS)} AS checkpoint_progress,
+                   p.next_missing_checkpoint,
+                   COALESCE(rc.reached_count, 0) AS reached_checkpoint_count,
+                   rc.last_checkpoint_date,
+                   (CURRENT_DATE - p.create_date::date) AS project_age_days,
+                   {idle} AS idle_days,
+                   CASE
+                       WHEN {idle} <= 7 THEN '0_7'
+                       WHEN {idle} <= 30 THEN '8_30'
+                       WHEN {idle} <= 90 THEN '31_90'
+                       ELSE '90_plus'
+                   END AS ageing_bucket,
+                   ({completed} < {len(CHECKPOINT_GROUPS)} AND {idle} > {self._blocked_after_days}) AS is_blocked,
+                   COALESCE(req.line_count, 0) AS required_line_count,
+                   COALESCE(req.missing_count, 0) AS required_missing_count,
+                   COALESCE(dlv.line_count, 0) AS deliverable_line_count,
+                   COALESCE(dlv.missing_count, 0) AS deliverable_missing_count,
+                   NOW() AT TIME ZONE 'UTC' AS refreshed_at
+              FROM project_project p
+         LEFT JOIN (
+                SELECT project_id,
+                       COUNT(*) AS reached_count,
+                       MAX(reached_date) AS last_checkpoint_date
+                  FROM reached_checkpoint
+                 WHERE project_id IS NOT NULL
+              GROUP BY project_id
+              ) rc ON rc.project_id = p.id
+         LEFT JOIN ({self._document_lines_sql('project.required.document')}) req ON req.project_id = p.id
+         LEFT JOIN ({self._document_lines_sql('project.deliverable.document')}) dlv ON dlv.project_id = p.id
+             WHERE p.active
+        """
+
+    def init(self):
+        self.env.cr.execute(f"DROP MATERIALIZED VIEW IF EXISTS {self._table} CASCADE")
+        self.env.cr.execute(f"CREATE MATERIALIZED VIEW {self._table} AS ({self._query()})")
+        # A unique index allows refreshing without locking readers out
+        self.env.cr.execute(f"CREATE UNIQUE INDEX {self._table}_id_idx ON {self._table} (id)")
+        self.env.cr.execute(f"CREATE INDEX {self._table}_next_missing_idx ON {self._table} (next_missing_checkpoint)")
+
+    @api.model
+    def refresh(self):
+        """Refresh the materialised view"""
+        self.env.flush_all()
+        self.env.cr.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self._table}")
+        self.env.invalidate_all()
+        _logger.info("Refreshed project checkpoint dashboard")
+        return True
+
+    def action_refresh(self):
+        self.refresh()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
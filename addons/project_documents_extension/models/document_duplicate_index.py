@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+
+from odoo import models
+from odoo.osv import expression
+
+from ..instrumentation import instrumented
+
+
+class ProjectDocumentDuplicateMixin(models.AbstractModel):
+    """Batched duplicate detection for project document lines.
+
+    Instead of searching once per record, the lines of a whole create/write
+    batch are checked against a single grouped query. Every matching row is
+    indexed under (context field, context id, document type) for each context
+    it belongs to, together with a fingerprint of its attachment set, so each
+    record is resolved with a dictionary lookup.
+    """
+    _name = 'project.document.duplicate.mixin'
+    _description = 'Project Document Duplicate Index'
+
+    # Context priority used to scope duplicates: product > project > task
+    _duplicate_context_fields = ('product_tmpl_id', 'project_id', 'task_id')
+
+    def _get_duplicate_context(self):
+        """Return the (field name, record) scoping duplicates for this line"""
+        self.ensure_one()
+        for fname in self._duplicate_context_fields:
+            if self[fname]:
+                return fname, self[fname]
+        return False, False
+
+    def _get_duplicate_context_info(self):
+        """Human readable suffix describing the duplicate scope of this line"""
+        fname, context = self._get_duplicate_context()
+        if not fname:
+            return ""
+        label = {'product_tmpl_id': 'product', 'project_id': 'project', 'task_id': 'task'}[fname]
+        return f" in {label} {context.name}"
+
+    def _get_attachment_fingerprint(self):
+        """Hashable fingerprint of the attachment set of this line"""
+        self.ensure_one()
+        return frozenset(self.attachment_ids.ids)
+
+    def _build_duplicate_index(self):
+        """
+        Load every line that may collide with the records in self.
+        Returns:
+            dict (context field, context id, document type id) ->
+            list of (line id, attachment fingerprint)
+        """
+        records = self.filtered('document_type_id')
+        if not records:
+            return {}
+
+        context_domains = []
+        for fname in self._duplicate_context_fields:
+            context_ids = records[fname].ids
+            if context_ids:
+                context_domains.append([(fname, 'in', context_ids)])
+        if any(not record._get_duplicate_context()[0] for record in records):
+            # Lines without context are compared with every line of their type
+            context_domains.append(expression.TRUE_DOMAIN)
+        domain = expression.AND([
+            [('document_type_id', 'in', records.document_type_id.ids)],
+            expression.OR(context_domains),
+        ])
+        rows = self.search_fetch(domain, ['document_type_id', 'attachment_ids'] + list(self._duplicate_context_fields))
+
+        index = defaultdict(list)
+        for row in rows:
+            entry = (row.id, row._get_attachment_fingerprint())
+            type_id = row.document_type_id.id
+            index[(False, False, type_id)].append(entry)
+            for fname in self._duplicate_context_fields:
+                if row[fname]:
+                    index[(fname, row[fname].id, type_id)].append(entry)
+        return index
+
+    @instrumented('duplicate_check')
+    def _find_batch_duplicates(self):
+        """
+        Resolve duplicates for the whole recordset with one grouped query.
+        Returns:
+            dict line id -> (duplicate lines, same_attachments, missing_attachments)
+            for lines that have at least one duplicate; same_attachments is set
+            when a duplicate carries the exact same attachment set and
+            missing_attachments when either side has no attachment at all
+        """
+        index = self._build_duplicate_index()
+        result = {}
+        for record in self.filtered('document_type_id'):
+            fname, context = record._get_duplicate_context()
+            key = (fname, context.id if context else False, record.document_type_id.id)
+            entries = [entry for entry in index.get(key, []) if entry[0] != record.id]
+            if not entries:
+                continue
+            fingerprint = record._get_attachment_fingerprint()
+            same_attachments = bool(fingerprint) and any(fp == fingerprint for _id, fp in entries)
+            missing_attachments = not fingerprint or any(not fp for _id, fp in entries)
+            result[record.id] = (
+                self.browse([entry[0] for entry in entries]), same_attachments, missing_attachments,
+            )
+        return result
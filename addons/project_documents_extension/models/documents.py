@@ -1,6 +1,9 @@
 from odoo import _, api, fields, models
+from collections import defaultdict
 import logging
 
+from ..instrumentation import debug
+
 _logger = logging.getLogger(__name__)
 
 
@@ -8,41 +11,33 @@ class DocumentsDocument(models.Model):
     _inherit = 'documents.document'
     
     def _auto_assign_to_project_folder(self):
-        """Automatically assign documents to project folders based on res_model and res_id"""
-        for document in self:
-            _logger.info(f"🔍 Checking document '{document.name}' (res_model='{document.res_model}', res_id={document.res_id})")
-            
-            if document.res_model == 'project.project' and document.res_id:
-                try:
-                    project = self.env['project.project'].browse(document.res_id)
-                    if project.exists():
-                        _logger.info(f"📁 Found project '{project.name}', ensuring it has a folder")
-                        
-                        # Ensure project has a folder
-                        project._ensure_project_folder()
-                        
-                        # Move document to project folder if not already there
-                        if project.documents_folder_id:
-                            if document.folder_id != project.documents_folder_id:
-                                old_folder = document.folder_id.name if document.folder_id else 'None'
-                                document.folder_id = project.documents_folder_id.id
-                                _logger.info(f"✅ Moved document '{document.name}' from folder '{old_folder}' to project folder '{project.name}'")
-                            else:
-                                _logger.info(f"✅ Document '{document.name}' already in correct project folder '{project.name}'")
-                        else:
-                            _logger.warning(f"⚠️ Project '{project.name}' has no documents folder")
-                    else:
-                        _logger.warning(f"⚠️ Project with ID {document.res_id} does not exist")
-                except Exception as e:
-                    _logger.error(f"❌ Failed to assign document {document.name} to project folder: {e}")
-            else:
-                _logger.info(f"ℹ️ Document '{document.name}' is not linked to a project (res_model='{document.res_model}', res_id={document.res_id})")
-    
+        """Move the documents linked to projects into their project folder, with one write per folder"""
+        project_documents = self.grouped('res_model').get('project.project')
+        if not project_documents:
+            return
+        project_documents = project_documents.filtered('res_id')
+        # Projects and their current folders in a single query
+        projects = self.env['project.project'].search_fetch(
+            [('id', 'in', list(set(project_documents.mapped('res_id'))))],
+            ['name', 'company_id', 'documents_folder_id'],
+        )
+        folder_by_project = projects._ensure_project_folder()
+
+        document_ids_by_folder = defaultdict(list)
+        for document in project_documents:
+            folder = folder_by_project.get(document.res_id)
+            if not folder:
+                debug(_logger, "Project %s of document %s has no documents folder", document.res_id, document.id)
+            elif document.folder_id != folder:
+                document_ids_by_folder[folder].append(document.id)
+        for folder, document_ids in document_ids_by_folder.items():
+            self.browse(document_ids).write({'folder_id': folder.id})
+            debug(_logger, "Moved documents %s to folder %s", document_ids, folder.id)
+
     @api.model_create_multi
     def create(self, vals_list):
         """Override create to automatically assign documents to project folders"""
         documents = super().create(vals_list)
-        _logger.info(f"🔧 Created {len(documents)} documents, now assigning to project folders")
         documents._auto_assign_to_project_folder()
         return documents
     
@@ -54,7 +49,15 @@ class DocumentsDocument(models.Model):
         if 'res_model' in vals or 'res_id' in vals:
             self._auto_assign_to_project_folder()
         
-        return result 
+        return result
+
+    def unlink(self):
+        """Override unlink to drop cached project folder resolutions when folders go away"""
+        has_folders = any(document.type == 'folder' for document in self)
+        result = super().unlink()
+        if has_folders:
+            self.env['project.folder.resolver'].invalidate()
+        return result
 
 
 class ProjectRequiredDocument(models.Model):
@@ -76,7 +79,8 @@ class ProjectRequiredDocument(models.Model):
     x_is_required = fields.Boolean(string='x_Required', default=False)
     x_expiry_date = fields.Date('x_Expiry Date')
     x_reminder_days = fields.Integer('x_Reminder Days', default=30)
-    x_is_expired = fields.Boolean('x_Is Expired', default=False)
+    x_is_expired = fields.Boolean('x_Is Expired', compute='x_compute_expired', store=True, index=True,
+                                  help="x_Flipped by the nightly expiry job once the expiry date has passed")
     x_is_verify = fields.Boolean('x_Is Verified', default=False)
     x_number = fields.Char(
         string="x_Number",
@@ -102,20 +106,9 @@ class ProjectRequiredDocument(models.Model):
 
     @api.depends('x_expiry_date')
     def x_compute_expired(self):
-        try:
-            today = fields.Date.today()
-            for record in self:
-                try:
-                    if record.x_expiry_date:
-                        is_expired = record.x_expiry_date < today
-                        record.x_is_expired = is_expired
-                    else:
-                        record.x_is_expired = False
-                except Exception:
-                    record.x_is_expired = False
-        except Exception:
-            for record in self:
-                record.x_is_expired = False
+        today = fields.Date.today()
+        for record in self:
+            record.x_is_expired = bool(record.x_expiry_date and record.x_expiry_date < today)
 
     def x_action_numbers(self):
         docs = self.env[self._name].sudo().search([])
@@ -155,37 +148,13 @@ class ProjectRequiredDocument(models.Model):
         except Exception:
             pass
 
+    def _get_conversion_project(self):
+        """Project whose documents folder receives the converted attachments"""
+        self.ensure_one()
+        return self.x_project_id or self.x_task_id.project_id
+
     def action_convert_x_attachments_to_documents(self):
-        for record in self:
-            project = record.x_project_id or (record.x_task_id and record.x_task_id.project_id)
-            _logger.info(f"[x_doc] Converting attachments for record {record.id} (project: {getattr(project, 'name', None)})")
-            if not project:
-                _logger.warning(f"[x_doc] No project for record {record.id}")
-                continue
-            # Ensure the project has a folder
-            if not project.documents_folder_id:
-                project._ensure_project_folder()
-            if not project.documents_folder_id:
-                _logger.warning(f"[x_doc] No project folder for record {record.id} after ensure.")
-                continue
-            _logger.info(f"[x_doc] Using folder: {getattr(project.documents_folder_id, 'name', None)} (ID: {getattr(project.documents_folder_id, 'id', None)})")
-            for attachment in record.x_attachment_ids:
-                _logger.info(f"[x_doc] Processing attachment {attachment.id} ({attachment.name}) for record {record.id}")
-                existing_doc = self.env['documents.document'].search([
-                    ('attachment_id', '=', attachment.id)
-                ], limit=1)
-                if not existing_doc:
-                    doc = self.env['documents.document'].create({
-                        'name': attachment.name,
-                        'attachment_id': attachment.id,
-                        'res_model': project._name,
-                        'res_id': project.id,
-                        'type': 'file',
-                        'folder_id': project.documents_folder_id.id,
-                    })
-                    _logger.info(f"[x_doc] Created documents.document {doc.id} in folder {project.documents_folder_id.name}")
-                else:
-                    _logger.info(f"[x_doc] Attachment {attachment.id} already has documents.document {existing_doc.id}")
+        return self.env['attachment.conversion.service'].convert_lines(self, 'x_attachment_ids')
 
     # Add a button for user testing
     def button_convert_x_attachments(self):
@@ -203,34 +172,18 @@ class ProjectRequiredDocument(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        records._auto_convert_x_attachments()
+        records.filtered('x_attachment_ids')._auto_convert_x_attachments()
         return records
 
     def write(self, vals):
         res = super().write(vals)
-        self._auto_convert_x_attachments()
+        # Only convert when the attachments actually changed
+        if 'x_attachment_ids' in vals:
+            self._auto_convert_x_attachments()
         return res
 
     def _auto_convert_x_attachments(self):
-        for record in self:
-            project = record.x_project_id or (record.x_task_id and record.x_task_id.project_id)
-            if not project:
-                continue
-            if not project.documents_folder_id:
-                project._ensure_project_folder()
-            for attachment in record.x_attachment_ids:
-                existing_doc = self.env['documents.document'].search([
-                    ('attachment_id', '=', attachment.id)
-                ], limit=1)
-                if not existing_doc:
-                    self.env['documents.document'].create({
-                        'name': attachment.name,
-                        'attachment_id': attachment.id,
-                        'res_model': project._name,
-                        'res_id': project.id,
-                        'type': 'file',
-                        'folder_id': project.documents_folder_id.id,
-                    })
+        return self.env['attachment.conversion.service'].convert_lines(self, 'x_attachment_ids')
 
 
 class ProjectDeliverableDocument(models.Model):
@@ -252,7 +205,8 @@ class ProjectDeliverableDocument(models.Model):
     x_is_required = fields.Boolean(string='x_Required', default=False)
     x_expiry_date = fields.Date('x_Expiry Date')
     x_reminder_days = fields.Integer('x_Reminder Days', default=30)
-    x_is_expired = fields.Boolean('x_Is Expired', default=False)
+    x_is_expired = fields.Boolean('x_Is Expired', compute='x_compute_expired', store=True, index=True,
+                                  help="x_Flipped by the nightly expiry job once the expiry date has passed")
     x_is_verify = fields.Boolean('x_Is Verified', default=False)
     x_number = fields.Char(
         string="x_Number",
@@ -278,20 +232,9 @@ class ProjectDeliverableDocument(models.Model):
 
     @api.depends('x_expiry_date')
     def x_compute_expired(self):
-        try:
-            today = fields.Date.today()
-            for record in self:
-                try:
-                    if record.x_expiry_date:
-                        is_expired = record.x_expiry_date < today
-                        record.x_is_expired = is_expired
-                    else:
-                        record.x_is_expired = False
-                except Exception:
-                    record.x_is_expired = False
-        except Exception:
-            for record in self:
-                record.x_is_expired = False
+        today = fields.Date.today()
+        for record in self:
+            record.x_is_expired = bool(record.x_expiry_date and record.x_expiry_date < today)
 
     def x_action_numbers(self):
         docs = self.env[self._name].sudo().search([])
@@ -331,37 +274,13 @@ class ProjectDeliverableDocument(models.Model):
         except Exception:
             pass
 
+    def _get_conversion_project(self):
+        """Project whose documents folder receives the converted attachments"""
+        self.ensure_one()
+        return self.x_project_id or self.x_task_id.project_id
+
     def action_convert_x_attachments_to_documents(self):
-        for record in self:
-            project = record.x_project_id or (record.x_task_id and record.x_task_id.project_id)
-            _logger.info(f"[x_doc] Converting attachments for record {record.id} (project: {getattr(project, 'name', None)})")
-            if not project:
-                _logger.warning(f"[x_doc] No project for record {record.id}")
-                continue
-            # Ensure the project has a folder
-            if not project.documents_folder_id:
-                project._ensure_project_folder()
-            if not project.documents_folder_id:
-                _logger.warning(f"[x_doc] No project folder for record {record.id} after ensure.")
-                continue
-            _logger.info(f"[x_doc] Using folder: {getattr(project.documents_folder_id, 'name', None)} (ID: {getattr(project.documents_folder_id, 'id', None)})")
-            for attachment in record.x_attachment_ids:
-                _logger.info(f"[x_doc] Processing attachment {attachment.id} ({attachment.name}) for record {record.id}")
-                existing_doc = self.env['documents.document'].search([
-                    ('attachment_id', '=', attachment.id)
-                ], limit=1)
-                if not existing_doc:
-                    doc = self.env['documents.document'].create({
-                        'name': attachment.name,
-                        'attachment_id': attachment.id,
-                        'res_model': project._name,
-                        'res_id': project.id,
-                        'type': 'file',
-                        'folder_id': project.documents_folder_id.id,
-                    })
-                    _logger.info(f"[x_doc] Created documents.document {doc.id} in folder {project.documents_folder_id.name}")
-                else:
-                    _logger.info(f"[x_doc] Attachment {attachment.id} already has documents.document {existing_doc.id}")
+        return self.env['attachment.conversion.service'].convert_lines(self, 'x_attachment_ids')
 
     # Add a button for user testing
     def button_convert_x_attachments(self):
@@ -379,34 +298,18 @@ class ProjectDeliverableDocument(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        records._auto_convert_x_attachments()
+        records.filtered('x_attachment_ids')._auto_convert_x_attachments()
         return records
 
     def write(self, vals):
         res = super().write(vals)
-        self._auto_convert_x_attachments()
+        # Only convert when the attachments actually changed
+        if 'x_attachment_ids' in vals:
+            self._auto_convert_x_attachments()
         return res
 
     def _auto_convert_x_attachments(self):
-        for record in self:
-            project = record.x_project_id or (record.x_task_id and record.x_task_id.project_id)
-            if not project:
-                continue
-            if not project.documents_folder_id:
-                project._ensure_project_folder()
-            for attachment in record.x_attachment_ids:
-                existing_doc = self.env['documents.document'].search([
-                    ('attachment_id', '=', attachment.id)
-                ], limit=1)
-                if not existing_doc:
-                    self.env['documents.document'].create({
-                        'name': attachment.name,
-                        'attachment_id': attachment.id,
-                        'res_model': project._name,
-                        'res_id': project.id,
-                        'type': 'file',
-                        'folder_id': project.documents_folder_id.id,
-                    })
+        return self.env['attachment.conversion.service'].convert_lines(self, 'x_attachment_ids')
 
 # Inverse fields for project.project
 class ProjectProject(models.Model):
@@ -419,6 +322,17 @@ class ProjectTask(models.Model):
     _inherit = 'project.task'
     x_required_document_ids = fields.One2many('project.required.document', 'x_task_id', string='x_Required Documents')
     x_deliverable_document_ids = fields.One2many('project.deliverable.document', 'x_task_id', string='x_Deliverable Documents')
+    x_share_project_documents = fields.Boolean(
+        string='x_Share Project Documents',
+        copy=False,
+        help='The task reads the document lines of its project instead of holding its own copies',
+    )
+    x_shared_document_ids = fields.One2many('project.task.shared.document', 'task_id', string='x_Shared Project Documents')
+
+    def action_detach_shared_documents(self):
+        """Give the tasks their own copies of the shared project document lines"""
+        self.env['project.document.service'].detach_shared_documents(self)
+        return True
 
 # Inverse fields for documents.document
 class DocumentsDocument(models.Model):
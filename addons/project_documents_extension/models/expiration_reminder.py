@@ -1,112 +1,174 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
-import datetime
+from datetime import timedelta
 
 
 class ProjectDocumentExpirationReminder(models.Model):
     _inherit = 'project.document.type.line'
 
+    _expiration_date_field = 'expiry_date'
+    _expiration_expired_field = 'is_expired'
+    _expiration_due_field = 'reminder_due_date'
+    _expiration_flag_field = 'expiration_reminder'
+    _expiration_sent_field = 'expiration_reminder_sent'
+
+    reminder_due_date = fields.Date('Reminder Due Date', compute='_compute_reminder_due_date', store=True, index=True,
+                                    help="Expiry date minus the reminder days")
+
+    @api.depends('expiry_date', 'reminder_days')
+    def _compute_reminder_due_date(self):
+        for document in self:
+            document.reminder_due_date = document.expiry_date and (
+                document.expiry_date - timedelta(days=document.reminder_days or 0)
+            )
+
     def check_for_expiration(self):
-        """Check for expired documents and send reminders"""
-        documents = self.search([
-            ('expiration_reminder', '=', True), 
-            ('expiration_reminder_sent', '=', False)
-        ])
-        today = datetime.datetime.now()
-        thirty_days_from_today = today + datetime.timedelta(days=30)
-        expired_documents = [
-            document for document in documents 
-            if document.expiration_date and document.expiration_date < thirty_days_from_today.date()
-        ]
-        
-        for document in expired_documents:
-            # Send email reminder
-            self._send_expiration_reminder(document)
-            document.write({'expiration_reminder_sent': True})
-
-    def _send_expiration_reminder(self, document):
-        """Send expiration reminder email"""
-        # Create a simple email template for now
-        # You can enhance this with proper mail templates later
-        subject = f"Document Expiration Reminder: {document.document_type_id.name}"
-        body = f"""
-        <p>Hello,</p>
-        <p>The following document is expiring soon:</p>
-        <ul>
-            <li><strong>Document:</strong> {document.document_type_id.name}</li>
-            <li><strong>Expiry Date:</strong> {document.expiry_date}</li>
-            <li><strong>Project:</strong> {document.project_id.name if document.project_id else 'N/A'}</li>
-            <li><strong>Task:</strong> {document.task_id.name if document.task_id else 'N/A'}</li>
-        </ul>
-        <p>Please take necessary action to renew or update this document.</p>
-        """
-        
-        # Send email to project manager or task assignee
-        recipients = []
-        if document.project_id.user_id:
-            recipients.append(document.project_id.user_id.email)
-        if document.task_id.user_id:
-            recipients.append(document.task_id.user_id.email)
-        
-        if recipients:
-            self.env['mail.mail'].create({
-                'subject': subject,
-                'body_html': body,
-                'email_to': ','.join(set(recipients)),
-                'auto_delete': True,
-            }).send()
+        """Check for expiring documents and queue digest reminders"""
+        return self.env['document.expiration.reminder.service'].send_reminders(self._name)
+
+    def _get_expiration_reminder_entries(self):
+        """Recipients and digest line of each document"""
+        service = self.env['document.expiration.reminder.service']
+        entries = []
+        for document in self:
+            # Send email to project manager or task assignee
+            recipients = {
+                email for email in [document.project_id.user_id.email] + document.task_id.user_ids.mapped('email')
+                if email
+            }
+            entries.append({
+                'recipients': recipients,
+                'line': service.format_line(document.document_type_id.name, document.expiry_date, {
+                    'Project': document.project_id.name,
+                    'Task': document.task_id.name,
+                }),
+            })
+        return entries
 
 
 class ProjectDocumentRequiredExpirationReminder(models.Model):
     _inherit = 'project.document.required.line'
 
+    _expiration_date_field = 'expiry_date'
+    _expiration_expired_field = 'is_expired'
+    _expiration_due_field = 'reminder_due_date'
+    _expiration_flag_field = 'expiration_reminder'
+    _expiration_sent_field = 'expiration_reminder_sent'
+
+    reminder_due_date = fields.Date('Reminder Due Date', compute='_compute_reminder_due_date', store=True, index=True,
+                                    help="Expiry date minus the reminder days")
+
+    @api.depends('expiry_date', 'reminder_days')
+    def _compute_reminder_due_date(self):
+        for document in self:
+            document.reminder_due_date = document.expiry_date and (
+                document.expiry_date - timedelta(days=document.reminder_days or 0)
+            )
+
+    def check_for_expiration(self):
+        """Check for expiring documents and queue digest reminders"""
+        return self.env['document.expiration.reminder.service'].send_reminders(self._name)
+
+    def _get_expiration_reminder_entries(self):
+        """Recipients and digest line of each required document"""
+        service = self.env['document.expiration.reminder.service']
+        entries = []
+        for document in self:
+            # Send email to project manager or task assignee
+            recipients = {
+                email for email in [document.project_id.user_id.email] + document.task_id.user_ids.mapped('email')
+                if email
+            }
+            entries.append({
+                'recipients': recipients,
+                'line': service.format_line(document.document_type_id.name, document.expiry_date, {
+                    'Project': document.project_id.name,
+                    'Task': document.task_id.name,
+                }),
+            })
+        return entries
+
+
+class ProjectRequiredDocumentExpirationReminder(models.Model):
+    _inherit = 'project.required.document'
+
+    _expiration_date_field = 'x_expiry_date'
+    _expiration_expired_field = 'x_is_expired'
+    _expiration_due_field = 'x_reminder_due_date'
+    _expiration_flag_field = 'x_expiration_reminder'
+    _expiration_sent_field = 'x_expiration_reminder_sent'
+
+    x_reminder_due_date = fields.Date('x_Reminder Due Date', compute='_compute_x_reminder_due_date', store=True,
+                                      index=True, help="x_Expiry date minus the x_reminder days")
+
+    @api.depends('x_expiry_date', 'x_reminder_days')
+    def _compute_x_reminder_due_date(self):
+        for document in self:
+            document.x_reminder_due_date = document.x_expiry_date and (
+                document.x_expiry_date - timedelta(days=document.x_reminder_days or 0)
+            )
+
+    def check_for_expiration(self):
+        """Check for expiring documents and queue digest reminders"""
+        return self.env['document.expiration.reminder.service'].send_reminders(self._name)
+
+    def _get_expiration_reminder_entries(self):
+        """Recipients and digest line of each required document"""
+        service = self.env['document.expiration.reminder.service']
+        entries = []
+        for document in self:
+            project = document.x_project_id or document.x_task_id.project_id
+            recipients = {
+                email for email in [project.user_id.email] + document.x_task_id.user_ids.mapped('email') if email
+            }
+            entries.append({
+                'recipients': recipients,
+                'line': service.format_line(document.x_document_type_id.name or document.name, document.x_expiry_date, {
+                    'Project': project.name,
+                    'Task': document.x_task_id.name,
+                }),
+            })
+        return entries
+
+
+class ProjectDeliverableDocumentExpirationReminder(models.Model):
+    _inherit = 'project.deliverable.document'
+
+    _expiration_date_field = 'x_expiry_date'
+    _expiration_expired_field = 'x_is_expired'
+    _expiration_due_field = 'x_reminder_due_date'
+    _expiration_flag_field = 'x_expiration_reminder'
+    _expiration_sent_field = 'x_expiration_reminder_sent'
+
+    x_reminder_due_date = fields.Date('x_Reminder Due Date', compute='_compute_x_reminder_due_date', store=True,
+                                      index=True, help="x_Expiry date minus the x_reminder days")
+
+    @api.depends('x_expiry_date', 'x_reminder_days')
+    def _compute_x_reminder_due_date(self):
+        for document in self:
+            document.x_reminder_due_date = document.x_expiry_date and (
+                document.x_expiry_date - timedelta(days=document.x_reminder_days or 0)
+            )
+
     def check_for_expiration(self):
-        """Check for expired documents and send reminders"""
-        documents = self.search([
-            ('expiration_reminder', '=', True), 
-            ('expiration_reminder_sent', '=', False)
-        ])
-        today = datetime.datetime.now()
-        thirty_days_from_today = today + datetime.timedelta(days=30)
-        expired_documents = [
-            document for document in documents 
-            if document.expiration_date and document.expiration_date < thirty_days_from_today.date()
-        ]
-        
-        for document in expired_documents:
-            # Send email reminder
-            self._send_expiration_reminder(document)
-            document.write({'expiration_reminder_sent': True})
-
-    def _send_expiration_reminder(self, document):
-        """Send expiration reminder email"""
-        # Create a simple email template for now
-        # You can enhance this with proper mail templates later
-        subject = f"Required Document Expiration Reminder: {document.document_type_id.name}"
-        body = f"""
-        <p>Hello,</p>
-        <p>The following required document is expiring soon:</p>
-        <ul>
-            <li><strong>Document:</strong> {document.document_type_id.name}</li>
-            <li><strong>Expiry Date:</strong> {document.expiry_date}</li>
-            <li><strong>Project:</strong> {document.project_id.name if document.project_id else 'N/A'}</li>
-            <li><strong>Task:</strong> {document.task_id.name if document.task_id else 'N/A'}</li>
-        </ul>
-        <p>Please take necessary action to renew or update this document.</p>
-        """
-        
-        # Send email to project manager or task assignee
-        recipients = []
-        if document.project_id.user_id:
-            recipients.append(document.project_id.user_id.email)
-        if document.task_id.user_id:
-            recipients.append(document.task_id.user_id.email)
-        
-        if recipients:
-            self.env['mail.mail'].create({
-                'subject': subject,
-                'body_html': body,
-                'email_to': ','.join(set(recipients)),
-                'auto_delete': True,
-            }).send() 
\ No newline at end of file
+        """Check for expiring documents and queue digest reminders"""
+        return self.env['document.expiration.reminder.service'].send_reminders(self._name)
+
+    def _get_expiration_reminder_entries(self):
+        """Recipients and digest line of each deliverable document"""
+        service = self.env['document.expiration.reminder.service']
+        entries = []
+        for document in self:
+            project = document.x_project_id or document.x_task_id.project_id
+            recipients = {
+                email for email in [project.user_id.email] + document.x_task_id.user_ids.mapped('email') if email
+            }
+            entries.append({
+                'recipients': recipients,
+                'line': service.format_line(document.x_document_type_id.name or document.name, document.x_expiry_date, {
+                    'Project': project.name,
+                    'Task': document.x_task_id.name,
+                }),
+            })
+        return entries
@@ -31,8 +31,8 @@ class ProjectMilestone(models.Model):
         self.ensure_one()
         
         if self.mail_template_id and task.partner_id:
-            # Send email notification
-            self.mail_template_id.send_mail(task.id, force_send=True)
+            # Queue email notification, the mail queue cron sends it
+            self.mail_template_id.send_mail(task.id, force_send=False)
         
         if self.milestone_message:
             # Post message to task chatter
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+
+class ProjectDocumentsPerfSample(models.Model):
+    """Raw timing samples recorded by the instrumentation layer"""
+    _name = 'project.documents.perf.sample'
+    _description = 'Project Documents Performance Sample'
+    _log_access = False
+    _order = 'recorded_at desc'
+
+    # Samples older than this are garbage collected
+    _retention_days = 7
+
+    operation = fields.Char(string='Operation', required=True, index=True, readonly=True)
+    duration_ms = fields.Float(string='Duration (ms)', readonly=True)
+    query_count = fields.Integer(string='Queries', readonly=True)
+    recorded_at = fields.Datetime(string='Recorded At', index=True, readonly=True)
+
+    @api.model
+    def record(self, operation, duration_ms, query_count):
+        """Store one sample with a single INSERT, bypassing the ORM overhead"""
+        self.env.cr.execute(SQL(
+            "INSERT INTO %s (operation, duration_ms, query_count, recorded_at) "
+            "VALUES (%s, %s, %s, NOW() AT TIME ZONE 'UTC')",
+            SQL.identifier(self._table), operation, duration_ms, query_count,
+        ))
+
+    @api.autovacuum
+    def _gc_samples(self):
+        limit_date = fields.Datetime.now() - timedelta(days=self._retention_days)
+        self.env.cr.execute(SQL(
+            "DELETE FROM %s WHERE recorded_at < %s",
+            SQL.identifier(self._table), limit_date,
+        ))
+
+
+class ProjectDocumentsPerformance(models.Model):
+    """Per-operation timing percentiles of the recorded samples"""
+    _name = 'project.documents.performance'
+    _description = 'Project Documents Performance'
+    _auto = False
+    _order = 'p95_ms desc'
+
+    operation = fields.Char(string='Operation', readonly=True)
+    sample_count = fields.Integer(string='Samples', readonly=True)
+    p50_ms = fields.Float(string='p50 (ms)', readonly=True, aggregator='max')
+    p95_ms = fields.Float(string='p95 (ms)', readonly=True, aggregator='max')
+    max_ms = fields.Float(string='Max (ms)', readonly=True, aggregator='max')
+    p50_queries = fields.Float(string='p50 Queries', readonly=True, aggregator='max')
+    p95_queries = fields.Float(string='p95 Queries', readonly=True, aggregator='max')
+    last_recorded_at = fields.Datetime(string='Last Sample', readonly=True)
+
+    def init(self):
+        samples = self.env['project.documents.perf.sample']._table
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT ROW_NUMBER() OVER (ORDER BY operation) AS id,
+                       operation,
+                       COUNT(*) AS sample_count,
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms) AS p50_ms,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) AS p95_ms,
+                       MAX(duration_ms) AS max_ms,
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY query_count) AS p50_queries,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY query_count) AS p95_queries,
+                       MAX(recorded_at) AS last_recorded_at
+                  FROM {samples}
+              GROUP BY operation
+            )
+        """)
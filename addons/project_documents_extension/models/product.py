@@ -1,4 +1,6 @@
-from odoo import models, api, fields
+from odoo import models, api, fields, tools
+
+from .product_task_template import TemplateTree
 
 class ProductTemplate(models.Model):
     _inherit = 'product.template'
@@ -48,12 +50,35 @@ class ProductTemplate(models.Model):
 
     def write(self, vals):
         result = super().write(vals)
+        if 'task_template_ids' in vals:
+            self.env.registry.clear_cache()
         if vals.get('service_tracking') == 'new_workflow':
             for template in self:
                 if not template.task_template_ids:
                     template._create_default_task_templates()
         return result
 
+    @tools.ormcache('product_tmpl_id')
+    def _get_template_tree(self, product_tmpl_id):
+        """
+        Compiled, immutable tree of the task templates of a product: tasks,
+        subtasks, checkpoint configurations and milestones, as namedtuples of
+        IDs and values. Cached per registry, template changes clear the cache.
+        Referenced records may have been deleted since, see
+        sale.order._get_existing_spec_ids().
+        Returns:
+            TemplateTree
+        """
+        product_tmpl = self.browse(product_tmpl_id).sudo()
+        return TemplateTree(
+            product_tmpl_id=product_tmpl_id,
+            tasks=tuple(template._compile() for template in product_tmpl.task_template_ids),
+        )
+
+    def _get_template_trees(self):
+        """Compiled template trees of the products, keyed by product template ID"""
+        return {product_tmpl.id: self._get_template_tree(product_tmpl.id) for product_tmpl in self}
+
     def _create_default_task_templates(self):
         if self.service_tracking != 'new_workflow':
             return
@@ -1,9 +1,42 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
+from markupsafe import Markup
+from collections import namedtuple
 import logging
 
+from .project import CHECKPOINT_STEP_VERBS
+
 _logger = logging.getLogger(__name__)
 
+# Compiled, immutable task template trees of a product, see product.template._get_template_tree()
+CheckpointSpec = namedtuple('CheckpointSpec', ['checkpoint_ids', 'stage_id', 'milestone_id', 'sequence'])
+SubtaskSpec = namedtuple('SubtaskSpec', ['id', 'name', 'description', 'user_ids', 'stage_id', 'planned_hours', 'priority'])
+TaskSpec = namedtuple('TaskSpec', [
+    'id', 'name', 'description', 'user_ids', 'stage_id', 'planned_hours', 'priority',
+    'milestone_id', 'checkpoints', 'subtasks',
+])
+TemplateTree = namedtuple('TemplateTree', ['product_tmpl_id', 'tasks'])
+
+# Workflow transitions of a task: stage -> (message label, upload validators, step -> (set vals, reset vals))
+TASK_CHECKPOINT_TRANSITIONS = {
+    'required_documents': ('Required documents', ('_validate_documents_uploaded', '_validate_x_documents_uploaded'), {
+        'complete': ({'is_complete_return_required': 'complete', 'required_document_complete': True},
+                     {'is_complete_return_required': 'not_started', 'required_document_complete': False}),
+        'confirm': ({'is_confirm_required': 'confirmed', 'required_document_confirm': True},
+                    {'is_confirm_required': 'not_started', 'required_document_confirm': False}),
+        'update': ({'is_update_required': 'updated', 'required_document_update': True},
+                   {'is_update_required': 'not_started', 'required_document_update': False}),
+    }),
+    'deliverable_documents': ('Deliverable documents', ('_validate_x_deliverable_documents_uploaded',), {
+        'complete': ({'is_complete_return_deliverable': 'complete', 'deliverable_document_complete': True},
+                     {'is_complete_return_deliverable': 'not_started', 'deliverable_document_complete': False}),
+        'confirm': ({'is_confirm_deliverable': 'confirmed', 'deliverable_document_confirm': True},
+                    {'is_confirm_deliverable': 'not_started', 'deliverable_document_confirm': False}),
+        'update': ({'is_update_deliverable': 'updated', 'deliverable_document_update': True},
+                   {'is_update_deliverable': 'not_started', 'deliverable_document_update': False}),
+    }),
+}
+
 
 class ProductTaskTemplate(models.Model):
     """
@@ -133,6 +166,57 @@ class ProductTaskTemplate(models.Model):
         """Compute the number of subtasks"""
         for template in self:
             template.subtask_count = len(template.subtask_ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return templates
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    def _compile(self):
+        """Immutable TaskSpec of the template, with its checkpoints and subtasks"""
+        self.ensure_one()
+        return TaskSpec(
+            id=self.id,
+            name=self.name,
+            description=self.description,
+            user_ids=tuple(self.user_ids.ids),
+            stage_id=self.stage_id.id,
+            planned_hours=self.planned_hours,
+            priority=self.priority,
+            milestone_id=self.milestone_id.id,
+            checkpoints=tuple(
+                CheckpointSpec(
+                    checkpoint_ids=tuple(config.checkpoint_ids.ids),
+                    stage_id=config.stage_id.id,
+                    milestone_id=config.milestone_id.id,
+                    sequence=config.sequence,
+                )
+                for config in self.checkpoint_ids
+            ),
+            subtasks=tuple(
+                SubtaskSpec(
+                    id=subtask.id,
+                    name=subtask.name,
+                    description=subtask.description,
+                    user_ids=tuple(subtask.user_ids.ids),
+                    stage_id=subtask.stage_id.id,
+                    planned_hours=subtask.planned_hours,
+                    priority=subtask.priority,
+                )
+                for subtask in self.subtask_ids
+            ),
+        )
     
     def action_view_subtasks(self):
         """Action to view subtasks of this template"""
@@ -286,8 +370,19 @@ class ProductSubtaskTemplate(models.Model):
         _logger.info(f"Creating subtask with vals: {vals}")
         result = super().create(vals)
         _logger.info(f"Created subtask: {result.name} (ID: {result.id})")
+        self.env.registry.clear_cache()
         return result
 
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
 class ProductTaskTemplateCheckpoint(models.Model):
     _name = 'product.task.template.checkpoint'
     _description = 'Product Task Template Checkpoint'
@@ -299,6 +394,22 @@ class ProductTaskTemplateCheckpoint(models.Model):
     milestone_id = fields.Many2one('project.milestone', string='Milestone')
     sequence = fields.Integer(string='Sequence', default=10)
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        configs = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return configs
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
 class TaskCheckpoint(models.Model):
     _name = 'task.checkpoint'
     _description = 'Task Checkpoint'
@@ -489,107 +600,88 @@ class ProjectTask(models.Model):
             )
 
     def _validate_x_documents_uploaded(self):
-        missing_docs = []
-        for line in self.x_required_document_ids:
-            if getattr(line, 'x_is_required', False):
-                has_attachment = False
-                if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                    has_attachment = True
-                if not has_attachment:
-                    attachments = self.env['ir.attachment'].search([
-                        ('res_model', '=', self._name),
-                        ('res_id', '=', self.id),
-                        ('name', '=', line.name)
-                    ], limit=1)
-                    if attachments:
-                        has_attachment = True
-                if not has_attachment:
-                    missing_docs.append(line.name or 'Unknown Document')
-        if missing_docs:
-            raise ValidationError(
-                "You must upload the following x_ required documents before completing this action:\n- " + "\n- ".join(missing_docs)
-            )
+        self.env['document.upload.validator'].validate(
+            self, 'x_required_document_ids', 'x_ required documents', owner='record')
 
     def _validate_x_deliverable_documents_uploaded(self):
-        missing_docs = []
-        for line in self.x_deliverable_document_ids:
-            if getattr(line, 'x_is_required', False):
-                has_attachment = False
-                if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                    has_attachment = True
-                if not has_attachment:
-                    attachments = self.env['ir.attachment'].search([
-                        ('res_model', '=', self._name),
-                        ('res_id', '=', self.id),
-                        ('name', '=', line.name)
-                    ], limit=1)
-                    if attachments:
-                        has_attachment = True
-                if not has_attachment:
-                    missing_docs.append(line.name or 'Unknown Document')
-        if missing_docs:
-            raise ValidationError(
-                "You must upload the following x_ deliverable documents before completing this action:\n- " + "\n- ".join(missing_docs)
-            )
+        self.env['document.upload.validator'].validate(
+            self, 'x_deliverable_document_ids', 'x_ deliverable documents', owner='record')
 
     # In workflow actions, call both (for now):
     def action_complete_required_documents(self):
-        self._validate_documents_uploaded()
-        self._validate_x_documents_uploaded()
-        self.is_complete_return_required = 'complete'
-        self.required_document_complete = True
+        return self.action_checkpoint_transition('required_documents', 'complete')
 
     def action_confirm_required_documents(self):
-        self._validate_documents_uploaded()
-        self._validate_x_documents_uploaded()
-        self.is_confirm_required = 'confirmed'
-        self.required_document_confirm = True
+        return self.action_checkpoint_transition('required_documents', 'confirm')
 
     def action_update_required_documents(self):
-        self._validate_documents_uploaded()
-        self._validate_x_documents_uploaded()
-        self.is_update_required = 'updated'
-        self.required_document_update = True
+        return self.action_checkpoint_transition('required_documents', 'update')
 
     def action_reset_required_document_complete(self):
-        self.required_document_complete = False
-        self.is_complete_return_required = 'not_started'
+        return self.action_checkpoint_reset('required_documents', 'complete')
 
     def action_reset_required_document_confirm(self):
-        self.required_document_confirm = False
-        self.is_confirm_required = 'not_started'
+        return self.action_checkpoint_reset('required_documents', 'confirm')
 
     def action_reset_required_document_update(self):
-        self.required_document_update = False
-        self.is_update_required = 'not_started'
+        return self.action_checkpoint_reset('required_documents', 'update')
 
     # --- Button Actions for Deliverable Documents ---
     def action_complete_deliverable_documents(self):
-        self._validate_x_deliverable_documents_uploaded()
-        self.is_complete_return_deliverable = 'complete'
-        self.deliverable_document_complete = True
+        return self.action_checkpoint_transition('deliverable_documents', 'complete')
 
     def action_confirm_deliverable_documents(self):
-        self._validate_x_deliverable_documents_uploaded()
-        self.is_confirm_deliverable = 'confirmed'
-        self.deliverable_document_confirm = True
+        return self.action_checkpoint_transition('deliverable_documents', 'confirm')
 
     def action_update_deliverable_documents(self):
-        self._validate_x_deliverable_documents_uploaded()
-        self.is_update_deliverable = 'updated'
-        self.deliverable_document_update = True
+        return self.action_checkpoint_transition('deliverable_documents', 'update')
 
     def action_reset_deliverable_document_complete(self):
-        self.deliverable_document_complete = False
-        self.is_complete_return_deliverable = 'not_started'
+        return self.action_checkpoint_reset('deliverable_documents', 'complete')
 
     def action_reset_deliverable_document_confirm(self):
-        self.deliverable_document_confirm = False
-        self.is_confirm_deliverable = 'not_started'
+        return self.action_checkpoint_reset('deliverable_documents', 'confirm')
 
     def action_reset_deliverable_document_update(self):
-        self.deliverable_document_update = False
-        self.is_update_deliverable = 'not_started' 
+        return self.action_checkpoint_reset('deliverable_documents', 'update')
+
+    # --- Bulk Checkpoint Transitions ---
+    def action_checkpoint_transition(self, stage, step):
+        """
+        Run a checkpoint workflow transition on a batch of tasks
+        Uploads are validated for the whole batch, the workflow fields are
+        written in one statement and each project gets one summary message
+        listing its tasks.
+        Args:
+            stage: key of TASK_CHECKPOINT_TRANSITIONS
+            step: 'complete', 'confirm' or 'update'
+        """
+        label, validators, steps = TASK_CHECKPOINT_TRANSITIONS[stage]
+        set_vals, _reset_vals = steps[step]
+        for validator in validators:
+            getattr(self, validator)()
+        self.write(set_vals)
+
+        bodies = {}
+        for project, tasks in self.grouped('project_id').items():
+            header = _("✅ %(stage)s %(step)s on %(count)s task(s):",
+                       stage=label, step=CHECKPOINT_STEP_VERBS[step], count=len(tasks))
+            body = Markup('<p>%s</p><ul>%s</ul>') % (header, Markup('').join(
+                Markup('<li>%s</li>') % task.name for task in tasks
+            ))
+            if project:
+                bodies[project.id] = body
+            else:
+                tasks._message_log_batch(bodies=dict.fromkeys(tasks.ids, body))
+        if bodies:
+            self.project_id._message_log_batch(bodies=bodies)
+        return True
+
+    def action_checkpoint_reset(self, stage, step):
+        """Reset a checkpoint workflow step on a batch of tasks"""
+        _label, _validators, steps = TASK_CHECKPOINT_TRANSITIONS[stage]
+        self.write(steps[step][1])
+        return True
 
     def action_trigger_milestone_notification(self, milestone):
         """Trigger milestone notification for this task"""
@@ -1,12 +1,84 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from odoo import api, fields, models, _
+from odoo import api, fields, models, Command, _
 from odoo.exceptions import ValidationError
 from collections import defaultdict
+from markupsafe import Markup
+from odoo.tools import SQL
+from odoo.tools.sql import create_unique_index, index_exists
+
+from ..instrumentation import debug, instrumented
 
 _logger = logging.getLogger(__name__)
 
+# Required checkpoint groups of a project: a group is reached by the first of
+# its steps whose legacy or x_ workflow flag is set
+CHECKPOINT_GROUPS = [
+    ('Required Documents', [
+        (('required_document_complete', 'x_required_document_complete'), 'Complete'),
+        (('required_document_confirm', 'x_required_document_confirm'), 'Confirmed'),
+        (('required_document_update', 'x_required_document_update'), 'Updated'),
+    ]),
+    ('Deliverable Documents', [
+        (('deliverable_document_complete', 'x_deliverable_document_complete'), 'Complete'),
+        (('deliverable_document_confirm', 'x_deliverable_document_confirm'), 'Confirmed'),
+        (('deliverable_document_update', 'x_deliverable_document_update'), 'Updated'),
+    ]),
+    ('Compliance', [
+        (('is_complete_return_compliance',), 'Complete'),
+        (('is_confirm_compliance',), 'Confirmed'),
+        (('is_update_compliance',), 'Updated'),
+    ]),
+    ('Partner Fields', [
+        (('is_complete_partner_fields',), 'Complete'),
+        (('is_confirm_partner_fields',), 'Confirmed'),
+        (('is_update_partner_fields',), 'Updated'),
+    ]),
+]
+CHECKPOINT_FLAG_FIELDS = [fname for _label, steps in CHECKPOINT_GROUPS for fnames, _state in steps for fname in fnames]
+
+# Reached checkpoints a project needs for completion, bit i of the completion mask is COMPLETION_CHECKPOINTS[i]
+COMPLETION_CHECKPOINTS = tuple(f'{label} Complete' for label, _steps in CHECKPOINT_GROUPS)
+
+# Workflow stages of a project: stage -> (message label, upload validator)
+PROJECT_CHECKPOINT_STAGES = {
+    'required_documents': ('x_Required Documents', '_validate_x_required_documents_uploaded'),
+    'deliverable_documents': ('x_Deliverable Documents', '_validate_x_deliverable_documents_uploaded'),
+    'compliance': ('Compliance', None),
+    'partner_fields': ('Partner Fields', None),
+}
+
+# Workflow transitions of a project: stage -> step -> (flags set, flags reset, reached checkpoint)
+PROJECT_CHECKPOINT_TRANSITIONS = {
+    'required_documents': {
+        'complete': (('x_required_document_complete',), ('required_document_complete', 'x_required_document_complete'), 'Required Documents Complete'),
+        'confirm': (('x_required_document_confirm',), ('required_document_confirm', 'x_required_document_confirm'), 'Required Documents Confirmed'),
+        'update': (('x_required_document_update',), ('required_document_update', 'x_required_document_update'), 'Required Documents Updated'),
+    },
+    'deliverable_documents': {
+        'complete': (('x_deliverable_document_complete',), ('deliverable_document_complete', 'x_deliverable_document_complete'), 'Deliverable Documents Complete'),
+        'confirm': (('x_deliverable_document_confirm',), ('deliverable_document_confirm', 'x_deliverable_document_confirm'), 'Deliverable Documents Confirmed'),
+        'update': (('x_deliverable_document_update',), ('deliverable_document_update', 'x_deliverable_document_update'), 'Deliverable Documents Updated'),
+    },
+    'compliance': {
+        'complete': (('is_complete_return_compliance',), ('is_complete_return_compliance',), 'Compliance Complete'),
+        'confirm': (('is_confirm_compliance',), ('is_confirm_compliance',), 'Compliance Confirmed'),
+        'update': (('is_update_compliance',), ('is_update_compliance',), 'Compliance Updated'),
+    },
+    'partner_fields': {
+        'complete': (('is_complete_partner_fields',), ('is_complete_partner_fields',), 'Partner Fields Complete'),
+        'confirm': (('is_confirm_partner_fields',), ('is_confirm_partner_fields',), 'Partner Fields Confirmed'),
+        'update': (('is_update_partner_fields',), ('is_update_partner_fields',), 'Partner Fields Updated'),
+    },
+}
+
+CHECKPOINT_STEP_VERBS = {
+    'complete': 'completed',
+    'confirm': 'confirmed',
+    'update': 'updated',
+}
+
 
 # OLD FUNCTION - REPLACED BY DOCUMENT SERVICE
 # def copy_documents_from_product_to_project(env, project, product_templates):
@@ -14,36 +86,62 @@ _logger = logging.getLogger(__name__)
 #     pass
 
 
-def copy_documents_from_project_to_task(env, task, project):
-    """Copy document types from project to task"""
-    # Copy required documents if they exist
-    if hasattr(project, 'document_required_type_ids') and project.document_required_type_ids:
-        for req_doc in project.document_required_type_ids:
-            env['project.document.required.line'].create({
-                'task_id': task.id,
-                'document_type_id': req_doc.document_type_id.id,
-                'is_required': req_doc.is_required,
-            })
-    # Copy deliverable documents if they exist
-    if hasattr(project, 'document_type_ids') and project.document_type_ids:
-        for del_doc in project.document_type_ids:
-            env['project.document.type.line'].create({
-                'task_id': task.id,
-                'document_type_id': del_doc.document_type_id.id,
-                'is_required': del_doc.is_required,
-            })
+def prepare_document_vals_from_project(task, project):
+    """
+    Build the document line values copying the document types of a project to
+    one of its tasks
+    Returns:
+        dict document line model name -> list of values
+    """
+    vals_by_model = {}
+    # Projects only carry document types when another module adds them
+    if 'document_required_type_ids' in project._fields:
+        vals_by_model['project.document.required.line'] = [{
+            'task_id': task.id,
+            'document_type_id': req_doc.document_type_id.id,
+            'is_required': req_doc.is_required,
+        } for req_doc in project.document_required_type_ids]
+    if 'document_type_ids' in project._fields:
+        vals_by_model['project.document.type.line'] = [{
+            'task_id': task.id,
+            'document_type_id': del_doc.document_type_id.id,
+            'is_required': del_doc.is_required,
+        } for del_doc in project.document_type_ids]
+    return vals_by_model
+
+def prepare_checkpoint_vals_from_template(task, template):
+    """Build task.checkpoint values for a task from its product task template"""
+    if not hasattr(template, 'checkpoint_ids'):
+        return []
+    return [{
+        'task_id': task.id,
+        'checkpoint_ids': [(6, 0, checkpoint_config.checkpoint_ids.ids)],
+        'stage_id': checkpoint_config.stage_id.id if checkpoint_config.stage_id else False,
+        'milestone_id': checkpoint_config.milestone_id.id if checkpoint_config.milestone_id else False,
+        'sequence': checkpoint_config.sequence,
+    } for checkpoint_config in template.checkpoint_ids]
+
+
+def prepare_checkpoint_vals_from_spec(task, spec, existing_ids):
+    """
+    Build task.checkpoint values for a task from a compiled TaskSpec
+    existing_ids is the result of sale.order._get_existing_spec_ids(), records
+    deleted since the spec was compiled are dropped
+    """
+    return [{
+        'task_id': task.id,
+        'checkpoint_ids': [(6, 0, [cid for cid in checkpoint.checkpoint_ids if cid in existing_ids['reached.checkpoint']])],
+        'stage_id': checkpoint.stage_id if checkpoint.stage_id in existing_ids['project.task.type'] else False,
+        'milestone_id': checkpoint.milestone_id if checkpoint.milestone_id in existing_ids['project.milestone'] else False,
+        'sequence': checkpoint.sequence,
+    } for checkpoint in spec.checkpoints]
+
 
 def copy_checkpoints_from_template_to_task(env, task, template):
     """Copy checkpoint configurations from product task template to task"""
-    if hasattr(template, 'checkpoint_ids') and template.checkpoint_ids:
-        for checkpoint_config in template.checkpoint_ids:
-            env['task.checkpoint'].create({
-                'task_id': task.id,
-                'checkpoint_ids': [(6, 0, checkpoint_config.checkpoint_ids.ids)],
-                'stage_id': checkpoint_config.stage_id.id if checkpoint_config.stage_id else False,
-                'milestone_id': checkpoint_config.milestone_id.id if checkpoint_config.milestone_id else False,
-                'sequence': checkpoint_config.sequence,
-            })
+    vals_list = prepare_checkpoint_vals_from_template(task, template)
+    if vals_list:
+        env['task.checkpoint'].create(vals_list)
 
 
 class ProjectDocumentCategory(models.Model):
@@ -72,7 +170,7 @@ class ProjectDocumentType(models.Model):
 class ProjectDocumentTypeLine(models.Model):
     _name = 'project.document.type.line'
     _description = 'Project Deliverable Document Type Line'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'project.document.duplicate.mixin']
 
     project_id = fields.Many2one('project.project', string='Project', ondelete='cascade')
     task_id = fields.Many2one('project.task', string='Task', ondelete='cascade')
@@ -82,7 +180,8 @@ class ProjectDocumentTypeLine(models.Model):
     is_required = fields.Boolean(string='Required', default=False)
     expiry_date = fields.Date('Expiry Date')
     reminder_days = fields.Integer('Reminder Days', default=30)
-    is_expired = fields.Boolean('Is Expired', default=False)
+    is_expired = fields.Boolean('Is Expired', compute='_compute_expired', store=True, index=True,
+                                help="Flipped by the nightly expiry job once the expiry date has passed")
     is_verify = fields.Boolean('Is Verified', default=False)
     number = fields.Char(
         string="Number",
@@ -107,29 +206,10 @@ class ProjectDocumentTypeLine(models.Model):
 
     @api.depends('expiry_date')
     def _compute_expired(self):
-        """Compute document expiry status with smooth error handling"""
-        try:
-            today = fields.Date.today()
-            _logger.info(f"Computing expiry status for {len(self)} documents")
-            for record in self:
-                try:
-                    if record.expiry_date:
-                        is_expired = record.expiry_date < today
-                        record.is_expired = is_expired
-                        if is_expired:
-                            _logger.warning(f"Document {record.id} ({getattr(record, 'document_type_id', False) and record.document_type_id.name or 'Unknown'}) is EXPIRED (expiry: {record.expiry_date})")
-                        else:
-                            _logger.info(f"Document {record.id} ({getattr(record, 'document_type_id', False) and record.document_type_id.name or 'Unknown'}) is VALID (expiry: {record.expiry_date})")
-                    else:
-                        record.is_expired = False
-                        _logger.debug(f"Document {record.id} has no expiry date set")
-                except Exception as e:
-                    _logger.error(f"Error computing expiry for document {record.id}: {str(e)}")
-                    record.is_expired = False
-        except Exception as e:
-            _logger.error(f"Error in document expiry computation: {str(e)}")
-            for record in self:
-                record.is_expired = False
+        """Expiry status on change of the expiry date, the nightly job flips the rest"""
+        today = fields.Date.today()
+        for record in self:
+            record.is_expired = bool(record.expiry_date and record.expiry_date < today)
 
     def action_numbers(self):
         docs = self.env['project.document.type.line'].sudo().search([])
@@ -143,116 +223,45 @@ class ProjectDocumentTypeLine(models.Model):
                 vals['number'] = self.env['ir.sequence'].next_by_code('project.document.type.line') or _("New")
         records = super(ProjectDocumentTypeLine, self).create(vals_list)
         
-        # Check for duplicates after creation
-        for record in records:
-            record._check_duplicate_after_create()
+        # Check for duplicates after creation, once for the whole batch
+        records._check_duplicate_after_create()
         
         return records
 
     def _check_duplicate_after_create(self):
-        """Check for duplicates after document creation"""
-        _logger.info(f"Checking for duplicates after create for required document {self.id}")
-        
-        try:
-            # Build domain to find potential duplicates
-            domain = [
-                ('document_type_id', '=', self.document_type_id.id),
-                ('id', '!=', self.id)
-            ]
-            
-            # Add context-specific conditions
-            if self.project_id:
-                domain.append(('project_id', '=', self.project_id.id))
-                context_info = f" in project {self.project_id.name}"
-            elif self.task_id:
-                domain.append(('task_id', '=', self.task_id.id))
-                context_info = f" in task {self.task_id.name}"
-            elif self.product_tmpl_id:
-                domain.append(('product_tmpl_id', '=', self.product_tmpl_id.id))
-                context_info = f" in product {self.product_tmpl_id.name}"
+        """Check the created batch for duplicates with a single grouped query"""
+        duplicates_by_line = self._find_batch_duplicates()
+        for record in self:
+            if record.id not in duplicates_by_line:
+                continue
+            _duplicates, same_attachments, missing_attachments = duplicates_by_line[record.id]
+            if same_attachments:
+                message = _("⚠️ Duplicate required document detected: %s with same attachments as existing document%s")
+            elif missing_attachments:
+                # If no attachments, check for same document type in same context
+                message = _("⚠️ Duplicate required document detected: %s (same document type)%s")
             else:
-                context_info = ""
-            
-            duplicate_documents = self.search(domain)
-            _logger.info(f"Found {len(duplicate_documents)} potential duplicates for required document {self.id}")
-            
-            if duplicate_documents:
-                _logger.info(f"Duplicate required documents found: {duplicate_documents.ids}")
-                
-                for duplicate in duplicate_documents:
-                    # Check if attachments are the same
-                    if self.attachment_ids and duplicate.attachment_ids:
-                        self_attachment_ids = set(self.attachment_ids.mapped('id'))
-                        dup_attachment_ids = set(duplicate.attachment_ids.mapped('id'))
-                        
-                        if self_attachment_ids == dup_attachment_ids and self_attachment_ids:
-                            _logger.info(f"Duplicate required document detected with same attachments: {self.id} vs {duplicate.id}")
-                            
-                            # Post warning to project chatter
-                            if self.project_id:
-                                self.project_id.message_post(
-                                    body=_("⚠️ Duplicate required document detected: %s with same attachments as existing document%s") % (
-                                        self.document_type_id.name, context_info
-                                    )
-                                )
-                            
-                            # Prevent saving by raising ValidationError
-                            raise ValidationError(_("⚠️ Duplicate required document detected: %s with same attachments as existing document%s") % (
-                                self.document_type_id.name, context_info
-                            ))
-                    else:
-                        # If no attachments, check for same document type in same context
-                        _logger.info(f"Duplicate required document detected (same document type): {self.id} vs {duplicate.id}")
-                        
-                        # Post warning to project chatter
-                        if self.project_id:
-                            self.project_id.message_post(
-                                body=_("⚠️ Duplicate required document detected: %s (same document type)%s") % (
-                                    self.document_type_id.name, context_info
-                                )
-                            )
-                        
-                        # Prevent saving by raising ValidationError
-                        raise ValidationError(_("⚠️ Duplicate required document detected: %s (same document type)%s") % (
-                            self.document_type_id.name, context_info
-                        ))
-                        
-        except ValidationError:
-            # Re-raise ValidationError to prevent saving
-            raise
-        except Exception as e:
-            _logger.error(f"Error checking duplicate after create for required document {self.id}: {str(e)}")
-            import traceback
-            _logger.error(f"Full traceback: {traceback.format_exc()}")
+                continue
+            message = message % (record.document_type_id.name, record._get_duplicate_context_info())
+            _logger.info("Duplicate document line detected: %s", record.id)
+
+            # Post warning to project chatter
+            if record.project_id:
+                record.project_id.message_post(body=message)
+
+            # Prevent saving by raising ValidationError
+            raise ValidationError(message)
 
     @api.constrains('project_id', 'task_id', 'product_tmpl_id', 'document_type_id')
     def check_duplicate_document(self):
         """Enhanced duplicate detection with multi-product support"""
+        duplicates_by_line = self._find_batch_duplicates()
         for record in self:
-            if not record.document_type_id:
-                continue
-                
-            # Build enhanced domain based on context
-            domain = [
-                ('document_type_id', '=', record.document_type_id.id),
-                ('id', '!=', record.id)
-            ]
-            
-            # Enhanced context-specific filtering
-            if record.product_tmpl_id:
-                domain.append(('product_tmpl_id', '=', record.product_tmpl_id.id))
-                context_name = f"{record.product_tmpl_id.name} - {record.document_type_id.name}"
-            elif record.project_id:
-                domain.append(('project_id', '=', record.project_id.id))
-                context_name = f"{record.project_id.name} - {record.document_type_id.name}"
-            elif record.task_id:
-                domain.append(('task_id', '=', record.task_id.id))
-                context_name = f"{record.task_id.name} - {record.document_type_id.name}"
-            else:
+            fname, context = record._get_duplicate_context()
+            if not fname or record.id not in duplicates_by_line:
                 continue  # Skip if no context
-            
-            # Enhanced duplicate detection with scoring
-            duplicates = self.search(domain)
+            duplicates = duplicates_by_line[record.id][0]
+            context_name = f"{context.name} - {record.document_type_id.name}"
             if duplicates:
                 # Enhanced error message with more details
                 duplicate_info = []
@@ -273,62 +282,26 @@ class ProjectDocumentTypeLine(models.Model):
                 ) % (record.document_type_id.name, '\n'.join(duplicate_info), context_name))
 
     def write(self, vals):
-        _logger.info(f"📝 Write called for ProjectDocumentTypeLine with vals: {vals}")
+        debug(_logger, "Write on %s %s with %s", self._name, self.ids, vals)
         res = super(ProjectDocumentTypeLine, self).write(vals)
         if vals.get('expiry_date'):
             self.write({'expiration_reminder_sent': False})
         if vals.get('attachment_ids'):
-            _logger.info(f"📎 Attachment_ids detected: {vals.get('attachment_ids')}")
             self.write({'document_create_date': fields.Datetime.today()})
             # Convert new attachments to documents
             self._convert_attachments_to_documents()
         return res
     
+    def _get_conversion_project(self):
+        """Project whose documents folder receives the converted attachments"""
+        self.ensure_one()
+        return self.project_id
+
     def _convert_attachments_to_documents(self):
         """Convert attachments to documents and place them in project folder"""
-        for record in self:
-            if not record.project_id:
-                continue
-                
-            _logger.info(f"🔄 Converting attachments to documents for {record.document_type_id.name}")
-            
-            # Ensure project has a folder
-            record.project_id._ensure_project_folder()
-            
-            for attachment in record.attachment_ids:
-                # Check if this attachment is already converted to a document
-                existing_doc = self.env['documents.document'].search([
-                    ('attachment_id', '=', attachment.id)
-                ], limit=1)
-                
-                if existing_doc:
-                    _logger.info(f"📄 Attachment {attachment.name} already converted to document {existing_doc.id}")
-                    continue
-                
-                try:
-                    # Create document from attachment
-                    document_vals = {
-                        'name': attachment.name,
-                        'attachment_id': attachment.id,
-                        'res_model': 'project.project',
-                        'res_id': record.project_id.id,
-                        'type': 'file',
-                    }
-                    
-                    # Add folder if project has one
-                    if record.project_id.documents_folder_id:
-                        document_vals['folder_id'] = record.project_id.documents_folder_id.id
-                    
-                    document = self.env['documents.document'].create(document_vals)
-                    _logger.info(f"✅ Converted attachment '{attachment.name}' to document {document.id}")
-                    
-                    # Update the document line with the created document
-                    if not record.document_id:
-                        record.document_id = document.id
-                        _logger.info(f"🔗 Linked document {document.id} to document line {record.id}")
-                    
-                except Exception as e:
-                    _logger.error(f"❌ Failed to convert attachment '{attachment.name}' to document: {e}")
+        return self.env['attachment.conversion.service'].convert_lines(
+            self, 'attachment_ids', document_field='document_id'
+        )
 
     def action_upload_document(self):
         """Action to upload document for this line"""
@@ -427,7 +400,7 @@ class ProjectDocumentTypeLine(models.Model):
 class ProjectDocumentRequiredLine(models.Model):
     _name = 'project.document.required.line'
     _description = 'Project Required Document Type Line'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'project.document.duplicate.mixin']
 
     project_id = fields.Many2one('project.project', string='Project', ondelete='cascade')
     task_id = fields.Many2one('project.task', string='Task', ondelete='cascade')
@@ -437,7 +410,8 @@ class ProjectDocumentRequiredLine(models.Model):
     is_required = fields.Boolean(string='Required', default=False)
     expiry_date = fields.Date('Expiry Date')
     reminder_days = fields.Integer('Reminder Days', default=30)
-    is_expired = fields.Boolean('Is Expired', default=False)
+    is_expired = fields.Boolean('Is Expired', compute='_compute_expired', store=True, index=True,
+                                help="Flipped by the nightly expiry job once the expiry date has passed")
     is_verify = fields.Boolean('Is Verified', default=False)
     number = fields.Char(
         string="Number",
@@ -462,29 +436,10 @@ class ProjectDocumentRequiredLine(models.Model):
 
     @api.depends('expiry_date')
     def _compute_expired(self):
-        """Compute document expiry status with smooth error handling"""
-        try:
-            today = fields.Date.today()
-            _logger.info(f"Computing expiry status for {len(self)} required documents")
-            for record in self:
-                try:
-                    if record.expiry_date:
-                        is_expired = record.expiry_date < today
-                        record.is_expired = is_expired
-                        if is_expired:
-                            _logger.warning(f"Required Document {record.id} ({getattr(record, 'document_type_id', False) and record.document_type_id.name or 'Unknown'}) is EXPIRED (expiry: {record.expiry_date})")
-                        else:
-                            _logger.info(f"Required Document {record.id} ({getattr(record, 'document_type_id', False) and record.document_type_id.name or 'Unknown'}) is VALID (expiry: {record.expiry_date})")
-                    else:
-                        record.is_expired = False
-                        _logger.debug(f"Required Document {record.id} has no expiry date set")
-                except Exception as e:
-                    _logger.error(f"Error computing expiry for required document {record.id}: {str(e)}")
-                    record.is_expired = False
-        except Exception as e:
-            _logger.error(f"Error in required document expiry computation: {str(e)}")
-            for record in self:
-                record.is_expired = False
+        """Expiry status on change of the expiry date, the nightly job flips the rest"""
+        today = fields.Date.today()
+        for record in self:
+            record.is_expired = bool(record.expiry_date and record.expiry_date < today)
 
     def action_numbers(self):
         docs = self.env['project.document.required.line'].sudo().search([])
@@ -498,131 +453,44 @@ class ProjectDocumentRequiredLine(models.Model):
                 vals['number'] = self.env['ir.sequence'].next_by_code('project.document.required.line') or _("New")
         records = super(ProjectDocumentRequiredLine, self).create(vals_list)
         
-        # Check for duplicates after creation
-        for record in records:
-            record._check_duplicate_after_create()
+        # Check for duplicates after creation, once for the whole batch
+        records._check_duplicate_after_create()
         
         return records
 
     def _check_duplicate_after_create(self):
-        """Check for duplicates after document creation"""
-        _logger.info(f"🔍 DEBUG: _check_duplicate_after_create called for required document {self.id}")
-        _logger.info(f"🔍 DEBUG: Document type: {self.document_type_id.name if self.document_type_id else 'None'}")
-        _logger.info(f"🔍 DEBUG: Product template: {self.product_tmpl_id.name if self.product_tmpl_id else 'None'}")
-        _logger.info(f"🔍 DEBUG: Project: {self.project_id.name if self.project_id else 'None'}")
-        _logger.info(f"🔍 DEBUG: Attachments: {len(self.attachment_ids)}")
-        
-        try:
-            # Build domain for duplicate check - check multiple criteria
-            domain = [
-                ('document_type_id', '=', self.document_type_id.id),
-                ('id', '!=', self.id),
-            ]
-            
-            # Add project/task/product filters
-            if self.project_id:
-                domain.append(('project_id', '=', self.project_id.id))
-            if self.task_id:
-                domain.append(('task_id', '=', self.task_id.id))
-            if self.product_tmpl_id:
-                domain.append(('product_tmpl_id', '=', self.product_tmpl_id.id))
-            
-            _logger.info(f"🔍 DEBUG: Search domain: {domain}")
-            
-            # Search for duplicates with same document type and project/task/product
-            duplicate_documents = self.search(domain)
-            _logger.info(f"🔍 DEBUG: Found {len(duplicate_documents)} potential duplicates")
-            
-            if duplicate_documents:
-                _logger.info(f"🔍 DEBUG: Checking {len(duplicate_documents)} duplicates for attachments")
-                # Check if any duplicates have the same attachments
-                for duplicate in duplicate_documents:
-                    _logger.info(f"🔍 DEBUG: Checking duplicate {duplicate.id} with {len(duplicate.attachment_ids)} attachments")
-                    if self.attachment_ids and duplicate.attachment_ids:
-                        # Check if attachments are the same
-                        self_attachment_ids = set(self.attachment_ids.ids)
-                        dup_attachment_ids = set(duplicate.attachment_ids.ids)
-                        
-                        _logger.info(f"🔍 DEBUG: Self attachments: {self_attachment_ids}")
-                        _logger.info(f"🔍 DEBUG: Duplicate attachments: {dup_attachment_ids}")
-                        
-                        if self_attachment_ids == dup_attachment_ids and self_attachment_ids:
-                            context_info = ""
-                            if self.product_tmpl_id:
-                                context_info = f" in product {self.product_tmpl_id.name}"
-                            elif self.project_id:
-                                context_info = f" in project {self.project_id.name}"
-                            
-                            _logger.warning(f"Duplicate required document detected for {self.document_type_id.name} with same attachments{context_info}")
-                            # Post warning message to project chatter
-                            if self.project_id:
-                                self.project_id.message_post(
-                                    body=_("🚨 POPUP_WARNING: Duplicate required document detected: %s with same attachments as existing document%s") % (
-                                        self.document_type_id.name, context_info
-                                    )
-                                )
-                            # Trigger popup notification
-                            self._trigger_duplicate_popup(_('🚨 POPUP_WARNING: Duplicate required document detected: %s with same attachments as existing document%s') % (
-                                self.document_type_id.name, context_info
-                            ))
-                            break
-                    else:
-                        # If no attachments, check for same document type in same context
-                        context_info = ""
-                        if self.product_tmpl_id:
-                            context_info = f" in product {self.product_tmpl_id.name}"
-                        elif self.project_id:
-                            context_info = f" in project {self.project_id.name}"
-                        
-                        _logger.warning(f"Duplicate required document detected for {self.document_type_id.name} (same type){context_info}")
-                        # Post warning message to project chatter
-                        if self.project_id:
-                            self.project_id.message_post(
-                                body=_("🚨 POPUP_WARNING: Duplicate required document detected: %s (same document type)%s") % (
-                                    self.document_type_id.name, context_info
-                                )
-                            )
-                        # Trigger popup notification
-                        self._trigger_duplicate_popup(_('🚨 POPUP_WARNING: Duplicate required document detected: %s (same document type)%s') % (
-                            self.document_type_id.name, context_info
-                        ))
-                        break
+        """Warn about duplicates in the created batch with a single grouped query"""
+        duplicates_by_line = self._find_batch_duplicates()
+        for record in self:
+            if record.id not in duplicates_by_line:
+                continue
+            _duplicates, same_attachments, missing_attachments = duplicates_by_line[record.id]
+            if same_attachments:
+                message = _("🚨 POPUP_WARNING: Duplicate required document detected: %s with same attachments as existing document%s")
+            elif missing_attachments:
+                # If no attachments, check for same document type in same context
+                message = _("🚨 POPUP_WARNING: Duplicate required document detected: %s (same document type)%s")
             else:
-                _logger.info(f"🔍 DEBUG: No duplicates found")
-                    
-        except Exception as e:
-            _logger.error(f"Error checking duplicate after create for required document {self.id}: {str(e)}")
-            import traceback
-            _logger.error(f"Full traceback: {traceback.format_exc()}")
+                continue
+            message = message % (record.document_type_id.name, record._get_duplicate_context_info())
+            _logger.warning("Duplicate required document line detected: %s", record.id)
+
+            # Post warning message to project chatter
+            if record.project_id:
+                record.project_id.message_post(body=message)
+            # Trigger popup notification
+            record._trigger_duplicate_popup(message)
 
     @api.constrains('project_id', 'task_id', 'product_tmpl_id', 'document_type_id')
     def check_duplicate_document(self):
         """Enhanced duplicate detection for required documents with multi-product support"""
+        duplicates_by_line = self._find_batch_duplicates()
         for record in self:
-            if not record.document_type_id:
-                continue
-                
-            # Build enhanced domain based on context
-            domain = [
-                ('document_type_id', '=', record.document_type_id.id),
-                ('id', '!=', record.id)
-            ]
-            
-            # Enhanced context-specific filtering
-            if record.product_tmpl_id:
-                domain.append(('product_tmpl_id', '=', record.product_tmpl_id.id))
-                context_name = f"{record.product_tmpl_id.name} - {record.document_type_id.name}"
-            elif record.project_id:
-                domain.append(('project_id', '=', record.project_id.id))
-                context_name = f"{record.project_id.name} - {record.document_type_id.name}"
-            elif record.task_id:
-                domain.append(('task_id', '=', record.task_id.id))
-                context_name = f"{record.task_id.name} - {record.document_type_id.name}"
-            else:
+            fname, context = record._get_duplicate_context()
+            if not fname or record.id not in duplicates_by_line:
                 continue  # Skip if no context
-            
-            # Enhanced duplicate detection with scoring
-            duplicates = self.search(domain)
+            duplicates = duplicates_by_line[record.id][0]
+            context_name = f"{context.name} - {record.document_type_id.name}"
             if duplicates:
                 # Enhanced error message with more details
                 duplicate_info = []
@@ -643,62 +511,26 @@ class ProjectDocumentRequiredLine(models.Model):
                 ) % (record.document_type_id.name, '\n'.join(duplicate_info), context_name))
 
     def write(self, vals):
-        _logger.info(f"📝 Write called for ProjectDocumentRequiredLine with vals: {vals}")
+        debug(_logger, "Write on %s %s with %s", self._name, self.ids, vals)
         res = super(ProjectDocumentRequiredLine, self).write(vals)
         if vals.get('expiry_date'):
             self.write({'expiration_reminder_sent': False})
         if vals.get('attachment_ids'):
-            _logger.info(f"📎 Attachment_ids detected: {vals.get('attachment_ids')}")
             self.write({'document_create_date': fields.Datetime.today()})
             # Convert new attachments to documents
             self._convert_attachments_to_documents()
         return res
     
+    def _get_conversion_project(self):
+        """Project whose documents folder receives the converted attachments"""
+        self.ensure_one()
+        return self.project_id
+
     def _convert_attachments_to_documents(self):
         """Convert attachments to documents and place them in project folder"""
-        for record in self:
-            if not record.project_id:
-                continue
-                
-            _logger.info(f"🔄 Converting attachments to documents for {record.document_type_id.name}")
-            
-            # Ensure project has a folder
-            record.project_id._ensure_project_folder()
-            
-            for attachment in record.attachment_ids:
-                # Check if this attachment is already converted to a document
-                existing_doc = self.env['documents.document'].search([
-                    ('attachment_id', '=', attachment.id)
-                ], limit=1)
-                
-                if existing_doc:
-                    _logger.info(f"📄 Attachment {attachment.name} already converted to document {existing_doc.id}")
-                    continue
-                
-                try:
-                    # Create document from attachment
-                    document_vals = {
-                        'name': attachment.name,
-                        'attachment_id': attachment.id,
-                        'res_model': 'project.project',
-                        'res_id': record.project_id.id,
-                        'type': 'file',
-                    }
-                    
-                    # Add folder if project has one
-                    if record.project_id.documents_folder_id:
-                        document_vals['folder_id'] = record.project_id.documents_folder_id.id
-                    
-                    document = self.env['documents.document'].create(document_vals)
-                    _logger.info(f"✅ Converted attachment '{attachment.name}' to document {document.id}")
-                    
-                    # Update the document line with the created document
-                    if not record.document_id:
-                        record.document_id = document.id
-                        _logger.info(f"🔗 Linked document {document.id} to document line {record.id}")
-                    
-                except Exception as e:
-                    _logger.error(f"❌ Failed to convert attachment '{attachment.name}' to document: {e}")
+        return self.env['attachment.conversion.service'].convert_lines(
+            self, 'attachment_ids', document_field='document_id'
+        )
 
     def action_upload_document(self):
         """Action to upload document for this line"""
@@ -946,33 +778,12 @@ class ProjectProject(models.Model):
     )
     
     def _ensure_project_folder(self):
-        """Ensure the project has a documents folder"""
-        _logger.info(f"🔧 Ensuring project '{self.name}' has a documents folder")
-        
-        if not self.documents_folder_id:
-            try:
-                # Look for existing folder
-                existing_folder = self.env['documents.document'].search([
-                    ('name', '=', self.name),
-                    ('type', '=', 'folder')
-                ], limit=1)
-                
-                if existing_folder:
-                    self.documents_folder_id = existing_folder.id
-                    _logger.info(f"✅ Found existing folder '{existing_folder.name}' for project '{self.name}'")
-                else:
-                    # Create new folder
-                    new_folder = self.env['documents.document'].create({
-                        'name': self.name,
-                        'type': 'folder',
-                        'company_id': self.company_id.id if self.company_id else False,
-                    })
-                    self.documents_folder_id = new_folder.id
-                    _logger.info(f"✅ Created new documents folder '{new_folder.name}' for project '{self.name}'")
-            except Exception as e:
-                _logger.error(f"❌ Failed to create documents folder for project {self.name}: {e}")
-        else:
-            _logger.info(f"✅ Project '{self.name}' already has documents folder '{self.documents_folder_id.name}'")
+        """Ensure the projects have a documents folder"""
+        try:
+            return self.env['project.folder.resolver'].ensure_folders(self)
+        except Exception as e:
+            _logger.error("Failed to create documents folder for projects %s: %s", self.ids, e)
+            return {}
 
     # --- Workflow checkboxes for Required Documents ---
     required_document_complete = fields.Boolean(string="Required Document Complete", default=False)
@@ -1077,6 +888,41 @@ class ProjectProject(models.Model):
         help='Track checkpoints that have been reached in this project'
     )
 
+    # --- Stored Checkpoint Progress ---
+    checkpoint_completed_count = fields.Integer(
+        string="Completed Checkpoints",
+        compute='_compute_checkpoint_progress',
+        store=True,
+        index=True,
+    )
+    checkpoint_progress = fields.Float(
+        string="Checkpoint Progress (%)",
+        compute='_compute_checkpoint_progress',
+        store=True,
+        index=True,
+        aggregator='avg',
+    )
+    next_missing_checkpoint = fields.Char(
+        string="Next Missing Checkpoint",
+        compute='_compute_checkpoint_progress',
+        store=True,
+        index=True,
+    )
+
+    # --- Completion Tracking (maintained by project.milestone.engine) ---
+    checkpoint_completion_mask = fields.Integer(
+        string="Completion Checkpoints Mask",
+        readonly=True,
+        copy=False,
+        help="Bitset of the completion checkpoints reached by the project",
+    )
+    completion_fired_date = fields.Datetime(
+        string="Completed On",
+        readonly=True,
+        copy=False,
+        help="Set once when every completion checkpoint is reached and the final milestone is created",
+    )
+
     # --- Computed Summary Fields ---
     checkpoint_summary = fields.Text(
         string="Checkpoint Summary", 
@@ -1089,77 +935,45 @@ class ProjectProject(models.Model):
         for record in self:
             record.is_update_partner_fields_check = record.is_update_partner_fields
 
-    @api.depends('required_document_complete', 'required_document_confirm', 'required_document_update',
-                 'deliverable_document_complete', 'deliverable_document_confirm', 'deliverable_document_update',
-                 'is_complete_return_compliance', 'is_confirm_compliance', 'is_update_compliance',
-                 'is_complete_partner_fields', 'is_confirm_partner_fields', 'is_update_partner_fields',
-                 'is_handover_complete')
+    def _get_checkpoint_group_states(self):
+        """Return (label, reached state or False) for each required checkpoint group"""
+        self.ensure_one()
+        states = []
+        for label, steps in CHECKPOINT_GROUPS:
+            reached = next((state for fnames, state in steps if any(self[fname] for fname in fnames)), False)
+            states.append((label, reached))
+        return states
+
+    @api.depends(*CHECKPOINT_FLAG_FIELDS)
+    def _compute_checkpoint_progress(self):
+        """Stored progress, recomputed only for the projects whose checkpoint flags change"""
+        total_required = len(CHECKPOINT_GROUPS)
+        for project in self:
+            states = project._get_checkpoint_group_states()
+            completed_count = sum(1 for _label, reached in states if reached)
+            project.checkpoint_completed_count = completed_count
+            project.checkpoint_progress = completed_count * 100.0 / total_required
+            project.next_missing_checkpoint = next((label for label, reached in states if not reached), False)
+
+    @api.depends(*CHECKPOINT_FLAG_FIELDS, 'is_handover_complete')
     def _compute_checkpoint_summary(self):
         """Compute a summary of all checkpoint statuses."""
+        total_required = len(CHECKPOINT_GROUPS)  # Total required checkpoints for completion
         for project in self:
             summary = []
-            completed_count = 0
-            total_required = 4  # Total required checkpoints for completion
-            
-            # Required Documents
-            if project.required_document_complete:
-                summary.append("✅ Required Documents Complete")
-                completed_count += 1
-            elif project.required_document_confirm:
-                summary.append("✅ Required Documents Confirmed")
-                completed_count += 1
-            elif project.required_document_update:
-                summary.append("✅ Required Documents Updated")
-                completed_count += 1
-            else:
-                summary.append("⏳ Required Documents: Not Complete")
-            
-            # Deliverable Documents  
-            if project.deliverable_document_complete:
-                summary.append("✅ Deliverable Documents Complete")
-                completed_count += 1
-            elif project.deliverable_document_confirm:
-                summary.append("✅ Deliverable Documents Confirmed")
-                completed_count += 1
-            elif project.deliverable_document_update:
-                summary.append("✅ Deliverable Documents Updated")
-                completed_count += 1
-            else:
-                summary.append("⏳ Deliverable Documents: Not Complete")
-            
-            # Compliance
-            if project.is_complete_return_compliance:
-                summary.append("✅ Compliance Complete")
-                completed_count += 1
-            elif project.is_confirm_compliance:
-                summary.append("✅ Compliance Confirmed")
-                completed_count += 1
-            elif project.is_update_compliance:
-                summary.append("✅ Compliance Updated")
-                completed_count += 1
-            else:
-                summary.append("⏳ Compliance: Not Complete")
-            
-            # Partner Fields
-            if project.is_complete_partner_fields:
-                summary.append("✅ Partner Fields Complete")
-                completed_count += 1
-            elif project.is_confirm_partner_fields:
-                summary.append("✅ Partner Fields Confirmed")
-                completed_count += 1
-            elif project.is_update_partner_fields:
-                summary.append("✅ Partner Fields Updated")
-                completed_count += 1
-            else:
-                summary.append("⏳ Partner Fields: Not Complete")
+            for label, reached in project._get_checkpoint_group_states():
+                if reached:
+                    summary.append(f"✅ {label} {reached}")
+                else:
+                    summary.append(f"⏳ {label}: Not Complete")
             
             # Handover (optional)
             if project.is_handover_complete:
                 summary.append("✅ Handover Complete")
             
             # Add progress indicator
-            progress_percentage = (completed_count / total_required) * 100
-            progress_summary = f"\n📊 Progress: {completed_count}/{total_required} checkpoints completed ({progress_percentage:.0f}%)"
+            completed_count = project.checkpoint_completed_count
+            progress_summary = f"\n📊 Progress: {completed_count}/{total_required} checkpoints completed ({project.checkpoint_progress:.0f}%)"
             
             if completed_count == total_required:
                 progress_summary += "\n🎉 All required checkpoints completed! Project ready for final milestone."
@@ -1229,74 +1043,35 @@ class ProjectProject(models.Model):
         #             _logger.warning(f"Failed to copy documents from product template: {e}")
         return projects
 
+    def write(self, vals):
+        res = super().write(vals)
+        # Folder names follow the project name, forget cached resolutions on rename
+        if 'name' in vals or 'documents_folder_id' in vals:
+            self.env['project.folder.resolver'].invalidate(self.ids)
+        return res
+
     # Re-enable project-level document management methods
     # --- Project-level document management methods ---
     def _validate_x_required_documents_uploaded(self):
-        missing_docs = []
-        for line in self.x_required_document_ids:
-            if getattr(line, 'x_is_required', False):
-                has_attachment = False
-                if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                    has_attachment = True
-                if not has_attachment:
-                    attachments = self.env['ir.attachment'].search([
-                        ('res_model', '=', line._name),
-                        ('res_id', '=', line.id),
-                        ('name', '=', line.name)
-                    ], limit=1)
-                    if attachments:
-                        has_attachment = True
-                if not has_attachment:
-                    missing_docs.append(line.name or 'Unknown Document')
-        if missing_docs:
-            raise ValidationError(
-                "You must upload the following x_ required documents before completing this action:\n- " + "\n- ".join(missing_docs)
-            )
+        self.env['document.upload.validator'].validate(self, 'x_required_document_ids', 'x_ required documents')
 
     def action_complete_required_documents(self):
-        self.ensure_one()
-        self._validate_x_required_documents_uploaded()
-        self.x_required_document_complete = True
-        self.message_post(body=_("✅ x_Required Documents workflow completed"))
-        self._create_reached_checkpoint("Required Documents Complete")
-        self._check_and_trigger_final_milestone()
-        return True
+        return self.action_checkpoint_transition('required_documents', 'complete')
 
     def action_confirm_required_documents(self):
-        self.ensure_one()
-        self._validate_x_required_documents_uploaded()
-        self.x_required_document_confirm = True
-        self.message_post(body=_("✅ x_Required Documents workflow confirmed"))
-        self._create_reached_checkpoint("Required Documents Confirmed")
-        self._check_and_trigger_final_milestone()
-        return True
+        return self.action_checkpoint_transition('required_documents', 'confirm')
 
     def action_update_required_documents(self):
-        self.ensure_one()
-        self._validate_x_required_documents_uploaded()
-        self.x_required_document_update = True
-        self.message_post(body=_("✅ x_Required Documents workflow updated"))
-        self._create_reached_checkpoint("Required Documents Updated")
-        self._check_and_trigger_final_milestone()
-        return True
+        return self.action_checkpoint_transition('required_documents', 'update')
 
     def action_reset_required_document_complete(self):
-        self.ensure_one()
-        self.required_document_complete = False  # legacy
-        self.x_required_document_complete = False  # x_
-        return True
+        return self.action_checkpoint_reset('required_documents', 'complete')
 
     def action_reset_required_document_confirm(self):
-        self.ensure_one()
-        self.required_document_confirm = False  # legacy
-        self.x_required_document_confirm = False  # x_
-        return True
+        return self.action_checkpoint_reset('required_documents', 'confirm')
 
     def action_reset_required_document_update(self):
-        self.ensure_one()
-        self.required_document_update = False  # legacy
-        self.x_required_document_update = False  # x_
-        return True
+        return self.action_checkpoint_reset('required_documents', 'update')
 
     def action_repeat_required_documents(self):
         """Repeat required documents workflow - reset all states"""
@@ -1359,71 +1134,25 @@ class ProjectProject(models.Model):
         return {'type': 'ir.actions.act_window_close'}
 
     def _validate_x_deliverable_documents_uploaded(self):
-        missing_docs = []
-        for line in self.x_deliverable_document_ids:
-            if getattr(line, 'x_is_required', False):
-                has_attachment = False
-                if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                    has_attachment = True
-                if not has_attachment:
-                    attachments = self.env['ir.attachment'].search([
-                        ('res_model', '=', line._name),
-                        ('res_id', '=', line.id),
-                        ('name', '=', line.name)
-                    ], limit=1)
-                    if attachments:
-                        has_attachment = True
-                if not has_attachment:
-                    missing_docs.append(line.name or 'Unknown Document')
-        if missing_docs:
-            raise ValidationError(
-                "You must upload the following x_ deliverable documents before completing this action:\n- " + "\n- ".join(missing_docs)
-            )
+        self.env['document.upload.validator'].validate(self, 'x_deliverable_document_ids', 'x_ deliverable documents')
 
     def action_complete_deliverable_documents(self):
-        self.ensure_one()
-        self._validate_x_deliverable_documents_uploaded()
-        self.x_deliverable_document_complete = True
-        self.message_post(body=_("✅ x_Deliverable Documents workflow completed"))
-        self._create_reached_checkpoint("Deliverable Documents Complete")
-        self._check_and_trigger_final_milestone()
-        return True
+        return self.action_checkpoint_transition('deliverable_documents', 'complete')
 
     def action_confirm_deliverable_documents(self):
-        self.ensure_one()
-        self._validate_x_deliverable_documents_uploaded()
-        self.x_deliverable_document_confirm = True
-        self.message_post(body=_("✅ x_Deliverable Documents workflow confirmed"))
-        self._create_reached_checkpoint("Deliverable Documents Confirmed")
-        self._check_and_trigger_final_milestone()
-        return True
+        return self.action_checkpoint_transition('deliverable_documents', 'confirm')
 
     def action_update_deliverable_documents(self):
-        self.ensure_one()
-        self._validate_x_deliverable_documents_uploaded()
-        self.x_deliverable_document_update = True
-        self.message_post(body=_("✅ x_Deliverable Documents workflow updated"))
-        self._create_reached_checkpoint("Deliverable Documents Updated")
-        self._check_and_trigger_final_milestone()
-        return True
+        return self.action_checkpoint_transition('deliverable_documents', 'update')
 
     def action_reset_deliverable_document_complete(self):
-        self.ensure_one()
-        self.deliverable_document_complete = False  # legacy
-        self.x_deliverable_document_complete = False  # x_
-        return True
+        return self.action_checkpoint_reset('deliverable_documents', 'complete')
 
     def action_reset_deliverable_document_confirm(self):
-        self.ensure_one()
-        self.deliverable_document_confirm = False  # legacy
-        self.x_deliverable_document_confirm = False  # x_
-        return True
+        return self.action_checkpoint_reset('deliverable_documents', 'confirm')
 
     def action_reset_deliverable_document_update(self):
-        self.ensure_one()
-        self.deliverable_document_update = False  # legacy
-        self.x_deliverable_document_update = False  # x_
-        return True
+        return self.action_checkpoint_reset('deliverable_documents', 'update')
 
     def action_repeat_deliverable_documents(self):
         """Repeat deliverable documents workflow - reset all states"""
@@ -1488,82 +1217,36 @@ class ProjectProject(models.Model):
     # --- Compliance Action Methods ---
     def action_complete_compliance(self):
         """Complete compliance workflow"""
-        self.ensure_one()
-        self.is_complete_return_compliance = True
-        self.message_post(body=_("✅ Compliance workflow completed"))
-        
-        # Create reached checkpoint
-        self._create_reached_checkpoint("Compliance Complete")
-        
-        # Check if all checkpoints are reached
-        self._check_and_trigger_final_milestone()
+        return self.action_checkpoint_transition('compliance', 'complete')
 
     def action_confirm_compliance(self):
         """Confirm compliance workflow"""
-        self.ensure_one()
-        self.is_confirm_compliance = True
-        self.message_post(body=_("✅ Compliance workflow confirmed"))
-        
-        # Create reached checkpoint
-        self._create_reached_checkpoint("Compliance Confirmed")
-        
-        # Check if all checkpoints are reached
-        self._check_and_trigger_final_milestone()
+        return self.action_checkpoint_transition('compliance', 'confirm')
 
     def action_update_compliance(self):
         """Update compliance workflow"""
-        self.ensure_one()
-        self.is_update_compliance = True
-        self.message_post(body=_("✅ Compliance workflow updated"))
-        
-        # Create reached checkpoint
-        self._create_reached_checkpoint("Compliance Updated")
-        
-        # Check if all checkpoints are reached
-        self._check_and_trigger_final_milestone()
+        return self.action_checkpoint_transition('compliance', 'update')
 
     def action_reset_compliance_complete(self):
         """Reset compliance complete status"""
-        self.ensure_one()
-        self.is_complete_return_compliance = False
-        return True
+        return self.action_checkpoint_reset('compliance', 'complete')
 
     def action_reset_compliance_confirm(self):
         """Reset compliance confirm status"""
-        self.ensure_one()
-        self.is_confirm_compliance = False
-        return True
+        return self.action_checkpoint_reset('compliance', 'confirm')
 
     def action_reset_compliance_update(self):
         """Reset compliance update status"""
-        self.ensure_one()
-        self.is_update_compliance = False
-        return True
+        return self.action_checkpoint_reset('compliance', 'update')
 
     # --- Partner Fields Workflow Methods ---
     def action_complete_partner_fields(self):
         """Complete partner fields workflow"""
-        self.ensure_one()
-        self.is_complete_partner_fields = True
-        self.message_post(body=_("✅ Partner Fields workflow completed"))
-        
-        # Create reached checkpoint
-        self._create_reached_checkpoint("Partner Fields Complete")
-        
-        # Check if all checkpoints are reached
-        self._check_and_trigger_final_milestone()
+        return self.action_checkpoint_transition('partner_fields', 'complete')
 
     def action_confirm_partner_fields(self):
         """Confirm partner fields workflow"""
-        self.ensure_one()
-        self.is_confirm_partner_fields = True
-        self.message_post(body=_("✅ Partner Fields workflow confirmed"))
-        
-        # Create reached checkpoint
-        self._create_reached_checkpoint("Partner Fields Confirmed")
-        
-        # Check if all checkpoints are reached
-        self._check_and_trigger_final_milestone()
+        return self.action_checkpoint_transition('partner_fields', 'confirm')
 
     def action_complete_return_partner_fields(self):
         """Complete return partner fields workflow"""
@@ -1574,27 +1257,15 @@ class ProjectProject(models.Model):
 
     def action_update_partner_fields(self):
         """Update partner fields workflow"""
-        self.ensure_one()
-        self.is_update_partner_fields = True
-        self.message_post(body=_("✅ Partner Fields workflow updated"))
-        
-        # Create reached checkpoint
-        self._create_reached_checkpoint("Partner Fields Updated")
-        
-        # Check if all checkpoints are reached
-        self._check_and_trigger_final_milestone()
+        return self.action_checkpoint_transition('partner_fields', 'update')
 
     def action_reset_partner_fields_complete(self):
         """Reset partner fields complete status"""
-        self.ensure_one()
-        self.is_complete_partner_fields = False
-        return True
+        return self.action_checkpoint_reset('partner_fields', 'complete')
 
     def action_reset_partner_fields_confirm(self):
         """Reset partner fields confirm status"""
-        self.ensure_one()
-        self.is_confirm_partner_fields = False
-        return True
+        return self.action_checkpoint_reset('partner_fields', 'confirm')
 
     def action_reset_partner_fields_return(self):
         """Reset partner fields return status"""
@@ -1604,9 +1275,7 @@ class ProjectProject(models.Model):
 
     def action_reset_partner_fields_update(self):
         """Reset partner fields update status"""
-        self.ensure_one()
-        self.is_update_partner_fields = False
-        return True
+        return self.action_checkpoint_reset('partner_fields', 'update')
 
     # --- Enhanced Partner Fields Methods (Phase 6.1) ---
     def action_verify_partner(self):
@@ -2025,108 +1694,114 @@ class ProjectProject(models.Model):
             }
         }
 
-    def _create_reached_checkpoint(self, checkpoint_name):
-        """Create a reached checkpoint for the project"""
+    # --- Bulk Checkpoint Transitions ---
+    def action_checkpoint_transition(self, stage, step):
+        """
+        Run a checkpoint workflow transition on a batch of projects
+        Uploads are validated for the whole batch, the flags are written in
+        one statement, missing reached checkpoints are created together and
+        every project gets a single summary message.
+        Args:
+            stage: key of PROJECT_CHECKPOINT_STAGES
+            step: 'complete', 'confirm' or 'update'
+        """
+        label, validator = PROJECT_CHECKPOINT_STAGES[stage]
+        set_fields, _reset_fields, checkpoint_name = PROJECT_CHECKPOINT_TRANSITIONS[stage][step]
+        if validator:
+            getattr(self, validator)()
+        self.write(dict.fromkeys(set_fields, True))
+        created = self._create_reached_checkpoints(checkpoint_name)
+
+        header = _("✅ %(stage)s workflow %(step)s", stage=label, step=CHECKPOINT_STEP_VERBS[step])
+        reached = Markup("<br/>") + _("🎯 **Checkpoint Reached**: %s", checkpoint_name)
+        self._message_log_batch(bodies={
+            project.id: header + reached if project.id in created else header
+            for project in self
+        })
+        return True
+
+    def action_checkpoint_reset(self, stage, step):
+        """Reset a checkpoint workflow step on a batch of projects"""
+        _set_fields, reset_fields, _checkpoint_name = PROJECT_CHECKPOINT_TRANSITIONS[stage][step]
+        self.write(dict.fromkeys(reset_fields, False))
+        return True
+
+    def _create_reached_checkpoints(self, checkpoint_name):
+        """
+        Create a reached checkpoint on every project of the batch that does not have it yet
+        Returns:
+            set of IDs of the projects that reached the checkpoint now
+        """
+        _checkpoints, created = self.env['reached.checkpoint']._upsert([
+            (project.id, None, checkpoint_name) for project in self
+        ])
+        return set(created.project_id.ids)
+
+    def _create_reached_checkpoint(self, checkpoint_names):
+        """
+        Create the reached checkpoints of the project that do not exist yet
+        Args:
+            checkpoint_names: checkpoint name or list of checkpoint names
+        Returns:
+            reached.checkpoint record, or recordset when a list of names is given
+        """
         self.ensure_one()
-        
-        # Check if checkpoint already exists
-        existing_checkpoint = self.env['reached.checkpoint'].search([
-            ('name', '=', checkpoint_name),
-            ('project_id', '=', self.id)
-        ], limit=1)
-        
-        if not existing_checkpoint:
-            # Create new reached checkpoint
-            reached_checkpoint = self.env['reached.checkpoint'].create({
-                'name': checkpoint_name,
-                'project_id': self.id,
-                'reached_date': fields.Date.today(),
-                'reached_by': self.env.user.id,
-            })
-            
-            # Add to project's reached checkpoints
-            self.reached_checkpoint_ids = [(4, reached_checkpoint.id)]
-            
-            # Post message about checkpoint reached
+        checkpoints, created = self.env['reached.checkpoint'].upsert(checkpoint_names, project=self)
+
+        if created:
+            # Post message about checkpoints reached
             self.message_post(
-                body=_("🎯 **Checkpoint Reached**: %s") % checkpoint_name,
+                body=Markup("<br/>").join(
+                    _("🎯 **Checkpoint Reached**: %s", name) for name in created.mapped('name')
+                ),
                 message_type='notification'
             )
-            
-            return reached_checkpoint
-        return existing_checkpoint
+        return checkpoints[:1] if isinstance(checkpoint_names, str) else checkpoints
+
+    def _link_reached_checkpoints(self, checkpoints):
+        """Add reached checkpoints to the reached_checkpoint_ids of their projects in one statement"""
+        field = self._fields['reached_checkpoint_ids']
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO %s (%s, %s)
+            SELECT project_id, id FROM reached_checkpoint
+             WHERE id = ANY(%s) AND project_id IS NOT NULL
+            ON CONFLICT DO NOTHING
+            """,
+            SQL.identifier(field.relation),
+            SQL.identifier(field.column1),
+            SQL.identifier(field.column2),
+            checkpoints.ids,
+        ))
+        self.invalidate_model(['reached_checkpoint_ids'])
 
     def _check_and_trigger_final_milestone(self):
         """Check if all required checkpoints are reached and trigger final milestone"""
         self.ensure_one()
-        
-        # Define all required checkpoints for project completion
-        required_checkpoints = [
-            "Required Documents Complete",
-            "Deliverable Documents Complete", 
-            "Compliance Complete",
-            "Partner Fields Complete",
-        ]
-        
-        # Get all reached checkpoints for this project
-        reached_checkpoint_names = self.reached_checkpoint_ids.mapped('name')
-        
-        # Check if all required checkpoints are reached
-        all_reached = all(checkpoint in reached_checkpoint_names for checkpoint in required_checkpoints)
-        
-        if all_reached:
-            # Create final milestone
-            final_milestone = self._create_final_milestone()
-            
-            # Post completion message
-            self.message_post(
-                body=_("🏆 **PROJECT COMPLETED!** All required checkpoints have been reached. Final milestone created: %s") % final_milestone.name,
-                message_type='notification'
-            )
-            
-            # Send completion notification
-            self._send_project_completion_notification()
-            
-            return final_milestone
-        
-        return False
+        # Completion fires once, later calls return False
+        final_milestone = self.env['project.milestone.engine'].evaluate(self)
+        return final_milestone[:1] or False
 
-    def _create_final_milestone(self):
-        """Create the final milestone for project completion"""
+    def _prepare_final_milestone_vals(self):
+        """Values of the final milestone created on project completion"""
         self.ensure_one()
-        
-        # Create final milestone
-        final_milestone = self.env['project.milestone'].create({
+        return {
             'name': f"Project Completion - {self.name}",
             'project_id': self.id,
             'deadline': fields.Date.today(),
-            'milestone_message': f"🎉 **PROJECT COMPLETED!**\n\nAll required checkpoints have been reached:\n" + 
-                               "\n".join([f"✅ {checkpoint}" for checkpoint in self.reached_checkpoint_ids.mapped('name')]),
+            'milestone_message': f"🎉 **PROJECT COMPLETED!**\n\nAll required checkpoints have been reached:\n" +
+                               "\n".join([f"✅ {checkpoint}" for checkpoint in COMPLETION_CHECKPOINTS]),
             'is_reached': True,
-        })
-        
-        return final_milestone
+        }
 
-    def _send_project_completion_notification(self):
-        """Send notification about project completion"""
+    def _create_final_milestone(self):
+        """Create the final milestone for project completion"""
         self.ensure_one()
-        
-        # Get completion email template
-        completion_template = self.env['mail.template'].search([
-            ('name', '=', 'Project Completion Notification')
-        ], limit=1)
-        
-        if completion_template:
-            try:
-                completion_template.send_mail(self.id, force_send=True)
-            except Exception as e:
-                _logger.error(f"Failed to send project completion email: {e}")
-        
-        # Also send internal notification
-        self.message_post(
-            body=_("📧 Project completion notification sent to stakeholders"),
-            message_type='notification'
-        )
+        return self.env['project.milestone'].create(self._prepare_final_milestone_vals())
+
+    def _send_project_completion_notification(self):
+        """Queue the notification about project completion"""
+        self.env['project.milestone.engine'].queue_completion_notifications(self)
 
     def action_check_project_completion(self):
         """Manually check if project is ready for completion"""
@@ -2313,12 +1988,8 @@ class ProjectProject(models.Model):
         Convert all x_ document attachments to documents in the project folder.
         """
         self.ensure_one()
-        for line in self.x_deliverable_document_ids:
-            if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                line.action_convert_x_attachments_to_documents()
-        for line in self.x_required_document_ids:
-            if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                line.action_convert_x_attachments_to_documents()
+        self.x_deliverable_document_ids.filtered('x_attachment_ids').action_convert_x_attachments_to_documents()
+        self.x_required_document_ids.filtered('x_attachment_ids').action_convert_x_attachments_to_documents()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -2334,12 +2005,8 @@ class ProjectProject(models.Model):
         Test conversion of all x_ document attachments to documents in the project folder.
         """
         self.ensure_one()
-        for line in self.x_deliverable_document_ids:
-            if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                line.action_convert_x_attachments_to_documents()
-        for line in self.x_required_document_ids:
-            if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                line.action_convert_x_attachments_to_documents()
+        self.x_deliverable_document_ids.filtered('x_attachment_ids').action_convert_x_attachments_to_documents()
+        self.x_required_document_ids.filtered('x_attachment_ids').action_convert_x_attachments_to_documents()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -2355,12 +2022,8 @@ class ProjectProject(models.Model):
         Force conversion of all x_ document attachments to documents in the project folder.
         """
         self.ensure_one()
-        for line in self.x_deliverable_document_ids:
-            if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                line.action_convert_x_attachments_to_documents()
-        for line in self.x_required_document_ids:
-            if hasattr(line, 'x_attachment_ids') and line.x_attachment_ids:
-                line.action_convert_x_attachments_to_documents()
+        self.x_deliverable_document_ids.filtered('x_attachment_ids').action_convert_x_attachments_to_documents()
+        self.x_required_document_ids.filtered('x_attachment_ids').action_convert_x_attachments_to_documents()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -2611,14 +2274,19 @@ class ProjectTask(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         tasks = super().create(vals_list)
-        for task in tasks:
-            project = task.project_id
-            if project:
-                try:
-                    copy_documents_from_project_to_task(task.env, task, project)
-                except Exception as e:
-                    # Log the error but don't fail task creation
-                    _logger.warning(f"Failed to copy documents from project to task: {e}")
+        # Copy the project document types with one create per document line model
+        vals_by_model = defaultdict(list)
+        for task in tasks.filtered('project_id'):
+            for model_name, document_vals in prepare_document_vals_from_project(task, task.project_id).items():
+                vals_by_model[model_name].extend(document_vals)
+        for model_name, document_vals in vals_by_model.items():
+            if not document_vals:
+                continue
+            try:
+                self.env[model_name].create(document_vals)
+            except Exception as e:
+                # Log the error but don't fail task creation
+                _logger.warning("Failed to copy documents from project to %s tasks: %s", len(tasks), e)
         return tasks
 
     def action_copy_checkpoints_from_template(self):
@@ -2687,119 +2355,197 @@ class SaleOrder(models.Model):
     #         order.project_ids = projects
     #         order.project_count = len(projects)
 
+    @instrumented('order_confirm')
     def action_confirm(self):
-        _logger.info(f"🚀 ACTION_CONFIRM called for sale order: {self.name} (ID: {self.id})")
+        debug(_logger, "Confirming sale orders %s", self.ids)
         res = super().action_confirm()
-        # Re-enable project creation but keep task creation disabled
-        _logger.info(f"🚀 About to call _create_tasks_from_templates for order: {self.name}")
-        self._create_tasks_from_templates()
+        if self._is_async_confirmation():
+            jobs = self.env['project.materialisation.job'].sudo().enqueue_orders(self)
+            debug(_logger, "Queued %s project materialisation jobs for sale orders %s", len(jobs), self.ids)
+            return res
+        stats = self._create_tasks_from_templates()
+        debug(_logger, "Order confirmation pipeline stats: %s", stats)
         return res
 
-    def _create_tasks_from_templates(self):
+    def _get_workflow_products(self):
+        """Return the new_workflow products of the orders, keyed by order id"""
+        products_by_order = {}
         for order in self:
+            products_by_order[order.id] = order.order_line.mapped('product_id').filtered(
+                lambda p: p.service_tracking == 'new_workflow'
+            )
+        return products_by_order
+
+    def _get_or_create_workflow_projects(self, products_by_order, stats):
+        """
+        Resolve the projects of every order with workflow products.
+        Existing projects are fetched with a single search; orders without a
+        project get a new one and their smart documents.
+        Args:
+            products_by_order: dict order id -> product.product recordset
+            stats: pipeline statistics dict, updated in place
+        Returns:
+            dict order id -> project.project recordset
+        """
+        Project = self.env['project.project']
+        workflow_orders = self.filtered(lambda o: products_by_order.get(o.id))
+        projects_by_order = defaultdict(lambda: Project)
+        if not workflow_orders:
+            return projects_by_order
+
+        # Fix: Use sale_line_id.order_id instead of sale_order_id
+        for project in Project.search([('sale_line_id.order_id', 'in', workflow_orders.ids)]):
+            projects_by_order[project.sale_line_id.order_id.id] |= project
+
+        document_service = self.env['project.document.service']
+        for order in workflow_orders:
+            if projects_by_order[order.id]:
+                continue
             try:
-                _logger.info(f"🔍 Processing sale order: {order.name} (ID: {order.id})")
-                
-                all_workflow_products = order.order_line.mapped('product_id').filtered(
-                    lambda p: p.service_tracking == 'new_workflow'
-                )
-                _logger.info(f"🔍 Found {len(all_workflow_products)} products with service_tracking='new_workflow':")
-                for product in all_workflow_products:
-                    _logger.info(f"  - {product.name} (ID: {product.id}, Service Tracking: {product.service_tracking})")
-                
-                if not all_workflow_products:
-                    _logger.info(f"❌ No workflow products found for order {order.name}, skipping")
-                    continue
-                
-                # Find or create project for this order
-                # Fix: Use sale_line_id.order_id instead of sale_order_id
-                projects = self.env['project.project'].search([('sale_line_id.order_id', '=', order.id)])
-                _logger.info(f"🔍 Found {len(projects)} existing projects for order {order.name}")
-                
-                if not projects:
-                    _logger.info(f"🔨 Creating new project for order {order.name}")
-                    # Pass context for document propagation
-                    ctx = self.env.context.copy()
-                    if order.order_line:
-                        ctx['default_sale_order_line_id'] = order.order_line[0].id
-                    project = self.env["project.project"].with_context(ctx).create({
-                        "name": f"{order.name} - {order.partner_id.name}",
-                        "sale_line_id": order.order_line[0].id if order.order_line else False,
-                        "user_id": order.user_id.id,
-                        "partner_id": order.partner_id.id,
-                    })
-                    projects = project
-                    _logger.info(f"✅ Created project: {project.name} (ID: {project.id})")
-                    
-                    # Copy documents from product templates to project using Enhanced Document Service
-                    try:
-                        _logger.info(f"🔧 Using Enhanced Document Service to copy documents")
-                        document_service = self.env['project.document.service']
-                        documents_created = document_service.create_smart_documents(project, order)
-                        _logger.info(f"📋 Enhanced Document service results: {documents_created}")
-                        
-                        # Post results to the project
-                        project.message_post(
-                            body=f"Enhanced Smart Document Service Results:<br/>"
-                                 f"• Created {documents_created.get('deliverable', 0)} deliverable document lines<br/>"
-                                 f"• Created {documents_created.get('required', 0)} required document lines<br/>"
-                                 f"• Linked {documents_created.get('existing_linked', 0)} existing documents<br/>"
-                                 f"• Prevented {documents_created.get('duplicates_prevented', 0)} duplicates<br/>"
-                                 f"• Milestone-based: {documents_created.get('milestone_based', 0)}"
-                        )
-                    except Exception as e:
-                        _logger.error(f"❌ Failed to use enhanced document service: {e}")
-                        import traceback
-                        _logger.error(f"Full traceback: {traceback.format_exc()}")
-                else:
-                    _logger.info(f"📁 Using existing projects: {[p.name for p in projects]}")
-                    
-                # Re-enable task creation
-                # Create tasks for each project using the service
-                _logger.info(f"🔨 Creating tasks for {len(projects)} projects")
-                for project in projects:
-                    _logger.info(f"  Processing project: {project.name}")
-                    for product in all_workflow_products:
-                        _logger.info(f"    Processing product: {product.name}")
-                        if product.product_tmpl_id.task_template_ids:
-                            _logger.info(f"      Found {len(product.product_tmpl_id.task_template_ids)} task templates")
-                            for template in product.product_tmpl_id.task_template_ids:
-                                try:
-                                    task = self.env['project.task'].create({
-                                        'name': template.name,
-                                        'project_id': project.id,
-                                        'description': template.description,
-                                        'user_ids': [(6, 0, template.user_ids.ids)],
-                                        'stage_id': template.stage_id.id if template.stage_id else False,
-                                        'allocated_hours': template.planned_hours,
-                                        'priority': template.priority,
-                                    })
-                                    _logger.info(f"      ✅ Created task: {task.name} (ID: {task.id})")
-                                    
-                                    # Copy checkpoints from template to task
-                                    try:
-                                        copy_checkpoints_from_template_to_task(task.env, task, template)
-                                        _logger.info(f"      📋 Copied checkpoints from template to task: {task.name}")
-                                    except Exception as checkpoint_error:
-                                        _logger.warning(f"      ⚠️ Failed to copy checkpoints for task {task.name}: {checkpoint_error}")
-                                    
-                                    # Copy documents from project to task with enhanced duplicate prevention
-                                    try:
-                                        document_service = self.env['project.document.service']
-                                        copy_stats = document_service.copy_documents_from_project_to_task(task, project)
-                                        _logger.info(f"      📋 Document copy stats for task {task.name}: {copy_stats}")
-                                    except Exception as doc_error:
-                                        _logger.warning(f"      ⚠️ Failed to copy documents for task {task.name}: {doc_error}")
-                                except Exception as e:
-                                    _logger.warning(f"      ❌ Failed to create task from template {template.name}: {e}")
-                                    continue
-                        else:
-                            _logger.info(f"      No task templates found for product {product.name}")
+                # Pass context for document propagation
+                ctx = self.env.context.copy()
+                if order.order_line:
+                    ctx['default_sale_order_line_id'] = order.order_line[0].id
+                project = Project.with_context(ctx).create({
+                    "name": f"{order.name} - {order.partner_id.name}",
+                    "sale_line_id": order.order_line[0].id if order.order_line else False,
+                    "user_id": order.user_id.id,
+                    "partner_id": order.partner_id.id,
+                })
+                projects_by_order[order.id] = project
+                stats['projects_created'] += 1
+                debug(_logger, "Created project %s for sale order %s", project.id, order.id)
             except Exception as e:
-                _logger.error(f"❌ Failed to create projects from templates for order {order.name}: {e}")
-                import traceback
-                _logger.error(f"Full traceback: {traceback.format_exc()}")
-                continue 
+                _logger.error("Failed to create project for order %s: %s", order.name, e)
+                stats['errors'] += 1
+                continue
+
+            # Copy documents from product templates to project, the service posts its own summary
+            try:
+                document_service.create_smart_documents(project, order)
+            except Exception:
+                _logger.exception("Failed to create smart documents for project %s", project.id)
+                stats['document_errors'] += 1
+        return projects_by_order
+
+    def _get_existing_spec_ids(self, specs):
+        """
+        IDs referenced by compiled task specs that still exist. Stages, users,
+        milestones and checkpoints deleted after the template trees were
+        cached are nulled by the database without clearing the cache, so the
+        cached IDs are checked with one exists() per model.
+        Args:
+            specs: iterable of TaskSpec
+        Returns:
+            dict model name -> set of existing IDs
+        """
+        referenced = defaultdict(set)
+        for spec in specs:
+            for task_spec in (spec, *spec.subtasks):
+                referenced['res.users'].update(task_spec.user_ids)
+                referenced['project.task.type'].add(task_spec.stage_id)
+            for checkpoint in spec.checkpoints:
+                referenced['reached.checkpoint'].update(checkpoint.checkpoint_ids)
+                referenced['project.task.type'].add(checkpoint.stage_id)
+                referenced['project.milestone'].add(checkpoint.milestone_id)
+        existing_ids = defaultdict(set)
+        for model_name, ids in referenced.items():
+            existing_ids[model_name] = set(self.env[model_name].browse(ids - {False}).exists().ids)
+        return existing_ids
+
+    def _prepare_task_vals_from_template(self, project, spec, existing_ids):
+        """Build project.task values for a compiled task or subtask template spec"""
+        return {
+            'name': spec.name,
+            'project_id': project.id,
+            'description': spec.description,
+            'user_ids': [(6, 0, [uid for uid in spec.user_ids if uid in existing_ids['res.users']])],
+            'stage_id': spec.stage_id if spec.stage_id in existing_ids['project.task.type'] else False,
+            'allocated_hours': spec.planned_hours,
+            'priority': spec.priority,
+        }
+
+    @instrumented('task_materialisation')
+    def _create_tasks_from_templates(self, template_filter=None):
+        """
+        Batched sale-order-to-project pipeline.
+        Products are expanded from their compiled template trees, then every
+        task (subtasks nested) is created with one create(vals_list) call and
+        all task checkpoints with a second one, so the cost grows with the
+        number of models involved rather than the number of rows.
+        Args:
+            template_filter: optional dict order id -> product.task.template
+                recordset restricting which templates are expanded (used by
+                the materialisation job queue)
+        Returns:
+            dict with pipeline statistics
+        """
+        stats = {
+            'orders': len(self),
+            'projects_created': 0,
+            'tasks_created': 0,
+            'checkpoints_created': 0,
+            'documents_copied': 0,
+            'document_errors': 0,
+            'errors': 0,
+        }
+        products_by_order = self._get_workflow_products()
+        projects_by_order = self._get_or_create_workflow_projects(products_by_order, stats)
+
+        # Gather every (project, template) pair before touching the database
+        project_specs = []
+        for order in self:
+            trees = products_by_order[order.id].product_tmpl_id._get_template_trees()
+            specs = [spec for tree in trees.values() for spec in tree.tasks]
+            if template_filter is not None:
+                allowed_ids = set(template_filter[order.id].ids) if order.id in template_filter else set()
+                specs = [spec for spec in specs if spec.id in allowed_ids]
+            for project in projects_by_order[order.id]:
+                project_specs.extend((project, spec) for spec in specs)
+        if not project_specs:
+            return stats
+
+        existing_ids = self._get_existing_spec_ids({spec for _project, spec in project_specs})
+        task_vals_list = []
+        task_specs = []
+        for project, spec in project_specs:
+            task_vals = self._prepare_task_vals_from_template(project, spec, existing_ids)
+            if spec.subtasks:
+                task_vals['child_ids'] = [
+                    Command.create(self._prepare_task_vals_from_template(project, subtask, existing_ids))
+                    for subtask in spec.subtasks
+                ]
+            task_vals_list.append(task_vals)
+            task_specs.append(spec)
+
+        try:
+            tasks = self.env['project.task'].create(task_vals_list)
+        except Exception as e:
+            _logger.error("Failed to create tasks from templates: %s", e)
+            stats['errors'] += 1
+            return stats
+        stats['tasks_created'] = len(tasks)
+
+        # Copy checkpoints from templates to tasks in a single create
+        checkpoint_vals_list = []
+        for task, spec in zip(tasks, task_specs):
+            checkpoint_vals_list.extend(prepare_checkpoint_vals_from_spec(task, spec, existing_ids))
+        if checkpoint_vals_list:
+            try:
+                checkpoints = self.env['task.checkpoint'].create(checkpoint_vals_list)
+                stats['checkpoints_created'] = len(checkpoints)
+            except Exception as checkpoint_error:
+                _logger.warning("Failed to copy checkpoints for %s tasks: %s", len(tasks), checkpoint_error)
+                stats['errors'] += 1
+
+        # Copy (or share) documents from project to tasks with enhanced duplicate prevention
+        try:
+            copy_stats = self.env['project.document.service'].copy_documents_to_tasks(tasks)
+            stats['documents_copied'] = copy_stats['deliverable_copied'] + copy_stats['required_copied']
+        except Exception as doc_error:
+            _logger.warning("Failed to copy documents for %s tasks: %s", len(tasks), doc_error)
+            stats['document_errors'] += 1
+        return stats
 
 
 class ReachedCheckpoint(models.Model):
@@ -2823,18 +2569,116 @@ class ReachedCheckpoint(models.Model):
     is_final = fields.Boolean(string='Final Checkpoint', default=False, 
                              help='Mark as final checkpoint for project completion')
     
+    def init(self):
+        # One checkpoint per project, task and name, an unset scope counts as a value
+        if not index_exists(self.env.cr, 'reached_checkpoint_scope_name_uniq'):
+            self.env.cr.execute("""
+                DELETE FROM reached_checkpoint dup
+                 USING reached_checkpoint keep
+                 WHERE COALESCE(dup.project_id, 0) = COALESCE(keep.project_id, 0)
+                   AND COALESCE(dup.task_id, 0) = COALESCE(keep.task_id, 0)
+                   AND dup.name = keep.name
+                   AND dup.id > keep.id
+            """)
+            if self.env.cr.rowcount:
+                _logger.info("Removed %s duplicate reached checkpoints", self.env.cr.rowcount)
+            create_unique_index(
+                self.env.cr, 'reached_checkpoint_scope_name_uniq', self._table,
+                ['COALESCE(project_id, 0)', 'COALESCE(task_id, 0)', 'name'],
+            )
+
     @api.model
-    def create(self, vals):
+    def _get_checkpoint_type(self, name):
+        """Checkpoint type guessed from the checkpoint name"""
+        name = (name or '').lower()
+        if 'document' in name:
+            return 'document'
+        elif 'compliance' in name:
+            return 'compliance'
+        elif 'partner' in name:
+            return 'partner'
+        elif 'milestone' in name:
+            return 'milestone'
+        return False
+
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override create to set checkpoint type based on name"""
-        if 'name' in vals:
-            name = vals['name'].lower()
-            if 'document' in name:
-                vals['checkpoint_type'] = 'document'
-            elif 'compliance' in name:
-                vals['checkpoint_type'] = 'compliance'
-            elif 'partner' in name:
-                vals['checkpoint_type'] = 'partner'
-            elif 'milestone' in name:
-                vals['checkpoint_type'] = 'milestone'
-        
-        return super().create(vals)
\ No newline at end of file
+        for vals in vals_list:
+            checkpoint_type = self._get_checkpoint_type(vals.get('name'))
+            if checkpoint_type:
+                vals['checkpoint_type'] = checkpoint_type
+
+        checkpoints = super().create(vals_list)
+        # Reached checkpoint events drive project completion
+        self.env['project.milestone.engine'].on_checkpoints_reached(checkpoints)
+        return checkpoints
+
+    @api.model
+    def upsert(self, names, project=None, task=None):
+        """
+        Create or return reached checkpoints in one round trip
+        Args:
+            names: checkpoint name or list of checkpoint names
+            project: optional project.project record
+            task: optional project.task record
+        Returns:
+            tuple (reached.checkpoint recordset in names order, recordset of the created ones)
+        """
+        if isinstance(names, str):
+            names = [names]
+        project_id = project.id if project else None
+        task_id = task.id if task else None
+        return self._upsert([(project_id, task_id, name) for name in names])
+
+    @api.model
+    def _upsert(self, keys):
+        """
+        Insert missing checkpoints and return existing ones with a single
+        INSERT .. ON CONFLICT on the (project, task, name) unique index
+        Args:
+            keys: list of (project ID or None, task ID or None, name)
+        Returns:
+            tuple (reached.checkpoint recordset in keys order, recordset of the created ones)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return self.browse(), self.browse()
+        self.flush_model()
+        now = fields.Datetime.now()
+        project_ids, task_ids, names = zip(*keys)
+        self.env.cr.execute("""
+            INSERT INTO reached_checkpoint (
+                name, project_id, task_id, checkpoint_type, reached_date, reached_by, is_final,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT key.name, key.project_id, key.task_id, COALESCE(key.checkpoint_type, 'custom'), %(today)s, %(uid)s, FALSE,
+                   %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM unnest(%(project_ids)s::int[], %(task_ids)s::int[], %(names)s::varchar[], %(types)s::varchar[])
+                   AS key(project_id, task_id, name, checkpoint_type)
+            ON CONFLICT (COALESCE(project_id, 0), COALESCE(task_id, 0), name)
+            DO UPDATE SET name = EXCLUDED.name
+            RETURNING id, project_id, task_id, name, (xmax = 0) AS created
+        """, {
+            'today': fields.Date.context_today(self),
+            'uid': self.env.uid,
+            'now': now,
+            'project_ids': list(project_ids),
+            'task_ids': list(task_ids),
+            'names': list(names),
+            'types': [self._get_checkpoint_type(name) or None for name in names],
+        })
+        id_by_key = {}
+        created_ids = []
+        for checkpoint_id, project_id, task_id, name, created in self.env.cr.fetchall():
+            id_by_key[(project_id, task_id, name)] = checkpoint_id
+            if created:
+                created_ids.append(checkpoint_id)
+
+        checkpoints = self.browse([id_by_key[key] for key in keys])
+        created = self.browse(created_ids)
+        self.env['project.project']._link_reached_checkpoints(checkpoints)
+        if created:
+            # Reached checkpoint events drive project completion
+            self.env['project.milestone.engine'].on_checkpoints_reached(created)
+        return checkpoints, created
\ No newline at end of file
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+from datetime import timedelta
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+ASYNC_CONFIRM_PARAM = 'project_documents_extension.async_order_confirmation'
+
+
+class ProjectMaterialisationJob(models.Model):
+    """Deferred project/task/document materialisation for a confirmed sale order.
+
+    One job is queued per (order, product, task template). The cron worker
+    drains pending jobs order by order, so a failing order never blocks the
+    others and is retried with an exponential back-off.
+    """
+    _name = 'project.materialisation.job'
+    _description = 'Project Materialisation Job'
+    _order = 'next_attempt_date, id'
+
+    name = fields.Char(string='Idempotency Key', required=True, readonly=True, index=True)
+    order_id = fields.Many2one('sale.order', string='Sale Order', required=True, ondelete='cascade', index=True)
+    product_id = fields.Many2one('product.product', string='Product', ondelete='cascade')
+    template_id = fields.Many2one('product.task.template', string='Task Template', ondelete='set null')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, index=True)
+    attempts = fields.Integer(string='Attempts', default=0, readonly=True)
+    max_attempts = fields.Integer(string='Max Attempts', default=5)
+    next_attempt_date = fields.Datetime(string='Next Attempt', default=fields.Datetime.now, index=True)
+    done_date = fields.Datetime(string='Done On', readonly=True)
+    last_error = fields.Text(string='Last Error', readonly=True)
+
+    _sql_constraints = [
+        ('name_unique', 'unique(name)', 'A materialisation job already exists for this order, product and template.'),
+    ]
+
+    @api.model
+    def _make_key(self, order, product, template):
+        """Idempotency key for an (order, product, template) triple"""
+        return f"{order.id}-{product.id}-{template.id if template else 0}"
+
+    @api.model
+    def enqueue_orders(self, orders):
+        """
+        Queue one job per (order, workflow product, task template).
+        Keys that already exist are skipped, so confirming an order twice
+        never materialises its tasks twice.
+        Args:
+            orders: sale.order recordset
+        Returns:
+            project.materialisation.job recordset of the newly queued jobs
+        """
+        products_by_order = orders._get_workflow_products()
+        vals_by_key = {}
+        for order in orders:
+            for product in products_by_order[order.id]:
+                templates = product.product_tmpl_id.task_template_ids or [False]
+                for template in templates:
+                    key = self._make_key(order, product, template)
+                    vals_by_key[key] = {
+                        'name': key,
+                        'order_id': order.id,
+                        'product_id': product.id,
+                        'template_id': template.id if template else False,
+                    }
+        if not vals_by_key:
+            return self.browse()
+
+        existing_keys = set(self.search([('name', 'in', list(vals_by_key))]).mapped('name'))
+        jobs = self.create([vals for key, vals in vals_by_key.items() if key not in existing_keys])
+        if jobs:
+            cron = self.env.ref('project_documents_extension.ir_cron_project_materialisation_jobs', raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+        return jobs
+
+    @api.model
+    def _cron_process_jobs(self, limit=100):
+        """
+        Drain due pending jobs, one order at a time inside a savepoint.
+        Args:
+            limit: maximum number of jobs picked up per run
+        Returns:
+            dict with processing statistics
+        """
+        stats = {'orders': 0, 'jobs_done': 0, 'jobs_retried': 0, 'jobs_failed': 0}
+        jobs = self.search([
+            ('state', '=', 'pending'),
+            ('next_attempt_date', '<=', fields.Datetime.now()),
+        ], limit=limit)
+        for order, order_jobs in jobs.grouped('order_id').items():
+            stats['orders'] += 1
+            for attempts, attempt_jobs in order_jobs.grouped('attempts').items():
+                attempt_jobs.write({'state': 'running', 'attempts': attempts + 1})
+            try:
+                with self.env.cr.savepoint():
+                    order_jobs._run()
+            except Exception as e:
+                _logger.warning("Materialisation of order %s failed: %s", order.name, e)
+                order_jobs._schedule_retry(str(e))
+                failed_jobs = order_jobs.filtered(lambda j: j.state == 'failed')
+                stats['jobs_failed'] += len(failed_jobs)
+                stats['jobs_retried'] += len(order_jobs - failed_jobs)
+            else:
+                order_jobs.write({'state': 'done', 'done_date': fields.Datetime.now(), 'last_error': False})
+                stats['jobs_done'] += len(order_jobs)
+            if not getattr(threading.current_thread(), 'testing', False):
+                self.env.cr.commit()
+        return stats
+
+    def _run(self):
+        """Materialise the project, tasks and documents of a single order's jobs"""
+        order = self.order_id.ensure_one()
+        template_filter = {order.id: self.template_id}
+        pipeline_stats = order.with_context(project_materialisation_job=True)._create_tasks_from_templates(
+            template_filter=template_filter
+        )
+        errors = pipeline_stats.get('errors', 0) + pipeline_stats.get('document_errors', 0)
+        if errors:
+            raise UserError(_("Project materialisation reported %s error(s), see server log.") % errors)
+        return pipeline_stats
+
+    def _schedule_retry(self, error):
+        """Reschedule with exponential back-off, or mark failed after max_attempts"""
+        now = fields.Datetime.now()
+        for job in self:
+            if job.attempts >= job.max_attempts:
+                job.write({'state': 'failed', 'last_error': error})
+            else:
+                job.write({
+                    'state': 'pending',
+                    'last_error': error,
+                    'next_attempt_date': now + timedelta(minutes=2 ** job.attempts),
+                })
+
+    def action_retry(self):
+        """Manually requeue failed jobs"""
+        self.filtered(lambda j: j.state == 'failed').write({
+            'state': 'pending',
+            'attempts': 0,
+            'next_attempt_date': fields.Datetime.now(),
+        })
+        return True
+
+
+class SaleOrder(models.Model):
+    _inherit = 'sale.order'
+
+    x_materialisation_job_ids = fields.One2many(
+        'project.materialisation.job', 'order_id', string='Project Materialisation Jobs'
+    )
+    x_materialisation_state = fields.Selection([
+        ('none', 'Not Queued'),
+        ('pending', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Project Setup', compute='_compute_materialisation_state', store=True)
+
+    @api.depends('x_materialisation_job_ids.state')
+    def _compute_materialisation_state(self):
+        for order in self:
+            states = set(order.x_materialisation_job_ids.mapped('state'))
+            if not states:
+                order.x_materialisation_state = 'none'
+            elif 'failed' in states:
+                order.x_materialisation_state = 'failed'
+            elif 'running' in states:
+                order.x_materialisation_state = 'running'
+            elif 'pending' in states:
+                order.x_materialisation_state = 'pending'
+            else:
+                order.x_materialisation_state = 'done'
+
+    def _is_async_confirmation(self):
+        """Whether project materialisation should be deferred to the job queue"""
+        if 'async_project_materialisation' in self.env.context:
+            return bool(self.env.context['async_project_materialisation'])
+        param = self.env['ir.config_parameter'].sudo().get_param(ASYNC_CONFIRM_PARAM, 'False')
+        return param.lower() in ('1', 'true', 'yes')
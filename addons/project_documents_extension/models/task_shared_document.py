@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields, models
+
+
+class ProjectTaskSharedDocument(models.Model):
+    """Project document lines seen by the tasks that share them.
+
+    Tasks in shared document mode do not get their own copies of the x_
+    required and deliverable lines of their project: this view exposes the
+    project lines once per sharing task, so rows and attachments are stored
+    only once whatever the number of tasks.
+    """
+    _name = 'project.task.shared.document'
+    _description = 'Shared Project Document of a Task'
+    _auto = False
+    _order = 'task_id, document_category, document_type_id'
+
+    task_id = fields.Many2one('project.task', string='Task', readonly=True)
+    project_id = fields.Many2one('project.project', string='Project', readonly=True)
+    document_category = fields.Selection([
+        ('required', 'Required'),
+        ('deliverable', 'Deliverable'),
+    ], string='Category', readonly=True)
+    required_document_id = fields.Many2one('project.required.document', string='Required Document', readonly=True)
+    deliverable_document_id = fields.Many2one('project.deliverable.document', string='Deliverable Document', readonly=True)
+    name = fields.Char(string='Name', readonly=True)
+    document_type_id = fields.Many2one('project.document.type', string='Document Type', readonly=True)
+    is_required = fields.Boolean(string='Required', readonly=True)
+    is_verified = fields.Boolean(string='Verified', readonly=True)
+    expiry_date = fields.Date(string='Expiry Date', readonly=True)
+
+    def _lines_query(self, model_name, category):
+        table = self.env[model_name]._table
+        required_id = 'line.id' if category == 'required' else 'NULL::int'
+        deliverable_id = 'line.id' if category == 'deliverable' else 'NULL::int'
+        return f"""
+            SELECT task.id AS task_id,
+                   task.project_id,
+                   '{category}' AS document_category,
+                   {required_id} AS required_document_id,
+                   {deliverable_id} AS deliverable_document_id,
+                   doc.name,
+                   line.x_document_type_id AS document_type_id,
+                   line.x_is_required AS is_required,
+                   line.x_is_verify AS is_verified,
+                   line.x_expiry_date AS expiry_date
+              FROM project_task task
+              JOIN {table} line ON line.x_project_id = task.project_id AND line.x_task_id IS NULL
+              JOIN documents_document doc ON doc.id = line.document_id
+             WHERE task.x_share_project_documents
+        """
+
+    def init(self):
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT ROW_NUMBER() OVER (ORDER BY task_id, document_category, required_document_id, deliverable_document_id) AS id,
+                       shared.*
+                  FROM (
+                      {self._lines_query('project.required.document', 'required')}
+                      UNION ALL
+                      {self._lines_query('project.deliverable.document', 'deliverable')}
+                  ) shared
+            )
+        """)
@@ -1,2 +1,7 @@
 from . import task_checkpoint_service
-from . import project_document_service 
\ No newline at end of file
+from . import project_document_service
+from . import attachment_conversion_service
+from . import folder_resolver_service
+from . import expiration_reminder_service
+from . import document_upload_validator
+from . import milestone_engine
@@ -0,0 +1,90 @@
+from odoo import models, api
+import logging
+
+from ..instrumentation import instrumented
+
+_logger = logging.getLogger(__name__)
+
+
+class AttachmentConversionService(models.AbstractModel):
+    """
+    Attachment Conversion Service
+    Converts the attachments of document lines into documents.document records
+    in bulk: existing attachment->document links are resolved with a single
+    grouped query and the missing documents are created in one batch.
+    """
+    _name = 'attachment.conversion.service'
+    _description = 'Attachment Conversion Service'
+
+    @api.model
+    @instrumented('attachment_conversion')
+    def convert_lines(self, lines, attachment_field, document_field=None):
+        """
+        Convert the attachments of document lines to project documents
+
+        Args:
+            lines: recordset of document lines implementing _get_conversion_project()
+            attachment_field: name of the attachments Many2many on the lines
+            document_field: optional Many2one on the lines to link the first
+                created document to, when still empty
+        Returns:
+            dict with conversion statistics
+        """
+        stats = {'documents_created': 0, 'already_converted': 0, 'lines_skipped': 0}
+
+        project_by_line = {}
+        for line in lines:
+            project = line._get_conversion_project()
+            if project and line[attachment_field]:
+                project_by_line[line] = project
+            else:
+                stats['lines_skipped'] += 1
+        if not project_by_line:
+            return stats
+
+        # Ensure every involved project has a documents folder
+        projects = self.env['project.project'].union(*project_by_line.values())
+        self.env['project.folder.resolver'].ensure_folders(projects)
+
+        # Resolve existing attachment -> document links in a single query
+        attachments = self.env['ir.attachment'].union(*(line[attachment_field] for line in project_by_line))
+        Document = self.env['documents.document']
+        existing = {
+            attachment.id: document_id
+            for attachment, document_id in Document._read_group(
+                [('attachment_id', 'in', attachments.ids)], ['attachment_id'], ['id:min'],
+            )
+        }
+        stats['already_converted'] = len(existing)
+
+        vals_list = []
+        pending_links = []
+        seen_attachments = set(existing)
+        for line, project in project_by_line.items():
+            for attachment in line[attachment_field]:
+                if attachment.id in seen_attachments:
+                    continue
+                seen_attachments.add(attachment.id)
+                vals = {
+                    'name': attachment.name,
+                    'attachment_id': attachment.id,
+                    'res_model': project._name,
+                    'res_id': project.id,
+                    'type': 'file',
+                }
+                if project.documents_folder_id:
+                    vals['folder_id'] = project.documents_folder_id.id
+                vals_list.append(vals)
+                pending_links.append(line)
+        if not vals_list:
+            return stats
+
+        documents = Document.create(vals_list)
+        stats['documents_created'] = len(documents)
+        _logger.info("Converted %s attachments to documents for %s lines", len(documents), len(project_by_line))
+
+        if document_field:
+            for line, document in zip(pending_links, documents):
+                if not line[document_field]:
+                    line[document_field] = document
+        return stats
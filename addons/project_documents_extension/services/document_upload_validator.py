@@ -0,0 +1,84 @@
+from odoo import models, api
+from odoo.exceptions import ValidationError
+from collections import defaultdict
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class DocumentUploadValidator(models.AbstractModel):
+    """
+    Document Upload Validator
+    Checks that the required document lines of many projects or tasks have an
+    upload. Lines without attachments are resolved against ir.attachment with
+    a single grouped query for the whole batch, so workflow actions run a
+    constant number of queries whatever the number of records.
+    """
+    _name = 'document.upload.validator'
+    _description = 'Document Upload Validator'
+
+    @api.model
+    def find_missing_documents(self, records, lines_field, owner='line'):
+        """
+        Find the required lines without an uploaded document
+
+        Args:
+            records: project.project or project.task recordset
+            lines_field: One2many of document lines with x_is_required and x_attachment_ids
+            owner: 'line' when fallback attachments are linked to the line itself,
+                'record' when they are linked to the project or task by name
+        Returns:
+            dict record ID -> list of missing document names
+        """
+        missing_lines = {}
+        for record in records:
+            lines = record[lines_field].filtered(lambda l: l.x_is_required and not l.x_attachment_ids)
+            if lines:
+                missing_lines[record.id] = lines
+        if not missing_lines:
+            return {}
+
+        all_lines = self.env[records[lines_field]._name].union(*missing_lines.values())
+        if owner == 'line':
+            res_model, res_ids = all_lines._name, all_lines.ids
+        else:
+            res_model, res_ids = records._name, list(missing_lines)
+        uploaded = {
+            (res_id, name)
+            for res_id, name in self.env['ir.attachment']._read_group([
+                ('res_model', '=', res_model),
+                ('res_id', 'in', res_ids),
+                ('name', 'in', list(set(all_lines.mapped('name')))),
+            ], ['res_id', 'name'])
+        }
+
+        missing = defaultdict(list)
+        for record_id, lines in missing_lines.items():
+            for line in lines:
+                key = (line.id if owner == 'line' else record_id, line.name)
+                if key not in uploaded:
+                    missing[record_id].append(line.name or 'Unknown Document')
+        return dict(missing)
+
+    @api.model
+    def validate(self, records, lines_field, label, owner='line'):
+        """
+        Raise a ValidationError listing the missing documents of every record
+
+        Args:
+            records: project.project or project.task recordset
+            lines_field: One2many of document lines to check
+            label: kind of documents used in the error message
+            owner: see find_missing_documents()
+        """
+        missing = self.find_missing_documents(records, lines_field, owner=owner)
+        if not missing:
+            return
+        message = f"You must upload the following {label} before completing this action:"
+        if len(records) == 1:
+            raise ValidationError(message + "\n- " + "\n- ".join(missing[records.id]))
+        blocks = [
+            f"{record.display_name}:\n- " + "\n- ".join(missing[record.id])
+            for record in records if record.id in missing
+        ]
+        raise ValidationError(message + "\n\n" + "\n\n".join(blocks))
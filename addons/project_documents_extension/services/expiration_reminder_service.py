@@ -0,0 +1,153 @@
+from odoo import models, api, fields
+from odoo.tools import SQL
+from collections import defaultdict
+from markupsafe import Markup, escape
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class ExpirationReminderService(models.AbstractModel):
+    """
+    Expiration Reminder Service
+    Shared reminder engine for expiring documents. Due documents are selected
+    with the date window in the SQL domain, grouped per recipient into one
+    digest email that is queued in the mail queue, and flagged as reminded
+    with a single write per model.
+
+    Expired flags are stored and kept in sync with the expiry dates by a
+    nightly set-based UPDATE, so reading them costs nothing and "expired"
+    filters hit an index.
+
+    Participating models provide:
+        _expiration_date_field / _expiration_expired_field: expiry Date and stored expired Boolean
+        _expiration_due_field: stored, indexed Date on which the reminder is due
+        _expiration_flag_field / _expiration_sent_field: reminder Booleans
+        _get_expiration_reminder_entries(): recipients and digest line per record,
+            or _queue_expiration_reminders() to send their own reminder mails
+    """
+    _name = 'document.expiration.reminder.service'
+    _description = 'Document Expiration Reminder Service'
+
+    @api.model
+    def _get_reminder_models(self):
+        """Models covered by the project documents reminder cron"""
+        return [
+            'project.document.type.line',
+            'project.document.required.line',
+            'project.required.document',
+            'project.deliverable.document',
+        ]
+
+    @api.model
+    def _get_due_domain(self, model, today):
+        # Single range condition on the precomputed due date column
+        return [
+            (model._expiration_flag_field, '=', True),
+            (model._expiration_sent_field, '=', False),
+            (model._expiration_due_field, '<=', today),
+        ]
+
+    @api.model
+    def send_reminders(self, model_name):
+        """
+        Queue digest reminders for the due documents of one model
+        Args:
+            model_name: name of a participating model
+        Returns:
+            dict with reminder statistics
+        """
+        model = self.env[model_name].sudo()
+        today = fields.Date.context_today(self)
+        documents = model.search(self._get_due_domain(model, today))
+        stats = {'model': model_name, 'documents': len(documents), 'digests': 0}
+        if not documents:
+            return stats
+
+        if hasattr(model, '_queue_expiration_reminders'):
+            # Models with their own (e.g. customer facing) reminder mails
+            stats['digests'] = documents._queue_expiration_reminders()
+        else:
+            stats['digests'] = self._queue_digests(documents)
+        documents.write({model._expiration_sent_field: True})
+
+        _logger.info("Queued %s expiration digests for %s %s records", stats['digests'], stats['documents'], model_name)
+        return stats
+
+    @api.model
+    def _queue_digests(self, documents):
+        """Queue one internal digest per recipient email, returns the number of digests"""
+        lines_by_recipient = defaultdict(list)
+        for entry in documents._get_expiration_reminder_entries():
+            for email in entry['recipients']:
+                lines_by_recipient[email].append(entry['line'])
+
+        mail_values = [{
+            'subject': f"Document Expiration Reminder: {len(lines)} document(s) expiring soon",
+            'body_html': self._render_digest(lines),
+            'email_to': email,
+            'auto_delete': True,
+        } for email, lines in lines_by_recipient.items()]
+        # Queued, the mail queue cron takes care of the actual sending
+        self.env['mail.mail'].sudo().create(mail_values)
+        return len(mail_values)
+
+    @api.model
+    def _render_digest(self, lines):
+        items = Markup('').join(Markup('<li>%s</li>') % line for line in lines)
+        return Markup(
+            '<p>Hello,</p>'
+            '<p>The following documents are expiring soon:</p>'
+            '<ul>%s</ul>'
+            '<p>Please take necessary action to renew or update these documents.</p>'
+        ) % items
+
+    @api.model
+    def format_line(self, label, expiry_date, details=None):
+        """Build one escaped digest line"""
+        line = Markup('<strong>%s</strong> - expires on %s') % (label or '', expiry_date or '')
+        for name, value in (details or {}).items():
+            line += Markup(' - %s: %s') % (name, escape(value or 'N/A'))
+        return line
+
+    @api.model
+    def flag_expired(self, model_name):
+        """
+        Bring the expired flag of the documents of one model in line with their
+        expiry date: passed dates are flagged and stale flags (no expiry date,
+        or a date moved to today or later) are cleared, so rows stored before
+        the flag was computed get corrected by the first run as well
+        Args:
+            model_name: name of a participating model
+        Returns:
+            number of documents whose flag changed
+        """
+        model = self.env[model_name].sudo()
+        model.flush_model([model._expiration_date_field, model._expiration_expired_field])
+        expired = SQL(
+            "(%s IS NOT NULL AND %s < %s)",
+            SQL.identifier(model._expiration_date_field),
+            SQL.identifier(model._expiration_date_field),
+            fields.Date.context_today(self),
+        )
+        self.env.cr.execute(SQL(
+            "UPDATE %s SET %s = %s WHERE %s IS DISTINCT FROM %s",
+            SQL.identifier(model._table),
+            SQL.identifier(model._expiration_expired_field),
+            expired,
+            SQL.identifier(model._expiration_expired_field),
+            expired,
+        ))
+        model.invalidate_model([model._expiration_expired_field])
+        _logger.info("Updated the expired flag of %s %s records", self.env.cr.rowcount, model_name)
+        return self.env.cr.rowcount
+
+    @api.model
+    def _cron_flag_expired(self):
+        """Nightly cron: sync the expired flag of every registered model"""
+        return {model_name: self.flag_expired(model_name) for model_name in self._get_reminder_models()}
+
+    @api.model
+    def _cron_send_reminders(self):
+        """Daily cron: queue reminders for every registered model"""
+        return [self.send_reminders(model_name) for model_name in self._get_reminder_models()]
@@ -0,0 +1,129 @@
+from odoo import models, api
+from odoo.tools.lru import LRU
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Registry attribute holding the process-wide project -> folder LRU
+_REGISTRY_CACHE_ATTR = '_project_folder_resolver_lru'
+_REGISTRY_CACHE_SIZE = 2048
+# Key of the per-transaction memo in cr.cache
+_TRANSACTION_MEMO_KEY = 'project_folder_resolver_memo'
+
+
+class ProjectFolderResolver(models.AbstractModel):
+    """
+    Project Folder Resolver
+    Resolves the folders used to store project documents and attachments.
+    Lookups go through a per-transaction memo backed by a registry-level LRU
+    keyed on project ID. Only found folders are cached, with the folder name
+    they were resolved for: a rename makes the entry a miss and a deleted
+    folder fails the exists() check, so other workers need no invalidation.
+    """
+    _name = 'project.folder.resolver'
+    _description = 'Project Folder Resolver'
+
+    @api.model
+    def _registry_cache(self):
+        cache = getattr(self.env.registry, _REGISTRY_CACHE_ATTR, None)
+        if cache is None:
+            cache = LRU(_REGISTRY_CACHE_SIZE)
+            setattr(self.env.registry, _REGISTRY_CACHE_ATTR, cache)
+        return cache
+
+    @api.model
+    def _transaction_memo(self):
+        return self.env.cr.cache.setdefault(_TRANSACTION_MEMO_KEY, {})
+
+    @api.model
+    def ensure_folders(self, projects):
+        """
+        Make sure every project has a documents folder
+        Existing folders are matched by project name with one search and all
+        missing folders are created with a single create call.
+        Args:
+            projects: project.project recordset
+        Returns:
+            dict project ID -> documents.document folder record
+        """
+        missing = projects.filtered(lambda p: not p.documents_folder_id)
+        if missing:
+            Document = self.env['documents.document']
+            folder_by_name = {}
+            for folder in Document.search([('name', 'in', missing.mapped('name')), ('type', '=', 'folder')]):
+                folder_by_name.setdefault(folder.name, folder)
+
+            vals_list = []
+            for project in missing:
+                if project.name not in folder_by_name and not any(v['name'] == project.name for v in vals_list):
+                    vals_list.append({
+                        'name': project.name,
+                        'type': 'folder',
+                        'company_id': project.company_id.id if project.company_id else False,
+                    })
+            if vals_list:
+                for folder in Document.create(vals_list):
+                    folder_by_name[folder.name] = folder
+                _logger.info("Created %s project documents folders", len(vals_list))
+
+            for folder, folder_projects in missing.grouped(lambda p: folder_by_name[p.name]).items():
+                folder_projects.write({'documents_folder_id': folder.id})
+        return {project.id: project.documents_folder_id for project in projects}
+
+    @api.model
+    def get_attachment_folder(self, project):
+        """
+        Get or create the documents.folder used as default for project attachments
+        Args:
+            project: project.project record
+        Returns:
+            documents.folder record
+        """
+        Folder = self.env['documents.folder']
+        memo = self._transaction_memo()
+        if project.id in memo:
+            return Folder.browse(memo[project.id])
+
+        cache = self._registry_cache()
+        folder_name = f'Project: {project.name}'
+        cached_name, folder_id = cache.get(project.id, (None, None))
+        # Cached IDs are checked once per transaction, another worker may have deleted the folder
+        if cached_name == folder_name and Folder.browse(folder_id).exists():
+            memo[project.id] = folder_id
+            return Folder.browse(folder_id)
+
+        project_folder = Folder.search([
+            ('name', '=', folder_name),
+            ('company_id', '=', project.company_id.id)
+        ], limit=1)
+        if not project_folder:
+            project_folder = Folder.create({
+                'name': folder_name,
+                'company_id': project.company_id.id,
+                'description': f'Documents for project: {project.name}'
+            })
+            _logger.info("Created project folder: %s", project_folder.name)
+
+        memo[project.id] = project_folder.id
+        cache[project.id] = (folder_name, project_folder.id)
+        return project_folder
+
+    @api.model
+    def invalidate(self, project_ids=None):
+        """
+        Drop cached folder resolutions of this worker
+        Args:
+            project_ids: project IDs to forget, or None to clear everything
+        """
+        cache = self._registry_cache()
+        memo = self._transaction_memo()
+        if project_ids is None:
+            cache.clear()
+            memo.clear()
+            return
+        for project_id in project_ids:
+            try:
+                del cache[project_id]
+            except KeyError:
+                pass
+            memo.pop(project_id, None)
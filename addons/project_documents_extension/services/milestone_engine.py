@@ -0,0 +1,137 @@
+from odoo import models, api, fields, _
+from markupsafe import Markup
+import logging
+
+from ..models.project import COMPLETION_CHECKPOINTS
+
+_logger = logging.getLogger(__name__)
+
+COMPLETION_TEMPLATE_XMLID = 'project_documents_extension.email_template_project_completion'
+
+
+class ProjectMilestoneEngine(models.AbstractModel):
+    """
+    Project Milestone Engine
+    Event-driven completion rules. Every reached checkpoint event updates the
+    completion bitset of its project; when the bitset is full the project is
+    claimed exactly once, its final milestone is created and the completion
+    notification is queued in the mail queue.
+    """
+    _name = 'project.milestone.engine'
+    _description = 'Project Milestone Engine'
+
+    @api.model
+    def _checkpoint_bit(self, name):
+        try:
+            return 1 << COMPLETION_CHECKPOINTS.index(name)
+        except ValueError:
+            return 0
+
+    @api.model
+    def _full_mask(self):
+        return (1 << len(COMPLETION_CHECKPOINTS)) - 1
+
+    @api.model
+    def on_checkpoints_reached(self, checkpoints):
+        """
+        Handle reached checkpoint events
+        Args:
+            checkpoints: reached.checkpoint recordset that was just created
+        Returns:
+            project.milestone recordset of the final milestones created
+        """
+        projects = checkpoints.filtered(lambda c: self._checkpoint_bit(c.name)).project_id
+        if not projects:
+            return self.env['project.milestone']
+        return self.evaluate(projects)
+
+    @api.model
+    def evaluate(self, projects):
+        """
+        Refresh the completion bitset of projects and fire the completed ones
+        Args:
+            projects: project.project recordset
+        Returns:
+            project.milestone recordset of the final milestones created
+        """
+        masks = dict.fromkeys(projects.ids, 0)
+        for project, name in self.env['reached.checkpoint']._read_group(
+            [('project_id', 'in', projects.ids), ('name', 'in', COMPLETION_CHECKPOINTS)],
+            ['project_id', 'name'],
+        ):
+            masks[project.id] |= self._checkpoint_bit(name)
+
+        for mask, project_ids in self._group_ids_by_value(masks).items():
+            changed = projects.browse(project_ids).filtered(lambda p: p.checkpoint_completion_mask != mask)
+            if changed:
+                changed.write({'checkpoint_completion_mask': mask})
+
+        full_ids = [project_id for project_id, mask in masks.items() if mask == self._full_mask()]
+        if not full_ids:
+            return self.env['project.milestone']
+        return self._fire(self._claim(full_ids))
+
+    @api.model
+    def _group_ids_by_value(self, values):
+        grouped = {}
+        for record_id, value in values.items():
+            grouped.setdefault(value, []).append(record_id)
+        return grouped
+
+    @api.model
+    def _claim(self, project_ids):
+        """Atomically mark projects as completed, concurrent events claim each project once"""
+        self.env.flush_all()
+        self.env.cr.execute("""
+            UPDATE project_project
+               SET completion_fired_date = NOW() AT TIME ZONE 'UTC'
+             WHERE id = ANY(%s)
+               AND completion_fired_date IS NULL
+         RETURNING id
+        """, [project_ids])
+        claimed = self.env['project.project'].browse([row[0] for row in self.env.cr.fetchall()])
+        claimed.invalidate_recordset(['completion_fired_date'])
+        return claimed
+
+    @api.model
+    def _fire(self, projects):
+        if not projects:
+            return self.env['project.milestone']
+        milestones = self.env['project.milestone'].create([
+            project._prepare_final_milestone_vals() for project in projects
+        ])
+        projects._message_log_batch(bodies={
+            milestone.project_id.id: Markup(_(
+                "🏆 **PROJECT COMPLETED!** All required checkpoints have been reached. Final milestone created: %s"
+            )) % milestone.name
+            for milestone in milestones
+        })
+        self.queue_completion_notifications(projects)
+        _logger.info("Projects %s completed, final milestones created", projects.ids)
+        return milestones
+
+    @api.model
+    def _get_template(self, xmlid):
+        # XML IDs are resolved through the ormcached ir.model.data lookup
+        return self.env.ref(xmlid, raise_if_not_found=False)
+
+    @api.model
+    def queue_completion_notifications(self, projects):
+        """
+        Queue the project completion email, the mail queue cron sends it
+        Returns:
+            True when the emails were queued
+        """
+        template = self._get_template(COMPLETION_TEMPLATE_XMLID)
+        if not template:
+            _logger.warning("Project completion template %s not found, no email queued", COMPLETION_TEMPLATE_XMLID)
+            return False
+        try:
+            template.send_mail_batch(projects.ids, force_send=False)
+        except Exception as e:
+            _logger.error("Failed to queue project completion emails: %s", e)
+            return False
+        projects._message_log_batch(bodies=dict.fromkeys(
+            projects.ids, _("📧 Project completion notification sent to stakeholders"),
+        ))
+        return True
@@ -1,9 +1,15 @@
 from odoo import api, models
+from markupsafe import Markup
 import logging
 from odoo import fields
 
+from ..instrumentation import debug, instrumented
+
 _logger = logging.getLogger(__name__)
 
+# 'copy' duplicates project document lines on tasks, 'shared' lets tasks read them through a view
+TASK_DOCUMENT_MODE_PARAM = 'project_documents_extension.task_document_mode'
+
 
 class ProjectDocumentService(models.AbstractModel):
     """Enhanced service class to handle document creation for projects with smart duplicate detection"""
@@ -11,6 +17,7 @@ class ProjectDocumentService(models.AbstractModel):
     _description = 'Project Document Service'
 
     @api.model
+    @instrumented('smart_documents')
     def create_smart_documents(self, project, sale_order):
         """
         Create documents with smart duplicate detection
@@ -21,14 +28,14 @@ class ProjectDocumentService(models.AbstractModel):
         Returns:
             dict with creation statistics
         """
-        _logger.info(f"=== SMART DOCUMENT SERVICE: Creating documents for project {project.name} ===")
+        debug(_logger, "Creating smart documents for project %s", project.id)
         
         # Get all order lines with new_workflow products
         workflow_lines = sale_order.order_line.filtered(
             lambda line: line.product_id.service_tracking == "new_workflow"
         )
         
-        _logger.info(f"Found {len(workflow_lines)} order lines with new_workflow products")
+        debug(_logger, "Found %s order lines with new_workflow products", len(workflow_lines))
         
         documents_created = {
             'deliverable': 0,
@@ -38,140 +45,63 @@ class ProjectDocumentService(models.AbstractModel):
             'milestone_based': 0
         }
 
-        # Deduplication sets for this project
-        deliverable_keys = set()
-        required_keys = set()
-        deliverable_types = []
-        required_types = []
+        # Unique document types per category, the project and partner are the same for every line
+        doc_types_by_category = {'deliverable': {}, 'required': {}}
+        for product_template in workflow_lines.product_id.product_tmpl_id:
+            for doc_category, doc_types in doc_types_by_category.items():
+                for doc in getattr(product_template, f'x_{doc_category}_document_ids', []):
+                    document_type = getattr(doc, 'x_document_type_id', None) or getattr(doc, 'document_type_id', None)
+                    if document_type:
+                        doc_types.setdefault(document_type.id, doc)
 
-        for line in workflow_lines:
-            product = line.product_id
-            product_template = product.product_tmpl_id
-
-            # Collect unique deliverable document types (x_ fields)
-            _logger.info(f"Product {product_template.name} has {len(getattr(product_template, 'x_deliverable_document_ids', []))} x_deliverable_document_ids")
-            for doc in getattr(product_template, 'x_deliverable_document_ids', []):
-                doc_type_field = getattr(doc, 'x_document_type_id', None) or getattr(doc, 'document_type_id', None)
-                _logger.info(f"Checking x_deliverable_document: {doc} with doc_type_field: {doc_type_field}")
-                if doc_type_field:
-                    key = (project.id, doc_type_field.id, sale_order.partner_id.id)
-                    if key not in deliverable_keys:
-                        deliverable_keys.add(key)
-                        deliverable_types.append(doc)
-
-            # Collect unique required document types (x_ fields)
-            _logger.info(f"Product {product_template.name} has {len(getattr(product_template, 'x_required_document_ids', []))} x_required_document_ids")
-            for doc in getattr(product_template, 'x_required_document_ids', []):
-                doc_type_field = getattr(doc, 'x_document_type_id', None) or getattr(doc, 'document_type_id', None)
-                _logger.info(f"Checking x_required_document: {doc} with doc_type_field: {doc_type_field}")
-                if doc_type_field:
-                    key = (project.id, doc_type_field.id, sale_order.partner_id.id)
-                    if key not in required_keys:
-                        required_keys.add(key)
-                        required_types.append(doc)
+        summary_lines = []
+        for doc_category, doc_types in doc_types_by_category.items():
+            if not doc_types:
+                continue
+            Line = self.env[self._get_line_model(doc_category)].sudo()
+            # All existing (project, document type) pairs of the category in one query
+            existing_type_ids = {
+                document_type.id
+                for [document_type] in Line._read_group([
+                    ('x_project_id', '=', project.id),
+                    ('x_document_type_id', 'in', list(doc_types)),
+                ], ['x_document_type_id'])
+            }
+            documents_created['existing_linked'] += len(existing_type_ids)
 
-        # Process deliverable documents with smart duplicate detection
-        for doc_type in deliverable_types:
-            result = self._create_or_link_document(
-                project, doc_type, sale_order.partner_id, 'deliverable'
-            )
-            documents_created[result['action']] += 1
+            vals_list = [
+                self._prepare_document_line_vals(project, doc_type)
+                for document_type_id, doc_type in doc_types.items()
+                if document_type_id not in existing_type_ids
+            ]
+            if vals_list:
+                new_lines = Line.create(vals_list)
+                documents_created[doc_category] += len(new_lines)
+                summary_lines.extend(
+                    f"• {line.name} ({doc_category}, required: {line.x_is_required})" for line in new_lines
+                )
+            if existing_type_ids:
+                summary_lines.append(f"• Linked {len(existing_type_ids)} existing {doc_category} document line(s)")
 
-        # Process required documents with smart duplicate detection  
-        for doc_type in required_types:
-            result = self._create_or_link_document(
-                project, doc_type, sale_order.partner_id, 'required'
-            )
-            documents_created[result['action']] += 1
+        if summary_lines:
+            project.message_post(body=Markup(
+                "<b>Smart Documents for %s:</b><br/>%s"
+            ) % (sale_order.partner_id.name or '', Markup("<br/>").join(summary_lines)))
 
-        _logger.info(f"Smart document creation completed: {documents_created}")
+        debug(_logger, "Smart document creation completed: %s", documents_created)
         return documents_created
 
-    def _create_or_link_document(self, project, doc_type, partner, doc_category):
-        """
-        Create new document or link existing one based on duplicate detection
-        Args:
-            project: project.project record
-            doc_type: document type configuration
-            partner: res.partner record
-            doc_category: 'deliverable' or 'required'
-        Returns:
-            dict with action taken and document info
-        """
-        # Support both legacy and x_ models
-        document_type = getattr(doc_type, 'x_document_type_id', None) or getattr(doc_type, 'document_type_id', None)
-        
-        # Enhanced duplicate detection - check existing document lines
-        existing_doc_lines = self._find_existing_document_lines(project, document_type, doc_category)
-        
-        _logger.info(f"Checking documents for partner {partner.name}, type {getattr(document_type, 'name', document_type)}")
-        _logger.info(f"Found {len(existing_doc_lines)} potential matches")
-        
-        if existing_doc_lines:
-            # Link to existing document line
-            existing_line = existing_doc_lines[0]  # Take the first match
-            doc_type_field = getattr(existing_line, 'x_document_type_id', None) or getattr(existing_line, 'document_type_id', None)
-            _logger.info(f"🔗 Linked existing document line: {getattr(doc_type_field, 'name', doc_type_field)}")
-            
-            # Post message to project
-            link_message = f"""
-                <b>Document Linked:</b><br/>
-                • Name: {getattr(doc_type_field, 'name', doc_type_field)}<br/>
-                • Category: {doc_category}<br/>
-                • Partner: {partner.name}<br/>
-            """
-            project.message_post(body=link_message)
-            
-            return {
-                'action': 'existing_linked',
-                'document': existing_line,
-                'message': f"Linked existing document to project"
-            }
-        else:
-            # Create new document line
-            new_doc_line = self._create_document_line(project, doc_type, partner, doc_category)
-            doc_type_field = getattr(new_doc_line, 'x_document_type_id', None) or getattr(new_doc_line, 'document_type_id', None)
-            _logger.info(f"📝 Created new document line: {getattr(doc_type_field, 'name', doc_type_field)}")
-            
-            return {
-                'action': doc_category,
-                'document': new_doc_line,
-                'message': f"Created new {doc_category} document"
-            }
+    def _get_line_model(self, doc_category):
+        return 'project.deliverable.document' if doc_category == 'deliverable' else 'project.required.document'
 
-    def _find_existing_document_lines(self, project, document_type, doc_category):
+    def _prepare_document_line_vals(self, project, doc_type):
         """
-        Find existing document lines with enhanced matching
-        Args:
-            project: project.project record
-            document_type: project.document.type record
-            doc_category: 'deliverable' or 'required'
-        Returns:
-            recordset of existing document lines
-        """
-        if doc_category == 'deliverable':
-            existing_lines = self.env['project.deliverable.document'].search([
-                ('x_project_id', '=', project.id),
-                ('x_document_type_id', '=', document_type.id)
-            ])
-        else:  # required
-            existing_lines = self.env['project.required.document'].search([
-                ('x_project_id', '=', project.id),
-                ('x_document_type_id', '=', document_type.id)
-            ])
-        
-        return existing_lines
-
-    def _create_document_line(self, project, doc_type, partner, doc_category):
-        """
-        Create new document line
+        Build the values of a project document line from a product document line
         Args:
             project: project.project record
             doc_type: document type configuration
-            partner: res.partner record
-            doc_category: 'deliverable' or 'required'
         Returns:
-            document line record
+            dict of document line values
         """
         document_type = getattr(doc_type, 'x_document_type_id', None) or getattr(doc_type, 'document_type_id', None)
         is_required = getattr(doc_type, 'x_is_required', None)
@@ -184,38 +114,15 @@ class ProjectDocumentService(models.AbstractModel):
         if reminder_days is None:
             reminder_days = getattr(doc_type, 'reminder_days', 30)
         name = getattr(doc_type, 'name', None) or (document_type and document_type.name) or 'Document'
-        # Create x_ document line instead of legacy line
-        if doc_category == 'deliverable':
-            document_line = self.env['project.deliverable.document'].sudo().create({
-                'x_project_id': project.id,
-                'x_document_type_id': document_type.id,
-                'x_is_required': is_required,
-                'x_expiry_date': expiry_date,
-                'x_reminder_days': reminder_days,
-                'name': name,
-            })
-        else:
-            _logger.info(f"[REQUIRED DEBUG] Creating project.required.document with: x_project_id={project.id}, x_document_type_id={getattr(document_type, 'id', None)}, x_is_required={is_required}, x_expiry_date={expiry_date}, x_reminder_days={reminder_days}, name={name}")
-            document_line = self.env['project.required.document'].sudo().create({
-                'x_project_id': project.id,
-                'x_document_type_id': document_type.id,
-                'x_is_required': is_required,
-                'x_expiry_date': expiry_date,
-                'x_reminder_days': reminder_days,
-                'name': name,
-            })
-        # Log creation
-        doc_type_field = getattr(document_line, 'x_document_type_id', None) or getattr(document_line, 'document_type_id', None)
-        creation_message = f"""
-            <b>New x_Document Created:</b><br/>
-            • Name: {document_line.name}<br/>
-            • Category: {doc_category}<br/>
-            • Partner: {partner.name}<br/>
-            • Required: {getattr(document_line, 'x_is_required', getattr(document_line, 'is_required', ''))}<br/>
-        """
-        _logger.info(f"📝 Created new document line: {getattr(doc_type_field, 'name', doc_type_field)}")
-        project.message_post(body=creation_message)
-        return document_line
+        # x_ document line instead of legacy line
+        return {
+            'x_project_id': project.id,
+            'x_document_type_id': document_type.id,
+            'x_is_required': is_required,
+            'x_expiry_date': expiry_date,
+            'x_reminder_days': reminder_days,
+            'name': name,
+        }
 
     def _is_valid_document_type(self, doc_type):
         """
@@ -238,52 +145,99 @@ class ProjectDocumentService(models.AbstractModel):
         Copy x_ required and deliverable documents from project to task.
         Args:
             task: project.task record
-            project: project.project record
+            project: project.project record, the project of the task
+        Returns:
+            dict with copy statistics
+        """
+        return self.copy_documents_to_tasks(task)
+
+    @api.model
+    def _get_task_document_mode(self):
+        """'copy' (default) or 'shared', see copy_documents_to_tasks()"""
+        return self.env['ir.config_parameter'].sudo().get_param(TASK_DOCUMENT_MODE_PARAM, 'copy')
+
+    @api.model
+    def copy_documents_to_tasks(self, tasks, mode=None):
+        """
+        Give a batch of tasks the x_ required and deliverable documents of their project.
+        In 'copy' mode the project lines are duplicated on every task, with a
+        single duplicate check and a single create per line model. In 'shared'
+        mode the tasks are flagged to read the project lines through the
+        project.task.shared.document view, nothing is duplicated.
+        Args:
+            tasks: project.task recordset
+            mode: 'copy' or 'shared', defaults to the configured mode
         Returns:
             dict with copy statistics
         """
-        _logger.info(f"=== COPYING x_ DOCUMENTS FROM PROJECT TO TASK ===")
+        mode = mode or self._get_task_document_mode()
         copy_stats = {
             'deliverable_copied': 0,
             'required_copied': 0,
-            'duplicates_prevented': 0
+            'duplicates_prevented': 0,
+            'shared': 0,
         }
-        # Copy x_ deliverable documents from product template to project (with attachments)
-        for doc in getattr(product_template, 'x_deliverable_document_ids', []):
-            doc_type_field = getattr(doc, 'x_document_type_id', None) or getattr(doc, 'document_type_id', None)
-            if doc_type_field:
-                key = (project.id, doc_type_field.id, sale_order.partner_id.id)
-                if key not in deliverable_keys:
-                    deliverable_keys.add(key)
-                    new_doc = self.env['project.deliverable.document'].sudo().create({
-                        'x_project_id': project.id,
-                        'x_document_type_id': doc.x_document_type_id.id,
-                        'x_is_required': doc.x_is_required,
-                        'x_expiry_date': doc.x_expiry_date,
-                        'x_reminder_days': doc.x_reminder_days,
-                        'name': doc.name,
-                        'x_attachment_ids': [(6, 0, doc.x_attachment_ids.ids)],
-                    })
-                    deliverable_types.append(new_doc)
+        tasks = tasks.filtered('project_id')
+        if not tasks:
+            return copy_stats
 
-        # Copy x_ required documents from product template to project (with attachments)
-        for doc in getattr(product_template, 'x_required_document_ids', []):
-            doc_type_field = getattr(doc, 'x_document_type_id', None) or getattr(doc, 'document_type_id', None)
-            if doc_type_field:
-                key = (project.id, doc_type_field.id, sale_order.partner_id.id)
-                if key not in required_keys:
-                    required_keys.add(key)
-                    new_doc = self.env['project.required.document'].sudo().create({
-                        'x_project_id': project.id,
-                        'x_document_type_id': doc.x_document_type_id.id,
-                        'x_is_required': doc.x_is_required,
-                        'x_expiry_date': doc.x_expiry_date,
-                        'x_reminder_days': doc.x_reminder_days,
-                        'name': doc.name,
-                        'x_attachment_ids': [(6, 0, doc.x_attachment_ids.ids)],
-                    })
-                    required_types.append(new_doc)
-        _logger.info(f"x_ Document copy completed: {copy_stats}")
+        if mode == 'shared':
+            tasks.sudo().write({'x_share_project_documents': True})
+            copy_stats['shared'] = len(tasks)
+            return copy_stats
+
+        for doc_category in ('deliverable', 'required'):
+            Line = self.env[self._get_line_model(doc_category)].sudo()
+            project_lines = Line.search([('x_project_id', 'in', tasks.project_id.ids), ('x_task_id', '=', False)])
+            if not project_lines:
+                continue
+            existing_keys = {
+                (task.id, document_type.id)
+                for task, document_type in Line._read_group(
+                    [('x_task_id', 'in', tasks.ids)], ['x_task_id', 'x_document_type_id'],
+                )
+            }
+            lines_by_project = project_lines.grouped('x_project_id')
+            vals_list = []
+            for task in tasks:
+                for line in lines_by_project.get(task.project_id, []):
+                    key = (task.id, line.x_document_type_id.id)
+                    if key in existing_keys:
+                        copy_stats['duplicates_prevented'] += 1
+                        continue
+                    existing_keys.add(key)
+                    vals_list.append(self._prepare_task_line_vals(task, line))
+            if vals_list:
+                copy_stats[f'{doc_category}_copied'] = len(Line.create(vals_list))
+
+        debug(_logger, "x_ Document copy completed for %s tasks: %s", len(tasks), copy_stats)
+        return copy_stats
+
+    def _prepare_task_line_vals(self, task, line):
+        """Values of the task copy of a project document line, attachments are linked, not duplicated"""
+        return {
+            'x_task_id': task.id,
+            'x_document_type_id': line.x_document_type_id.id,
+            'x_is_required': line.x_is_required,
+            'x_expiry_date': line.x_expiry_date,
+            'x_reminder_days': line.x_reminder_days,
+            'name': line.name,
+            'x_attachment_ids': [(6, 0, line.x_attachment_ids.ids)],
+        }
+
+    @api.model
+    def detach_shared_documents(self, tasks):
+        """
+        Copy the shared project lines onto tasks that need their own documents
+        and stop sharing
+        Args:
+            tasks: project.task recordset
+        Returns:
+            dict with copy statistics
+        """
+        shared_tasks = tasks.filtered('x_share_project_documents')
+        copy_stats = self.copy_documents_to_tasks(shared_tasks, mode='copy')
+        shared_tasks.sudo().write({'x_share_project_documents': False})
         return copy_stats
 
     @api.model
@@ -1,6 +1,10 @@
-from odoo import models, api
+from odoo import models, api, Command
+from markupsafe import Markup
 import logging
 
+from ..instrumentation import debug
+from ..models.project import prepare_checkpoint_vals_from_template
+
 _logger = logging.getLogger(__name__)
 
 
@@ -24,26 +28,90 @@ class TaskCheckpointService(models.AbstractModel):
         try:
             if not template.checkpoint_ids:
                 return
-            
-            for template_checkpoint in template.checkpoint_ids:
-                task_checkpoint_vals = {
-                    'task_id': task.id,
-                    'checkpoint_ids': [(6, 0, template_checkpoint.checkpoint_ids.ids)],
-                    'stage_id': template_checkpoint.stage_id.id if template_checkpoint.stage_id else False,
-                    'milestone_id': template_checkpoint.milestone_id.id if template_checkpoint.milestone_id else False,
-                    'sequence': template_checkpoint.sequence or 10,
-                }
-                
-                task_checkpoint = self.env['task.checkpoint'].create(task_checkpoint_vals)
-                
-                # If milestone is assigned, link it to the task
-                if template_checkpoint.milestone_id:
-                    task.milestone_id = template_checkpoint.milestone_id.id
-                    _logger.info(f"Milestone '{template_checkpoint.milestone_id.name}' assigned to task '{task.name}'")
-                
+
+            self.env['task.checkpoint'].create(prepare_checkpoint_vals_from_template(task, template))
+
+            # If milestone is assigned, link it to the task
+            milestone = template.checkpoint_ids.filtered('milestone_id')[-1:].milestone_id
+            if milestone:
+                task.milestone_id = milestone.id
+                debug(_logger, "Milestone %s assigned to task %s", milestone.id, task.id)
+
         except Exception as e:
             _logger.error(f"Error copying checkpoint configurations from template {template.name} to task {task.name}: {e}")
 
+    @api.model
+    def _prepare_task_vals(self, project, template, default_stage):
+        """Build project.task values from a product task or subtask template"""
+        task_vals = {
+            'name': template.name,
+            'project_id': project.id,
+            'description': template.description or '',
+            'user_ids': [(6, 0, template.user_ids.ids)],
+            'allocated_hours': template.planned_hours or 0.0,
+            'priority': template.priority if template.priority in ['0', '1'] else '0',
+        }
+        # Set initial stage if specified, falling back to the project's default stage
+        if template.stage_id:
+            if template.stage_id in project.type_ids:
+                task_vals['stage_id'] = template.stage_id.id
+            elif default_stage:
+                task_vals['stage_id'] = default_stage.id
+        return task_vals
+
+    @api.model
+    def create_tasks_from_templates(self, project, templates):
+        """
+        Create project tasks, their subtasks and checkpoint configurations from templates
+        Subtasks are nested in the task values so every task is inserted by
+        one create call, checkpoints by a second one, and a single summary
+        message is posted on the project.
+
+        Args:
+            project: project.project record
+            templates: product.task.template recordset
+
+        Returns:
+            project.task recordset of the created top-level tasks
+        """
+        Task = self.env['project.task']
+        if not templates:
+            return Task
+        default_stage = project.type_ids.filtered(lambda s: not s.fold)[:1]
+
+        task_vals_list = []
+        for template in templates:
+            task_vals = self._prepare_task_vals(project, template, default_stage)
+            milestone = template.checkpoint_ids.filtered('milestone_id')[-1:].milestone_id
+            if milestone:
+                task_vals['milestone_id'] = milestone.id
+            if template.subtask_ids:
+                task_vals['child_ids'] = [
+                    Command.create(self._prepare_task_vals(project, subtask, default_stage))
+                    for subtask in template.subtask_ids
+                ]
+            task_vals_list.append(task_vals)
+        tasks = Task.create(task_vals_list)
+
+        checkpoint_vals_list = [
+            checkpoint_vals
+            for task, template in zip(tasks, templates)
+            for checkpoint_vals in prepare_checkpoint_vals_from_template(task, template)
+        ]
+        if checkpoint_vals_list:
+            self.env['task.checkpoint'].create(checkpoint_vals_list)
+
+        # Log task creation
+        items = Markup('').join(
+            Markup('<li>%s (%s subtask(s), %s checkpoint configuration(s))</li>') % (
+                template.name, len(template.subtask_ids), len(template.checkpoint_ids),
+            )
+            for template in templates
+        )
+        project.message_post(body=Markup('<b>Tasks Created from Templates:</b><ul>%s</ul>') % items)
+        _logger.info(f"Created {len(tasks)} tasks and {len(checkpoint_vals_list)} checkpoints from templates on project '{project.name}'")
+        return tasks
+
     @api.model
     def create_task_with_checkpoints(self, project, template):
         """
@@ -57,48 +125,7 @@ class TaskCheckpointService(models.AbstractModel):
             project.task record or None if creation fails
         """
         try:
-            # Prepare task values
-            task_vals = {
-                'name': template.name,
-                'project_id': project.id,
-                'description': template.description or '',
-                'user_ids': [(6, 0, template.user_ids.ids)],
-                'allocated_hours': template.planned_hours or 0.0,
-                'priority': template.priority if template.priority in ['0', '1'] else '0',
-            }
-            
-            # Set initial stage if specified
-            if template.stage_id:
-                if template.stage_id.id in project.type_ids.ids:
-                    task_vals['stage_id'] = template.stage_id.id
-                else:
-                    # Use project's default stage
-                    default_stage = project.type_ids.filtered(lambda s: not s.fold)[:1]
-                    if default_stage:
-                        task_vals['stage_id'] = default_stage.id
-            
-            # Create the task
-            task = self.env['project.task'].create(task_vals)
-            
-            # Copy checkpoint configurations from template
-            if template.checkpoint_ids:
-                self.copy_checkpoints_from_template(task, template)
-            
-            # Log task creation
-            creation_message = f"""
-                <b>Task Created from Template:</b><br/>
-                • Template: {template.name}<br/>
-                • Stage: {task.stage_id.name if task.stage_id else 'Not set'}<br/>
-                • Planned Hours: {template.planned_hours or 0}<br/>
-                • Priority: {template.priority or 'Normal'}<br/>
-                • Assigned Users: {len(template.user_ids)}<br/>
-                • Checkpoint Configurations: {len(template.checkpoint_ids)}
-                {f'<br/>• Milestone: {task.milestone_id.name}' if task.milestone_id else ''}
-            """
-            task.message_post(body=creation_message)
-            
-            return task
-            
+            return self.create_tasks_from_templates(project, template)[:1] or None
         except Exception as e:
             _logger.error(f"Error creating task from template {template.name}: {e}")
             return None
@@ -123,7 +150,7 @@ class TaskCheckpointService(models.AbstractModel):
                     message_type='notification'
                 )
                 
-                _logger.info(f"Milestone notification sent for task '{task.name}' and milestone '{milestone.name}'")
+                debug(_logger, "Milestone notification sent for task %s and milestone %s", task.id, milestone.id)
                 
         except Exception as e:
             _logger.error(f"Error triggering milestone notification for task {task.name}: {e}")
@@ -153,7 +180,7 @@ class TaskCheckpointService(models.AbstractModel):
                     message_type='notification'
                 )
                 
-                _logger.info(f"Checkpoint '{checkpoint_name}' completed for task '{task.name}' with milestone '{checkpoint.milestone_id.name}'")
+                debug(_logger, "Checkpoint %s completed for task %s with milestone %s", checkpoint_name, task.id, checkpoint.milestone_id.id)
             
         except Exception as e:
             _logger.error(f"Error completing checkpoint '{checkpoint_name}' for task {task.name}: {e}")
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import logging
+import time
+
+from odoo import Command, fields
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.project_documents_extension.instrumentation import DEBUG_SAMPLE_RATE_PARAM, TIMING_SAMPLE_RATE_PARAM
+
+_logger = logging.getLogger(__name__)
+
+# Batch sizes every hot path is benchmarked at
+BENCHMARK_SCALES = (10, 100, 1000)
+
+
+class ProjectDocumentsBenchmarkCase(TransactionCase):
+    """Query count regression benchmarks of the project document workflow.
+
+    Every scenario prepares fresh data at each scale of BENCHMARK_SCALES and
+    runs the hot path with warm caches. The smallest scale must stay within
+    the pinned ``query_baseline`` and larger scales within that baseline plus
+    ``query_growth`` extra queries per additional row, so a per-record query
+    sneaking into a batched path, or a fixed cost growing, fails the build.
+    Query counts and wall times are logged per scale.
+    """
+
+    # Queries the smallest scale may run, per scenario
+    query_baseline = {}
+    # Extra queries each additional row may cost, per scenario. 0 means the
+    # path must run a constant number of queries whatever the batch size.
+    query_growth = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        # Sampled timing and debug logging would add random queries to the budgets
+        ICP = cls.env['ir.config_parameter'].sudo()
+        ICP.set_param(TIMING_SAMPLE_RATE_PARAM, '0')
+        ICP.set_param(DEBUG_SAMPLE_RATE_PARAM, '0')
+        cls.env.user.email = cls.env.user.email or 'benchmark.manager@example.com'
+        cls.partner = cls.env['res.partner'].create({
+            'name': 'Benchmark Customer',
+            'email': 'benchmark.customer@example.com',
+        })
+        cls.document_types = cls.env['project.document.type'].create([
+            {'name': f'Benchmark Document Type {index}'} for index in range(max(BENCHMARK_SCALES))
+        ])
+
+    # ------------------------------------------------------------------
+    # Runner
+    # ------------------------------------------------------------------
+
+    def run_benchmark(self, scenario, prepare, run):
+        """
+        Run a scenario at every benchmark scale and check its query budget
+        Args:
+            scenario: name of the scenario, key of query_baseline and query_growth
+            prepare: callable(scale) returning the data passed to run
+            run: callable(data) executing the hot path
+        Returns:
+            list of (scale, query count, wall time in ms)
+        """
+        results = []
+        baseline = self.query_baseline[scenario]
+        for scale in BENCHMARK_SCALES:
+            data = prepare(scale)
+            self.env.flush_all()
+            self.env.invalidate_all()
+            budget = baseline + self.query_growth.get(scenario, 0) * (scale - BENCHMARK_SCALES[0])
+            with self.assertQueryCount(budget):
+                queries, duration_ms = self._measure(run, data)
+            results.append((scale, queries, duration_ms))
+        _logger.info(
+            "Benchmark %s: %s", scenario,
+            ", ".join(f"{scale} rows: {queries} queries in {duration_ms:.1f} ms" for scale, queries, duration_ms in results),
+        )
+        return results
+
+    def _measure(self, run, data):
+        queries = self.cr.sql_log_count
+        start = time.perf_counter()
+        run(data)
+        self.env.flush_all()
+        return self.cr.sql_log_count - queries, (time.perf_counter() - start) * 1000
+
+    # ------------------------------------------------------------------
+    # Data builders
+    # ------------------------------------------------------------------
+
+    def _create_project(self, name):
+        return self.env['project.project'].create({
+            'name': name,
+            'partner_id': self.partner.id,
+            'user_id': self.env.user.id,
+        })
+
+    def _create_workflow_products(self, count, prefix):
+        """Service products of the new_workflow tracking, with their default task templates"""
+        return self.env['product.product'].create([{
+            'name': f'{prefix} Product {index}',
+            'type': 'service',
+            'service_tracking': 'new_workflow',
+            'list_price': 100.0,
+        } for index in range(count)])
+
+    def _create_sale_order(self, products):
+        return self.env['sale.order'].create({
+            'partner_id': self.partner.id,
+            'order_line': [Command.create({
+                'product_id': product.id,
+                'product_uom_qty': 1,
+            }) for product in products],
+        })
+
+    def _create_attachments(self, count, prefix):
+        return self.env['ir.attachment'].create([{
+            'name': f'{prefix} {index}.pdf',
+            'datas': base64.b64encode(b'%PDF-1.4 benchmark'),
+            'mimetype': 'application/pdf',
+        } for index in range(count)])
+
+    def _link_attachments(self, lines, attachment_field, attachments):
+        """Link one attachment per line without running the write overrides"""
+        field = lines._fields[attachment_field]
+        self.env.flush_all()
+        self.env.cr.executemany(
+            f"INSERT INTO {field.relation} ({field.column1}, {field.column2}) VALUES (%s, %s)",
+            list(zip(lines.ids, attachments.ids)),
+        )
+        lines.invalidate_recordset([attachment_field])
+
+    def _create_project_required_documents(self, project, count, **extra_vals):
+        return self.env['project.required.document'].create([{
+            'name': f'{project.name} Document {index}',
+            'x_project_id': project.id,
+            'x_document_type_id': document_type.id,
+            'x_is_required': True,
+            **extra_vals,
+        } for index, document_type in enumerate(self.document_types[:count])])
+
+    def _backdate_expiry(self, lines, days=1):
+        """Move the expiry of lines into the past, leaving the stored flags stale"""
+        self.env.flush_all()
+        self.env.cr.execute(
+            f"UPDATE {lines._table} SET x_expiry_date = %s, x_is_expired = FALSE,"
+            f" x_reminder_due_date = %s WHERE id = ANY(%s)",
+            [fields.Date.subtract(fields.Date.today(), days=days),
+             fields.Date.subtract(fields.Date.today(), days=days), lines.ids],
+        )
+        lines.invalidate_recordset()
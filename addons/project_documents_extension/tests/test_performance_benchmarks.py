@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import ProjectDocumentsBenchmarkCase
+
+
+@tagged('post_install', '-at_install', 'project_documents_benchmark')
+class TestProjectDocumentsBenchmarks(ProjectDocumentsBenchmarkCase):
+
+    # Query budgets of the 10 row runs. assertQueryCount fails above the
+    # budget and only logs below it, lower them to the logged counts when a
+    # path gets cheaper.
+    query_baseline = {
+        'order_confirmation': 120,
+        'smart_documents': 25,
+        'attachment_conversion': 30,
+        'duplicate_check': 2,
+        'checkpoint_completion': 40,
+        'expiry_crons': 12,
+    }
+
+    query_growth = {
+        # Standard sale line confirmation and task creation work per product
+        'order_confirmation': 3,
+        'smart_documents': 0,
+        'attachment_conversion': 0,
+        'duplicate_check': 0,
+        'checkpoint_completion': 0,
+        'expiry_crons': 0,
+    }
+
+    def test_order_confirmation(self):
+        def prepare(scale):
+            products = self._create_workflow_products(scale, f'Confirm {scale}')
+            # Template trees are compiled once per registry, benchmark the warm path
+            products.product_tmpl_id._get_template_trees()
+            return self._create_sale_order(products)
+
+        def run(order):
+            order.with_context(async_project_materialisation=False).action_confirm()
+
+        self.run_benchmark('order_confirmation', prepare, run)
+
+    def test_smart_documents(self):
+        def prepare(scale):
+            product = self._create_workflow_products(1, f'Smart {scale}')
+            self.env['project.required.document'].create([{
+                'name': f'Smart {scale} Requirement {index}',
+                'product_tmpl_id': product.product_tmpl_id.id,
+                'x_document_type_id': document_type.id,
+                'x_is_required': True,
+            } for index, document_type in enumerate(self.document_types[:scale])])
+            return scale, self._create_project(f'Smart {scale}'), self._create_sale_order(product)
+
+        def run(data):
+            scale, project, order = data
+            stats = self.env['project.document.service'].create_smart_documents(project, order)
+            self.assertEqual(stats['required'], scale)
+
+        self.run_benchmark('smart_documents', prepare, run)
+
+    def test_attachment_conversion(self):
+        def prepare(scale):
+            project = self._create_project(f'Conversion {scale}')
+            lines = self._create_project_required_documents(project, scale)
+            self._link_attachments(lines, 'x_attachment_ids', self._create_attachments(scale, f'Conversion {scale}'))
+            return lines
+
+        def run(lines):
+            stats = self.env['attachment.conversion.service'].convert_lines(lines, 'x_attachment_ids')
+            self.assertEqual(stats['documents_created'], len(lines))
+
+        self.run_benchmark('attachment_conversion', prepare, run)
+
+    def test_duplicate_check(self):
+        def prepare(scale):
+            project = self._create_project(f'Duplicates {scale}')
+            return self.env['project.document.required.line'].create([{
+                'project_id': project.id,
+                'document_type_id': document_type.id,
+                'is_required': True,
+            } for document_type in self.document_types[:scale]])
+
+        def run(lines):
+            self.assertFalse(lines._find_batch_duplicates())
+
+        self.run_benchmark('duplicate_check', prepare, run)
+
+    def test_checkpoint_completion(self):
+        def prepare(scale):
+            return self.env['project.project'].create([{
+                'name': f'Checkpoints {scale} Project {index}',
+                'partner_id': self.partner.id,
+                'user_id': self.env.user.id,
+            } for index in range(scale)])
+
+        def run(projects):
+            for stage in ('required_documents', 'deliverable_documents', 'compliance', 'partner_fields'):
+                projects.action_checkpoint_transition(stage, 'complete')
+            self.assertTrue(all(projects.mapped('completion_fired_date')))
+
+        self.run_benchmark('checkpoint_completion', prepare, run)
+
+    def test_expiry_crons(self):
+        def prepare(scale):
+            project = self._create_project(f'Expiry {scale}')
+            lines = self._create_project_required_documents(project, scale, x_expiration_reminder=True)
+            self._backdate_expiry(lines)
+            return lines
+
+        def run(lines):
+            service = self.env['document.expiration.reminder.service']
+            service.flag_expired(lines._name)
+            service.send_reminders(lines._name)
+            self.assertTrue(all(lines.mapped('x_is_expired')))
+            self.assertTrue(all(lines.mapped('x_expiration_reminder_sent')))
+
+        self.run_benchmark('expiry_crons', prepare, run)